@@ -0,0 +1,300 @@
+import argparse
+import os
+import sys
+import json
+import time
+from contextlib import nullcontext
+from importlib import import_module
+from datetime import datetime
+
+from eroom import ROTATION_WEEKS, MetaData
+from holiday_calendar import HolidayCalendar
+from hwp_backend import BACKENDS, get_backend
+from hwp_profile import summarize
+from roster_db import DEFAULT_DB_FILE, open_database
+from store_data import load_schedules
+from output_cache import OutputCache
+
+TEMPLATE_FILE = "청년이룸출근부.hwp"
+HWPX_TEMPLATE_FILE = "청년이룸출근부.hwpx"
+OUTPUT_FILE_NAME = "청년이룸출근부_{year}년_{month}월_{name}{extension}"
+COMBINED_FILE_NAME = "청년이룸출근부_{year}년_{month}월_전체{extension}"
+ENGINES = ["hwp", "hwpx"]
+# 세션 종류별 (모듈, 클래스), 문서를 실제로 생성할 때 처음 불러옴
+SESSIONS = {
+    "hwp": ("write_hwp", "HwpSession"),
+    "staged": ("write_hwp", "StagedHwpSession"),
+    "hwpx": ("hwpx_engine", "HwpxSession"),
+}
+
+
+def create_session(kind, *args, **kwargs):
+    """
+    kind 세션을 생성 (해당 엔진 모듈은 이때 처음 불러오므로 창이나 명령을 띄우는 데 영향이 없음)
+
+    :param kind: SESSIONS의 키
+    :param args: 세션 생성자 인수 (hwp/staged: backend, max_documents, profile_path, use_fields=...)
+    """
+    try:
+        module_name, class_name = SESSIONS[kind]
+    except KeyError:
+        raise ValueError(f"알 수 없는 세션입니다: {kind} (사용 가능: {', '.join(SESSIONS)})")
+    return getattr(import_module(module_name), class_name)(*args, **kwargs)
+
+
+def build_meta_data(year, month, name, default_file_path=None, input_file=TEMPLATE_FILE, public_holidays=None):
+    """매니저 한 명의 출근부 생성에 필요한 MetaData 생성"""
+    return MetaData(
+        default_file_path=os.path.abspath(default_file_path or os.getcwd()),
+        input_file=input_file,
+        output_file_name=OUTPUT_FILE_NAME.format(year=year, month=month, name=name,
+                                                 extension=os.path.splitext(input_file)[1]),
+        target_date=f"{year}-{str(month).zfill(2)}",
+        public_holidays=public_holidays
+    )
+
+
+def _check_overrides(meta_data, ems):
+    """한 달에 대체 휴무일이나 토요일 근무일이 둘 이상이면 경고를 출력 (출근부는 그대로 생성)"""
+    for kind in ems.duplicate_kinds(meta_data.target_date):
+        dates = ", ".join(override.date for override in ems.get_overrides(meta_data.target_date) if override.kind == kind)
+        print(f"경고: {ems.name}의 {meta_data.target_date} 일정 예외({kind})가 여러 날짜입니다: {dates}")
+
+
+def _cache_key(output_cache, meta_data, ems, session=None):
+    """출력 캐시 키, 캐시를 쓰지 않거나 템플릿을 읽을 수 없으면 None (문서 생성 단계에서 오류를 알림)"""
+    if output_cache is None:
+        return None
+    options = session.cache_options() if hasattr(session, "cache_options") else None
+    try:
+        return output_cache.key(meta_data, ems, options)
+    except OSError:
+        return None
+
+
+def iter_roster(schedules, year, month, default_file_path=None, backend=None, max_documents=None,
+                profile_path=None, session=None, input_file=TEMPLATE_FILE, holiday_calendar=None, output_cache=None):
+    """
+    generate_roster와 같지만 문서 한 건을 만들 때마다 결과를 내보내는 제너레이터
+
+    중간에 반복을 멈추면 남은 매니저는 처리하지 않으므로, 진행 표시나 취소가 필요한 호출자가 사용한다.
+    output_cache(OutputCache)가 주어지면 생성 조건이 같은 기존 결과 파일은 다시 만들지 않고 성공으로 낸다.
+
+    :return: (매니저 이름, 성공 여부, 소요 시간(초))를 차례로 생성
+    """
+    public_holidays = holiday_calendar.month_holidays(year, month) if holiday_calendar else None
+    owned_session = create_session("hwp", backend, max_documents, profile_path) if session is None else None
+    session = session or owned_session
+    try:
+        with owned_session or nullcontext():
+            for ems in schedules:
+                meta_data = build_meta_data(year, month, ems.name, default_file_path, input_file, public_holidays)
+                _check_overrides(meta_data, ems)
+                started = time.perf_counter()
+                key = _cache_key(output_cache, meta_data, ems, session)
+                if key and output_cache.lookup(meta_data, key):
+                    yield ems.name, True, time.perf_counter() - started
+                    continue
+                ok = session.process(meta_data, ems)
+                if ok and key:
+                    output_cache.store(meta_data, key)
+                yield ems.name, ok, time.perf_counter() - started
+    finally:
+        if output_cache is not None:
+            output_cache.save()
+    if profile_path and hasattr(session, "reports"):
+        write_profile_summary(profile_path, session.reports)
+
+
+def write_profile_summary(profile_path, reports):
+    """문서별 호출 보고서의 단계별 요약을 "<profile_path>.summary.json"에 저장"""
+    with open(profile_path + ".summary.json", mode='w', encoding='utf-8') as file:
+        json.dump(summarize(reports), file, ensure_ascii=False, indent=2)
+
+
+def generate_roster(schedules, year, month, default_file_path=None, backend=None, max_documents=None,
+                    profile_path=None, session=None, input_file=TEMPLATE_FILE, holiday_calendar=None,
+                    output_cache=None):
+    """
+    명단의 모든 매니저에 대해 하나의 세션으로 출근부를 생성
+
+    :param schedules: EroomManagerSchedule 목록
+    :param year: 대상 연도
+    :param month: 대상 월
+    :param default_file_path: 템플릿이 있고 결과를 저장할 디렉토리 (기본값: 현재 디렉토리)
+    :param backend: 문서 엔진 백엔드 (기본값: 한글 오피스 COM 백엔드)
+    :param max_documents: 한글 오피스 인스턴스 하나로 처리할 최대 문서 수 (None이면 제한 없음)
+    :param profile_path: 문서별 HWP 호출 보고서(JSON Lines) 파일, 주어지면 단계별 요약을
+                         "<profile_path>.summary.json"에 저장
+    :param session: 문서를 생성할 세션 (HwpSession, HwpxSession 등, 기본값: backend로 만든 HwpSession)
+                    주어진 세션은 닫지 않으므로 여러 달을 한 세션으로 이어서 생성할 수 있다.
+    :param input_file: 템플릿 파일 이름 (확장자에 따라 결과 파일 확장자가 정해짐)
+    :param holiday_calendar: 공휴일을 휴무일에 더할 HolidayCalendar (None이면 공휴일을 반영하지 않음)
+    :param output_cache: 바뀌지 않은 문서를 건너뛸 OutputCache (None이면 모든 문서를 생성)
+    :return: (매니저 이름, 성공 여부, 소요 시간(초)) 목록
+    """
+    return list(iter_roster(schedules, year, month, default_file_path, backend, max_documents,
+                            profile_path, session, input_file, holiday_calendar, output_cache))
+
+
+def combine_roster(schedules, year, month, session, default_file_path=None, input_file=TEMPLATE_FILE,
+                   holiday_calendar=None):
+    """
+    명단 전체의 출근부를 한 달에 파일 하나로 생성 (hwp 엔진은 쪽으로 이어 붙인 문서, hwpx 엔진은 압축 파일)
+
+    :param session: combine()을 지원하는 세션 (StagedHwpSession, HwpxSession)
+    :return: {"output": 경로, "documents": 문서 수, "pages": 쪽 수, "bytes": 파일 크기}, 실패하면 None
+    """
+    public_holidays = holiday_calendar.month_holidays(year, month) if holiday_calendar else None
+    documents = [(build_meta_data(year, month, ems.name, default_file_path, input_file, public_holidays), ems)
+                 for ems in schedules]
+    output_path = os.path.join(os.path.abspath(default_file_path or os.getcwd()),
+                               COMBINED_FILE_NAME.format(year=year, month=month, extension=session.combined_extension))
+    try:
+        report = session.combine(documents, output_path)
+    except Exception as e:
+        print(f"오류 발생: {e}")
+        return None
+    print(f"파일이 성공적으로 저장되었습니다: {os.path.basename(output_path)}")
+    return report
+
+
+def parse_target_date(value):
+    """YYYY-MM 형식의 문자열을 (연도, 월)로 변환"""
+    try:
+        target_date = datetime.strptime(value, "%Y-%m")
+    except ValueError:
+        raise argparse.ArgumentTypeError("날짜 형식이 올바르지 않습니다. YYYY-MM 형식이어야 합니다.")
+    return target_date.year, target_date.month
+
+
+def iter_months(start, end):
+    """(연도, 월) start부터 end까지(양끝 포함)의 (연도, 월)을 차례로 생성"""
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="청년이룸 출근부 일괄 생성")
+    parser.add_argument("target_date", type=parse_target_date, help="대상 연월 (YYYY-MM)")
+    parser.add_argument("--until", type=parse_target_date, default=None,
+                        help="여러 달을 한 번에 생성할 때 마지막 연월 (YYYY-MM, 기본값: target_date 한 달)")
+    parser.add_argument("--roster", default=DEFAULT_DB_FILE,
+                        help="매니저 명단 SQLite 데이터베이스(.db, 공휴일도 함께 읽음, 기본값: 프로그램 창과 같은 "
+                             "데이터베이스) 또는 CSV 파일")
+    parser.add_argument("--dir", default=os.getcwd(), help="템플릿이 있고 결과를 저장할 디렉토리")
+    parser.add_argument("--holidays", default="holiday_data.txt",
+                        help="공휴일 파일, --roster가 CSV일 때 또는 데이터베이스를 처음 만들 때 사용 "
+                             "(없으면 공휴일을 반영하지 않음)")
+    parser.add_argument("--rotation-weeks", type=int, default=ROTATION_WEEKS,
+                        help="--roster가 CSV일 때 대체 휴무일/토요일 근무일의 반복 간격(주), 데이터베이스에 처음 "
+                             "가져올 때와 같은 규칙 (0이면 파일의 날짜에만 적용, 데이터베이스는 저장된 규칙을 사용)")
+    parser.add_argument("--engine", default="hwp", choices=ENGINES,
+                        help="hwp: 한글 오피스 자동화로 .hwp 생성, hwpx: XML을 직접 편집하여 .hwpx 생성")
+    parser.add_argument("--template", default=None, help="템플릿 파일 이름 (기본값: 엔진별 기본 템플릿)")
+    parser.add_argument("--backend", default="com", choices=sorted(BACKENDS), help="hwp 엔진의 문서 엔진 백엔드")
+    parser.add_argument("--combine", action="store_true",
+                        help="한 달의 출근부를 파일 하나로 생성 (hwp: 쪽으로 이어 붙인 문서, hwpx: 압축 파일)")
+    parser.add_argument("--staged", action="store_true",
+                        help="hwp 엔진에서 월 문서와 휴무일별 문서를 한 번씩 만든 뒤 매니저마다 이름만 치환")
+    parser.add_argument("--no-fields", action="store_true",
+                        help="hwp 엔진에서 자리 표시자를 필드로 바꾸지 않고 항목마다 찾아 바꾸기로 치환")
+    parser.add_argument("--max-documents", type=int, default=None,
+                        help="한글 오피스 인스턴스 하나로 처리할 최대 문서 수 (기본값: 제한 없음)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="문서를 나누어 만들 작업자 프로세스 수 (작업자마다 한글 오피스 인스턴스 하나, --combine과 함께 쓸 수 없음)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="hwp 엔진에서 문서 한 건을 기다릴 최대 시간(초), 넘으면 한글 오피스 인스턴스를 종료하고 "
+                             "교체 (--workers가 2 이상이면 작업자 프로세스째 교체)")
+    parser.add_argument("--force", action="store_true",
+                        help="출력 캐시를 무시하고 모든 문서를 다시 생성")
+    parser.add_argument("--profile", default=None, help="문서별 HWP 호출 보고서(JSON Lines)를 저장할 파일")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    months = list(iter_months(args.target_date, args.until or args.target_date))
+    database = None
+    if args.roster.endswith(".db"):
+        database = open_database(args.roster, holiday_file_path=args.holidays)
+        holiday_calendar = HolidayCalendar(database.list_holidays())
+    else:
+        schedules = load_schedules(args.roster, args.rotation_weeks)
+        holiday_calendar = HolidayCalendar.from_file(args.holidays)
+
+    farm = None
+    if args.workers > 1 and not args.combine:
+        from worker_farm import DEFAULT_MAX_DOCUMENTS, DEFAULT_TIMEOUT, WorkerFarm
+
+        kind = "hwpx" if args.engine == "hwpx" else "staged" if args.staged else "hwp"
+        farm = WorkerFarm(args.workers, kind, args.backend, args.max_documents or DEFAULT_MAX_DOCUMENTS,
+                          args.timeout or DEFAULT_TIMEOUT, {} if kind == "hwpx" else {"use_fields": not args.no_fields},
+                          args.profile)
+        session = farm
+        input_file = args.template or (HWPX_TEMPLATE_FILE if args.engine == "hwpx" else TEMPLATE_FILE)
+    elif args.engine == "hwpx":
+        session = create_session("hwpx")
+        input_file = args.template or HWPX_TEMPLATE_FILE
+    else:
+        session = create_session("staged" if args.staged or args.combine else "hwp",
+                                 get_backend(args.backend), args.max_documents, args.profile,
+                                 use_fields=not args.no_fields, document_timeout=args.timeout)
+        input_file = args.template or TEMPLATE_FILE
+
+    output_cache = OutputCache(os.path.abspath(args.dir))
+    if args.force:
+        output_cache.entries = {}
+    started = time.perf_counter()
+    results = []
+    combined = []  # (연월, combine_roster 결과)
+    with session:
+        for year, month in months:
+            if database is not None:
+                # 그 달의 일정 예외만 색인으로 읽어 붙임
+                schedules = database.schedules_for_month(year, month)
+            if args.combine:
+                combined.append((f"{year}-{str(month).zfill(2)}",
+                                 combine_roster(schedules, year, month, session, args.dir, input_file, holiday_calendar)))
+                continue
+            if farm is not None:
+                from worker_farm import iter_roster_parallel
+
+                results += iter_roster_parallel(schedules, year, month, farm, args.dir, input_file, holiday_calendar,
+                                                output_cache)
+                continue
+            results += generate_roster(schedules, year, month, args.dir, profile_path=args.profile,
+                                       session=session, input_file=input_file, holiday_calendar=holiday_calendar,
+                                       output_cache=output_cache)
+    elapsed = time.perf_counter() - started
+    if database is not None:
+        database.close()
+
+    if args.combine:
+        for target_date, report in combined:
+            if report is None:
+                print(f"실패\t{target_date}")
+            else:
+                print(f"성공\t{target_date}\t{os.path.basename(report['output'])}\t{report['documents']}건\t"
+                      f"{report['pages']}쪽\t{report['bytes']}바이트")
+        print(f"총 {len(combined)}개월, {elapsed:.3f}s")
+        return 1 if any(report is None for _, report in combined) else 0
+
+    for name, ok, doc_elapsed in results:
+        print(f"{'성공' if ok else '실패'}\t{name}\t{doc_elapsed:.3f}s")
+    failed = sum(1 for _, ok, _ in results if not ok)
+    print(f"총 {len(results)}건 (실패 {failed}건), {elapsed:.3f}s")
+    print(f"생성 {output_cache.generated}건, 재사용 {output_cache.reused}건, 무효화 {output_cache.invalidated}건")
+    if farm is not None:
+        summary = farm.to_dict()
+        print(f"작업자 {summary['workers']}개: 시작 {summary['started']}회, 교체 {summary['recycled']}회, "
+              f"시간 초과 {summary['timeouts']}건")
+        if args.profile and farm.reports:
+            write_profile_summary(args.profile, farm.reports)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,20 @@
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
 import os
 import calendar
+
+ROTATION_WEEKS = 4  # 대체 휴무일과 토요일 근무일이 돌아오는 기본 간격 (주)
+
+@lru_cache(maxsize=None)
+def _weekend_days(year, month):
+    """해당 월의 주말 날짜 (월의 첫 요일로 계산하므로 날짜마다 datetime을 만들지 않음)"""
+    first_weekday, last_day = calendar.monthrange(year, month)
+    return frozenset(day for day in range(1, last_day + 1) if (first_weekday + day - 1) % 7 >= 5)
+
+
 class MetaData:
-    def __init__(self, default_file_path, input_file, output_file_name, target_date):
+    def __init__(self, default_file_path, input_file, output_file_name, target_date, public_holidays=None):
         """
         HWP 자동 생성에 필요한 메타데이터를 관리하는 클래스
 
@@ -11,11 +22,13 @@ class MetaData:
         :param input_file: 템플릿으로 사용할 파일 이름
         :param output_file_name: 출력할 파일 이름
         :param target_date: 자동 생성 기준 연월 (YYYY-MM 형식)
+        :param public_holidays: 해당 월의 공휴일 날짜(일) 집합 (기본값: 없음)
         """
         self.default_file_path = self._validate_path(default_file_path)
         self.input_file = input_file
         self.output_file_name = output_file_name
         self.target_date = self._validate_date(target_date)
+        self.public_holidays = frozenset(public_holidays or ())
 
     def _validate_path(self, path):
         """경로가 유효한지 검사 (존재하지 않으면 예외 발생)"""
@@ -32,7 +45,8 @@ class MetaData:
 
     def __repr__(self):
         return (f"MetaData(default_file_path={self.default_file_path}, input_file={self.input_file}, "
-                f"output_file_name={self.output_file_name}, target_date={self.target_date})")
+                f"output_file_name={self.output_file_name}, target_date={self.target_date}, "
+                f"public_holidays={sorted(self.public_holidays)})")
 
     def to_dict(self):
         """객체를 딕셔너리 형태로 변환"""
@@ -40,13 +54,13 @@ class MetaData:
             "default_file_path": self.default_file_path,
             "input_file": self.input_file,
             "output_file_name": self.output_file_name,
-            "target_date": self.target_date
+            "target_date": self.target_date,
+            "public_holidays": sorted(self.public_holidays)
         }
     def get_weekends(self):
         """지정된 월의 주말 날짜 목록을 반환"""
         year, month = map(int, self.target_date.split('-'))
-        return {day for day in range(1, calendar.monthrange(year, month)[1] + 1)
-                if datetime(year, month, day).weekday() in [5, 6]}
+        return set(_weekend_days(year, month))
     def get_invalid_days(self):
         """해당 월의 존재하지 않는 날짜 목록을 반환"""
         year, month = map(int, self.target_date.split('-'))
@@ -55,18 +69,157 @@ class MetaData:
     
 
 
+class ScheduleOverride:
+    DAY_OFF = "day_off"  # 대체 휴무 (휴무일에 더함)
+    WORKDAY = "workday"  # 토요일 근무 (휴무일에서 뺌)
+
+    def __init__(self, date, kind):
+        """
+        특정 날짜의 근무 일정 예외를 저장하는 클래스
+
+        :param date: 날짜 (YYYY-MM-DD 형식의 문자열)
+        :param kind: ScheduleOverride.DAY_OFF 또는 ScheduleOverride.WORKDAY
+        """
+        if kind not in (self.DAY_OFF, self.WORKDAY):
+            raise ValueError(f"알 수 없는 일정 예외 종류입니다: {kind}")
+        self.date = self._validate_date(date)
+        self.kind = kind
+
+    def _validate_date(self, date):
+        """YYYY-MM-DD 형식의 날짜인지 검증"""
+        try:
+            return datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d")
+        except ValueError:
+            raise ValueError("날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식이어야 합니다.")
+
+    @property
+    def month(self):
+        """YYYY-MM 형식의 연월"""
+        return self.date[:7]
+
+    @property
+    def day(self):
+        return int(self.date[8:])
+
+    def __repr__(self):
+        return f"ScheduleOverride(date={self.date}, kind={self.kind})"
+
+    def __eq__(self, other):
+        return isinstance(other, ScheduleOverride) and (self.date, self.kind) == (other.date, other.kind)
+
+    def __hash__(self):
+        return hash((self.date, self.kind))
+
+    def to_dict(self):
+        """객체를 딕셔너리 형태로 변환"""
+        return {"date": self.date, "kind": self.kind}
+
+
+class RecurrenceRule:
+    def __init__(self, kind, anchor, interval_weeks=ROTATION_WEEKS, exceptions=()):
+        """
+        기준 날짜부터 일정한 간격으로 반복되는 일정 예외 규칙 (예: 2025-02-10부터 4주마다 대체 휴무)
+
+        저장된 날짜를 옮기지 않고 달마다 필요할 때 계산하므로, 어느 달을 보든 명단을 다시 쓰지 않는다.
+
+        :param kind: ScheduleOverride.DAY_OFF 또는 ScheduleOverride.WORKDAY
+        :param anchor: 첫 날짜 (YYYY-MM-DD 형식의 문자열), 이전 날짜에는 적용하지 않음
+        :param interval_weeks: 반복 간격 (주)
+        :param exceptions: 건너뛸 날짜 (YYYY-MM-DD 형식의 문자열 목록)
+        """
+        if kind not in (ScheduleOverride.DAY_OFF, ScheduleOverride.WORKDAY):
+            raise ValueError(f"알 수 없는 일정 예외 종류입니다: {kind}")
+        if int(interval_weeks) < 1:
+            raise ValueError("반복 간격은 1주 이상이어야 합니다.")
+        self.kind = kind
+        self.anchor = self._validate_date(anchor)
+        self.interval_weeks = int(interval_weeks)
+        self.exceptions = frozenset(self._validate_date(date) for date in exceptions)
+
+    def _validate_date(self, date):
+        """YYYY-MM-DD 형식의 날짜인지 검증"""
+        try:
+            return datetime.strptime(date, "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError("날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식이어야 합니다.")
+
+    def __repr__(self):
+        return f"RecurrenceRule(kind={self.kind}, anchor={self.anchor}, interval_weeks={self.interval_weeks})"
+
+    def __eq__(self, other):
+        return isinstance(other, RecurrenceRule) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash((self.kind, self.anchor, self.interval_weeks, self.exceptions))
+
+    def to_dict(self):
+        """객체를 딕셔너리 형태로 변환"""
+        return {
+            "kind": self.kind,
+            "anchor": self.anchor.strftime("%Y-%m-%d"),
+            "interval_weeks": self.interval_weeks,
+            "exceptions": sorted(date.strftime("%Y-%m-%d") for date in self.exceptions)
+        }
+
+    def covers(self, override: ScheduleOverride):
+        """같은 종류이고 기준 날짜가 있는 달 이후의 예외이면 True (규칙이 대신 정하는 날짜)"""
+        return override.kind == self.kind and override.month >= self.anchor.strftime("%Y-%m")
+
+    def dates_in_month(self, year, month):
+        """해당 월에 규칙이 적용되는 날짜 목록 (기준 날짜에서 간격의 배수만큼 떨어진 날만 계산)"""
+        first = datetime(year, month, 1).date()
+        last = first.replace(day=calendar.monthrange(year, month)[1])
+        start = max(first, self.anchor)
+        if start > last:
+            return []
+        step = self.interval_weeks * 7
+        current = self.anchor + timedelta(days=-(-(start - self.anchor).days // step) * step)  # start 이후 첫 반복
+        dates = []
+        while current <= last:
+            if current not in self.exceptions:
+                dates.append(current)
+            current += timedelta(days=step)
+        return dates
+
+    def overrides(self, year_month):
+        """
+        해당 월의 일정 예외
+
+        :param year_month: YYYY-MM 형식의 연월
+        :return: ScheduleOverride 목록
+        """
+        year, month = map(int, year_month.split('-'))
+        return [ScheduleOverride(date.strftime("%Y-%m-%d"), self.kind) for date in self.dates_in_month(year, month)]
+
+
 class EroomManagerSchedule:
-    def __init__(self, name, substitute_holiday, saturday_workday):
+    def __init__(self, name, substitute_holiday, saturday_workday, overrides=(), fields=None, rules=()):
         """
         청년이룸 매니저의 근무 일정을 관리하는 클래스
         
         :param name: 매니저 이름
         :param substitute_holiday: 대체휴무일 (YYYY-MM-DD 형식의 문자열)
         :param saturday_workday: 토요일 근무일 (YYYY-MM-DD 형식의 문자열)
+        :param overrides: 여러 달에 걸친 일정 예외 (ScheduleOverride 목록)
+        :param fields: 템플릿에 채울 추가 항목 (예: {"Department": "운영팀"}, 템플릿에는 %Department로 표시)
+        :param rules: 반복되는 대체 휴무/토요일 근무 (RecurrenceRule 목록, 종류마다 하나)
         """
         self.name = name  # 매니저 이름
         self.substitute_holiday = substitute_holiday  # 대체휴무일
         self.saturday_workday = saturday_workday  # 토요일 근무일
+        self.fields = dict(fields or {})  # 부서, 센터, 매니저 번호 등
+        self.rules = list(rules)  # 달마다 get_overrides에서 계산
+        self.overrides_by_month = {}  # {YYYY-MM: [ScheduleOverride]}
+        for override in overrides:
+            self.add_override(override)
+
+    @classmethod
+    def rotating(cls, name, substitute_holiday, saturday_workday, interval_weeks=ROTATION_WEEKS):
+        """대체 휴무일과 토요일 근무일부터 각각 interval_weeks주마다 반복하는 일정"""
+        rules = [RecurrenceRule(kind, date, interval_weeks)
+                 for date, kind in ((substitute_holiday, ScheduleOverride.DAY_OFF),
+                                    (saturday_workday, ScheduleOverride.WORKDAY)) if date]
+        return cls(name, substitute_holiday, saturday_workday, rules=rules)
 
     def __repr__(self):
         return f"EroomManagerSchedule(name={self.name}, substitute_holiday={self.substitute_holiday}, saturday_workday={self.saturday_workday})"
@@ -76,22 +229,71 @@ class EroomManagerSchedule:
         return {
             "name": self.name,
             "substitute_holiday": self.substitute_holiday,
-            "saturday_workday": self.saturday_workday
+            "saturday_workday": self.saturday_workday,
+            "overrides": [override.to_dict() for override in self.get_overrides()],
+            "fields": dict(self.fields),
+            "rules": [rule.to_dict() for rule in self.rules]
         }
+
+    def add_override(self, override: ScheduleOverride):
+        """일정 예외 추가 (같은 날짜, 같은 종류가 이미 있으면 무시)"""
+        overrides = self.overrides_by_month.setdefault(override.month, [])
+        if override not in overrides:
+            overrides.append(override)
+
+    def get_overrides(self, year_month=None):
+        """
+        일정 예외 목록 (대체휴무일/토요일 근무일 필드 포함)
+
+        반복 규칙은 끝이 없으므로 year_month를 주었을 때만 그 달의 날짜를 계산하여 포함한다.
+        규칙의 기준 날짜가 있는 달부터는 규칙이 우선하므로, 그 이후로 기록된 같은 종류의 예외는 빼고 규칙의 날짜만 쓴다.
+
+        :param year_month: YYYY-MM 형식의 연월 (None이면 전체)
+        """
+        if year_month is None:
+            overrides = [override for month in sorted(self.overrides_by_month)
+                         for override in self.overrides_by_month[month]]
+        else:
+            overrides = list(self.overrides_by_month.get(year_month, ()))
+        for date, kind in ((self.saturday_workday, ScheduleOverride.WORKDAY),
+                           (self.substitute_holiday, ScheduleOverride.DAY_OFF)):
+            if date and (year_month is None or date.startswith(year_month)):
+                override = ScheduleOverride(date, kind)
+                if override not in overrides:
+                    overrides.append(override)
+        for rule in self.rules:
+            overrides = [override for override in overrides if not rule.covers(override)]
+            if year_month is not None:
+                overrides.extend(rule.overrides(year_month))
+        return overrides
+
+    def duplicate_kinds(self, year_month):
+        """
+        해당 월에 날짜가 둘 이상인 일정 예외 종류 (대체 휴무와 토요일 근무는 달마다 하루씩이어야 함)
+
+        반복 규칙이 한 달에 두 번 돌아오는 경우(4주 간격인데 그 달이 5주에 걸친 경우)는 정상이므로 제외한다.
+
+        :param year_month: YYYY-MM 형식의 연월
+        :return: ScheduleOverride.DAY_OFF / ScheduleOverride.WORKDAY 중 날짜가 겹친 종류 목록
+        """
+        counts = {}
+        for override in self.get_overrides(year_month):
+            counts[override.kind] = counts.get(override.kind, 0) + 1
+        expected = {rule.kind: len(rule.overrides(year_month)) for rule in self.rules}
+        return [kind for kind, count in sorted(counts.items()) if count > max(expected.get(kind, 0), 1)]
+
     def get_day_off(self, meta_data: MetaData):
-        weekends = meta_data.get_weekends()
-        
-        # target_date의 연-월 정보 추출
-        target_year_month = meta_data.target_date[:7]
-        
-        # 날짜에서 일(day) 부분만 추출하여 정수 변환 (년-월 일치 여부 확인)
-        if self.saturday_workday.startswith(target_year_month):
-            saturday_workday_day = int(self.saturday_workday.split('-')[-1])
-            weekends.discard(saturday_workday_day)
+        """주말과 공휴일에서 토요일 근무일을 빼고 대체 휴무일을 더한 휴무일 집합"""
+        weekends = meta_data.get_weekends() | meta_data.public_holidays
         
-        if self.substitute_holiday.startswith(target_year_month):
-            substitute_holiday_day = int(self.substitute_holiday.split('-')[-1])
-            weekends.add(substitute_holiday_day)
+        # 해당 연월의 일정 예외만 색인에서 꺼내 적용 (근무일을 먼저 빼고 휴무일을 더함)
+        overrides = self.get_overrides(meta_data.target_date[:7])
+        for override in overrides:
+            if override.kind == ScheduleOverride.WORKDAY:
+                weekends.discard(override.day)
+        for override in overrides:
+            if override.kind == ScheduleOverride.DAY_OFF:
+                weekends.add(override.day)
         
         return weekends
 
@@ -143,7 +345,9 @@ def generate_replace_dict(metadata:MetaData, eroom_manager_schedule:EroomManager
             "%Month": str(month),  # 월 (숫자 형태)
             "%Endday": str(last_day),  # 해당 월의 마지막 날
             "%일1" : "월/일",
-            "%일2": "월/일"
+            "%일2": "월/일",
+            # 추가 항목은 템플릿의 %항목이름 자리에 채움
+            **{f"%{key}": str(value) for key, value in eroom_manager_schedule.fields.items()}
         }
     except Exception as e:
         raise ValueError(f"replace_dict 생성 중 오류 발생: {e}")
@@ -0,0 +1,98 @@
+import calendar
+import os
+from functools import lru_cache
+
+from eroom import EroomManagerSchedule, PublicHoliday, ScheduleOverride
+
+
+@lru_cache(maxsize=None)
+def weekend_mask(year, month):
+    """해당 월의 주말을 비트로 표시한 값 (비트 d가 d일)"""
+    first_weekday, last_day = calendar.monthrange(year, month)
+    mask = 0
+    for day in range(1, last_day + 1):
+        if (first_weekday + day - 1) % 7 >= 5:
+            mask |= 1 << day
+    return mask
+
+
+def mask_to_days(mask):
+    """비트 값을 날짜 집합으로 변환"""
+    return {day for day in range(1, 32) if mask >> day & 1}
+
+
+def load_holidays(file_path):
+    """공휴일 파일(한 줄에 YYYY-MM-DD 하나)을 읽어 PublicHoliday 목록으로 반환"""
+    if not os.path.exists(file_path):
+        return []
+    with open(file_path, mode='r', encoding='utf-8') as file:
+        return [PublicHoliday(line.strip()) for line in file if line.strip()]
+
+
+class HolidayCalendar:
+    def __init__(self, holidays=()):
+        """
+        공휴일을 연도별 월 비트 색인으로 미리 정리해 두고 휴무일을 계산하는 클래스
+
+        :param holidays: PublicHoliday 목록
+        """
+        self.years = {}  # {연도: [1월 비트, ..., 12월 비트]}
+        self._day_off_masks = {}  # {(연도, 월): 주말과 공휴일을 합친 비트}
+        for holiday in holidays:
+            self.add(holiday)
+
+    @classmethod
+    def from_file(cls, file_path):
+        return cls(load_holidays(file_path))
+
+    def __repr__(self):
+        return f"HolidayCalendar(years={sorted(self.years)})"
+
+    def add(self, holiday: PublicHoliday):
+        months = self.years.setdefault(holiday.date.year, [0] * 12)
+        months[holiday.date.month - 1] |= 1 << holiday.date.day
+        self._day_off_masks.pop((holiday.date.year, holiday.date.month), None)
+
+    def holiday_mask(self, year, month):
+        months = self.years.get(year)
+        return months[month - 1] if months else 0
+
+    def month_holidays(self, year, month):
+        """해당 월의 공휴일 날짜 집합"""
+        return mask_to_days(self.holiday_mask(year, month))
+
+    def day_off_mask(self, year, month):
+        """해당 월의 주말과 공휴일을 합친 비트 값"""
+        key = (year, month)
+        if key not in self._day_off_masks:
+            self._day_off_masks[key] = weekend_mask(year, month) | self.holiday_mask(year, month)
+        return self._day_off_masks[key]
+
+    def days_off(self, schedule: EroomManagerSchedule, year, month):
+        """
+        매니저의 해당 월 휴무일 집합 (EroomManagerSchedule.get_day_off와 같은 규칙)
+
+        주말과 공휴일을 합친 뒤 토요일 근무일을 빼고 대체 휴무일을 더한다.
+        """
+        return mask_to_days(self.days_off_mask(schedule, year, month))
+
+    def days_off_mask(self, schedule: EroomManagerSchedule, year, month):
+        """days_off와 같은 휴무일을 비트 값으로 반환"""
+        mask = self.day_off_mask(year, month)
+        overrides = schedule.get_overrides(f"{year}-{str(month).zfill(2)}")
+        for override in overrides:
+            if override.kind == ScheduleOverride.WORKDAY:
+                mask &= ~(1 << override.day)
+        for override in overrides:
+            if override.kind == ScheduleOverride.DAY_OFF:
+                mask |= 1 << override.day
+        return mask
+
+    def roster_days_off(self, schedules, year, months=range(1, 13)):
+        """
+        명단 전체의 여러 달 휴무일을 한 번에 계산
+
+        :return: {매니저 이름: {월: 휴무일 집합}}
+        """
+        return {schedule.name: {month: self.days_off(schedule, year, month) for month in months}
+                for schedule in schedules}
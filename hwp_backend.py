@@ -0,0 +1,358 @@
+import os
+import shutil
+import signal
+import time
+
+
+def kill_process(pid):
+    """프로세스 ID로 프로세스를 강제로 종료 (이미 끝났으면 무시, Windows에서는 TerminateProcess)"""
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        pass
+
+
+class HwpBackend:
+    """
+    HwpProcessor가 사용하는 문서 엔진 인터페이스
+
+    create()는 한글 오피스 자동화 객체(HWPFrame.HwpObject)와 같은 인터페이스를 가진 객체를 반환해야 한다.
+    """
+    name = None
+
+    def create(self):
+        """문서 엔진 객체를 생성하여 반환"""
+        raise NotImplementedError
+
+    def process_id(self, hwp):
+        """create()로 만든 객체를 실행하는 프로세스 ID (별도 프로세스가 없거나 알 수 없으면 None)"""
+        return None
+
+
+class ComHwpBackend(HwpBackend):
+    """win32com을 통해 설치된 한글 오피스를 구동하는 백엔드 (Windows 전용)"""
+    name = "com"
+
+    def create(self):
+        """한글 오피스 객체를 초기화하고 보안 모듈을 등록"""
+        import win32com.client  # pywin32가 설치된 Windows 환경에서만 불러올 수 있음
+
+        hwp = win32com.client.gencache.EnsureDispatch("HWPFrame.HwpObject")
+        hwp.RegisterModule("FilePathCheckDLL", "SecurityModule")  # 보안 경고 방지
+        return hwp
+
+    def process_id(self, hwp):
+        """한글 오피스 창을 가진 Hwp.exe의 프로세스 ID"""
+        try:
+            import win32process
+
+            return win32process.GetWindowThreadProcessId(hwp.XHwpWindows.Item(0).WindowHandle)[1]
+        except Exception as e:
+            print(f"한글 오피스 프로세스 ID를 알 수 없습니다: {e}")
+            return None
+
+
+# 출근부 템플릿의 날짜 열 구성: 머리글 셀 아래로 16행, 빈 셀은 None
+DEFAULT_DAY_COLUMNS = {
+    "%일1": list(range(1, 17)),
+    "%일2": list(range(17, 32)) + [None],
+}
+# 날짜 열 머리글 외에 템플릿에 들어 있는 자리 표시자
+DEFAULT_TEXTS = ("%Name", "%Year", "%Month", "%EndDay")
+HACTION_METHODS = {"Run", "Execute", "GetDefault"}  # 지연 시간을 동작 이름별로 따로 둘 수 있는 메서드
+
+
+def latency_key(method, name=None):
+    """HwpProfiler 보고서와 같은 호출 이름 ("Run:MoveTop", "Open" 등)"""
+    return f"{method}:{name}" if name and method in HACTION_METHODS else method
+
+
+class _FakeParameterSet:
+    """HParameterSet.HFindReplace 흉내"""
+
+    def __init__(self):
+        self.HSet = self
+        self.FindString = ""
+        self.ReplaceString = ""
+        self.ReplaceMode = 0
+        self.IgnoreMessage = 0
+        self.Direction = 0
+
+
+class _FakeHAction:
+    def __init__(self, hwp):
+        self._hwp = hwp
+
+    def Run(self, action):
+        return self._hwp._run(action)
+
+    def GetDefault(self, action, parameter_set):
+        self._hwp._record("GetDefault", action)
+        return True
+
+    def Execute(self, action, parameter_set):
+        return self._hwp._execute(action, parameter_set)
+
+
+class _FakeInsertFileSet:
+    """HParameterSet.HInsertFile 흉내"""
+
+    def __init__(self):
+        self.HSet = self
+        self.FileName = ""
+        self.KeepSection = 0
+        self.KeepCharshape = 0
+        self.KeepParashape = 0
+        self.KeepStyle = 0
+
+
+class _FakeHParameterSet:
+    def __init__(self):
+        self.HFindReplace = _FakeParameterSet()
+        self.HInsertFile = _FakeInsertFileSet()
+
+
+class FakeHwpObject:
+    """
+    한글 오피스 없이 동작하는 HwpObject 대용 객체
+
+    출근부 템플릿의 날짜 열과 자리 표시자, 필드만 흉내 내며, 호출된 동작과 대각선/삭제/치환 결과를 기록한다.
+    SaveAs는 열린 파일을 그대로 복사하고, 빈 문서에 끼워 넣은 파일이 있으면 그 내용을 이어 붙여 저장한다.
+    저장한 문서의 자리 표시자와 필드는 documents에 남겨 두었다가 같은 파일을 다시 열거나 끼워 넣을 때 되살린다.
+    문서는 경로가 아니라 파일 ID와 수정 시각으로 찾으므로, 임시 이름으로 저장한 뒤 os.replace로 옮긴 파일도 찾는다.
+    latency가 주어지면 호출마다 그만큼 기다려 실제 한글 오피스의 응답 시간을 흉내 낸다.
+    """
+
+    def __init__(self, day_columns=None, documents=None, latency=None):
+        """
+        :param day_columns: {머리글: 머리글 아래 행의 날짜 목록} (기본값: 출근부 템플릿)
+        :param documents: 저장한 문서 상태를 나눠 쓸 딕셔너리 (기본값: 이 객체 전용)
+        :param latency: {호출 이름: 초}, "*"는 나머지 모든 호출 (예: {"*": 0.0002, "Open": 0.05})
+        """
+        self.day_columns = day_columns or DEFAULT_DAY_COLUMNS
+        self.documents = documents if documents is not None else {}  # {_document_key: (자리 표시자, 필드)}
+        self.latency = dict(latency or {})
+        self.HAction = _FakeHAction(self)
+        self.HParameterSet = _FakeHParameterSet()
+        self.calls = []
+        self.opened_file = None
+        self.diagonals = set()
+        self.deleted = set()
+        self.replaced = {}
+        self.inserted = []  # InsertFile로 끼워 넣은 파일 경로
+        self.texts = []  # 문서에 남아 있는 자리 표시자 텍스트
+        self.fields = []  # [필드 이름, 값] (문서 순서)
+        self._found = None  # RepeatFind로 찾아 블록으로 지정된 자리 표시자
+        self._label = None
+        self._row = 0
+        self._col = 0
+        self._anchor = None  # 셀 블록 연장 중일 때 시작 셀 (행, 열)
+
+    def _record(self, method, name=None):
+        self.calls.append((method, name))
+        if self.latency:
+            delay = self.latency.get(latency_key(method, name), self.latency.get("*", 0))
+            if delay:
+                time.sleep(delay)
+
+    @staticmethod
+    def _document_key(path):
+        """저장한 파일을 가리키는 키 (이름을 바꾸어도 유지되고, 다시 저장하면 달라짐)"""
+        stat = os.stat(path)
+        return stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load(self, path):
+        """저장해 둔 문서의 (자리 표시자, 필드), 이 객체로 저장한 적이 없으면 템플릿 기본값"""
+        texts, fields = self.documents.get(self._document_key(path), (DEFAULT_TEXTS, ()))
+        return list(texts), [list(field) for field in fields]
+
+    def _find_text(self, find_string):
+        """대소문자를 구분하지 않고 문서에 남은 자리 표시자를 찾음"""
+        for text in self.texts:
+            if text.lower() == find_string.lower():
+                return text
+        return None
+
+    def _current_day(self):
+        if self._label is None or self._col != 0 or self._row < 1:
+            return None
+        days = self.day_columns[self._label]
+        if self._row > len(days):
+            return None
+        return days[self._row - 1]
+
+    def _selected_cells(self):
+        if self._anchor is None:
+            return {(self._row, self._col)}
+        rows = range(min(self._anchor[0], self._row), max(self._anchor[0], self._row) + 1)
+        cols = range(min(self._anchor[1], self._col), max(self._anchor[1], self._col) + 1)
+        return {(row, col) for row in rows for col in cols}
+
+    def _run(self, action):
+        self._record("Run", action)
+        if action == "TableCellBlock":
+            self._anchor = None
+        elif action == "TableCellBlockExtend":
+            self._anchor = (self._row, self._col)
+        elif action == "Cancel":
+            self._anchor = None
+        elif action == "TableLowerCell":
+            self._row += 1
+        elif action == "TableUppperCell":
+            self._row = max(self._row - 1, 0)
+        elif action == "TableRightCell":
+            self._col += 1
+        elif action == "TableLeftCell":
+            self._col -= 1
+        elif action == "TableCellBorderDiagonalUp":
+            self.diagonals.update((self._label, row, col) for row, col in self._selected_cells())
+        elif action == "TableDeleteCell":
+            self.deleted.add((self._label, self._row, self._col))
+        elif action == "Delete" and self._found is not None:
+            self.texts.remove(self._found)
+            self._found = None
+        return True
+
+    def _execute(self, action, parameter_set):
+        self._record("Execute", action)
+        if action == "RepeatFind":
+            if parameter_set.FindString in self.day_columns:
+                self._label, self._row, self._col = parameter_set.FindString, 0, 0
+                self._anchor = None
+                return True
+            self._found = self._find_text(parameter_set.FindString)
+            return self._found is not None
+        if action == "AllReplace":
+            self.replaced[parameter_set.FindString] = parameter_set.ReplaceString
+            self.texts = [text for text in self.texts if text.lower() != parameter_set.FindString.lower()]
+        if action == "InsertFile":
+            if not os.path.exists(parameter_set.FileName):
+                return False
+            self.inserted.append(parameter_set.FileName)
+            texts, fields = self._load(parameter_set.FileName)
+            self.texts.extend(texts)
+            self.fields.extend(fields)
+        return True
+
+    @property
+    def PageCount(self):
+        """열린 문서는 한 쪽, 끼워 넣은 파일은 구역마다 한 쪽으로 셈"""
+        return (1 if self.opened_file else 0) + len(self.inserted)
+
+    def CreateField(self, direction, memo=None, name=None):
+        """커서 위치에 빈 필드(누름틀)를 만듦"""
+        self._record("CreateField", name)
+        self.fields.append([name, ""])
+        return True
+
+    def GetFieldList(self, number=0, option=0):
+        """필드 이름을 구분 문자(\\x02)로 이어 반환, number가 1이면 같은 이름의 필드에 {{번호}}를 붙임"""
+        self._record("GetFieldList")
+        if not number:
+            return "\x02".join(dict.fromkeys(name for name, _ in self.fields))
+        seen = {}
+        names = []
+        for name, _ in self.fields:
+            names.append(f"{name}{{{{{seen.get(name, 0)}}}}}")
+            seen[name] = seen.get(name, 0) + 1
+        return "\x02".join(names)
+
+    def PutFieldText(self, names, values):
+        """구분 문자로 이은 필드 이름과 값으로 여러 필드를 한 번에 채움"""
+        self._record("PutFieldText")
+        targets = dict(zip(names.split("\x02"), values.split("\x02")))
+        seen = {}
+        for field in self.fields:
+            index = seen.get(field[0], 0)
+            seen[field[0]] = index + 1
+            for key in (f"{field[0]}{{{{{index}}}}}", field[0]):
+                if key in targets:
+                    field[1] = targets[key]
+                    break
+        return True
+
+    def RegisterModule(self, module_type, module_data):
+        self._record("RegisterModule", module_type)
+        return True
+
+    def Open(self, path, *args):
+        self._record("Open", path)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"파일이 존재하지 않습니다: {path}")
+        self.opened_file = path
+        self.diagonals = set()
+        self.deleted = set()
+        self.replaced = {}
+        self.inserted = []
+        self.texts, self.fields = self._load(path)
+        self._found = None
+        self._label = None
+        return True
+
+    def InitScan(self, option=None, scan_range=None, *args):
+        self._record("InitScan")
+        return True
+
+    def GetText(self):
+        self._record("GetText")
+        day = self._current_day()
+        return (2, "" if day is None else f"{day}\r\n")
+
+    def ReleaseScan(self):
+        self._record("ReleaseScan")
+
+    def SaveAs(self, path, *args):
+        self._record("SaveAs", path)
+        if self.opened_file is None and not self.inserted:
+            raise RuntimeError("열린 문서가 없습니다.")
+        if self.inserted:
+            with open(path, mode='wb') as output:
+                for inserted_path in [self.opened_file] * bool(self.opened_file) + self.inserted:
+                    with open(inserted_path, mode='rb') as file:
+                        shutil.copyfileobj(file, output)
+        elif os.path.abspath(path) != os.path.abspath(self.opened_file):
+            shutil.copyfile(self.opened_file, path)
+        self.documents[self._document_key(path)] = (tuple(self.texts), tuple(tuple(field) for field in self.fields))
+        return True
+
+    def Clear(self, option=None):
+        self._record("Clear")
+        self.opened_file = None
+        self.inserted = []
+        self.texts = []
+        self.fields = []
+        return True
+
+    def Quit(self):
+        self._record("Quit")
+
+
+class FakeHwpBackend(HwpBackend):
+    """한글 오피스 없이 리눅스에서도 동작하는 프로세스 내 대용 백엔드"""
+    name = "fake"
+
+    def __init__(self, day_columns=None, latency=None):
+        """
+        :param day_columns: {머리글: 머리글 아래 행의 날짜 목록} (기본값: 출근부 템플릿)
+        :param latency: 호출별 지연 시간 {호출 이름: 초} (hwp_profile.load_latency로 실측 보고서에서 만들 수 있음)
+        """
+        self.day_columns = day_columns
+        self.latency = latency
+        self.documents = {}  # 이 백엔드로 만든 객체들이 저장한 문서 상태 (객체를 새로 만들어도 유지)
+
+    def create(self):
+        return FakeHwpObject(self.day_columns, self.documents, self.latency)
+
+
+BACKENDS = {
+    ComHwpBackend.name: ComHwpBackend,
+    FakeHwpBackend.name: FakeHwpBackend,
+}
+
+
+def get_backend(name):
+    """이름으로 백엔드 객체를 생성"""
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"알 수 없는 백엔드입니다: {name} (사용 가능: {', '.join(BACKENDS)})")
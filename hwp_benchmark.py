@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from batch import OUTPUT_FILE_NAME, TEMPLATE_FILE, iter_months, parse_target_date
+from eroom import EroomManagerSchedule, MetaData, ScheduleOverride
+from hwp_backend import FakeHwpBackend
+from hwp_profile import PHASES, HwpProfiler, load_latency, summarize
+from write_hwp import HwpSession, StagedHwpSession, modify_hwp_file
+
+MODES = ["modify_hwp_file", "session", "staged"]
+SIZES = [1, 50, 500]
+
+
+def synthetic_roster(size, months, seed=0):
+    """
+    벤치마크용 명단: 매니저마다 달마다 평일 대체 휴무 하루와 토요일 근무 하루를 정함
+
+    :param size: 매니저 수
+    :param months: (연도, 월) 목록
+    :param seed: 난수 시드 (같으면 같은 명단)
+    """
+    generator = random.Random(seed)
+    schedules = []
+    for index in range(size):
+        overrides = []
+        for year, month in months:
+            days = [date(year, month, 1) + timedelta(days=offset) for offset in range(31)]
+            days = [day for day in days if day.month == month]
+            weekdays = [day for day in days if day.weekday() < 5]
+            saturdays = [day for day in days if day.weekday() == 5]
+            overrides.append(ScheduleOverride(generator.choice(weekdays).isoformat(), ScheduleOverride.DAY_OFF))
+            overrides.append(ScheduleOverride(generator.choice(saturdays).isoformat(), ScheduleOverride.WORKDAY))
+        schedules.append(EroomManagerSchedule(f"매니저{index + 1:04d}", "", "", overrides))
+    return schedules
+
+
+def _documents(schedules, months, directory):
+    """(MetaData, EroomManagerSchedule) 목록을 달 순서, 명단 순서대로 생성"""
+    for year, month in months:
+        target_date = f"{year}-{str(month).zfill(2)}"
+        for schedule in schedules:
+            output_file_name = OUTPUT_FILE_NAME.format(year=year, month=month, name=schedule.name, extension=".hwp")
+            yield MetaData(directory, TEMPLATE_FILE, output_file_name, target_date), schedule
+
+
+def run_scenario(mode, schedules, months, template_path, latency=None):
+    """
+    빈 임시 디렉토리에서 mode로 출근부를 만들며 HWP 호출 수와 단계별 시간을 측정
+
+    레이아웃 캐시와 중간 문서도 비어 있는 상태에서 시작하므로 첫 문서의 준비 비용까지 포함된다.
+
+    :param mode: MODES 중 하나
+    :param template_path: 템플릿 파일 (임시 디렉토리로 복사해서 사용)
+    :param latency: FakeHwpBackend에 줄 호출별 지연 시간
+    :return: 측정 결과 딕셔너리
+    """
+    backend = FakeHwpBackend(latency=latency)
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copyfile(template_path, os.path.join(directory, TEMPLATE_FILE))
+        documents = list(_documents(schedules, months, directory))
+        reports = []
+        failed = 0
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # 문서마다 출력하는 메시지는 버림
+            if mode == "modify_hwp_file":
+                for meta_data, schedule in documents:
+                    profiler = HwpProfiler(meta_data.output_file_name)
+                    if modify_hwp_file(meta_data, schedule, backend, profiler):
+                        reports.append(profiler.to_dict())
+                    else:
+                        failed += 1
+            else:
+                session_class = StagedHwpSession if mode == "staged" else HwpSession
+                with session_class(backend, profile_path=os.path.join(directory, "profile.jsonl")) as session:
+                    for meta_data, schedule in documents:
+                        if not session.process(meta_data, schedule):
+                            failed += 1
+                reports = session.reports
+        wall_seconds = time.perf_counter() - started
+
+    calls = {}
+    for report in reports:
+        for key, entry in report["calls"].items():
+            calls[key] = calls.get(key, 0) + entry["count"]
+    total_calls = sum(calls.values())
+    return {
+        "mode": mode,
+        "managers": len(schedules),
+        "months": len(months),
+        "documents": len(documents),
+        "failed": failed,
+        "wall_seconds": wall_seconds,
+        "calls": total_calls,
+        "calls_per_document": total_calls / len(reports) if reports else 0,
+        "phases": {phase: {"calls": sum(report["phases"][phase]["calls"] for report in reports),
+                           "seconds": sum(report["phases"][phase]["seconds"] for report in reports)}
+                   for phase in PHASES},
+        "calls_by_name": dict(sorted(calls.items())),
+        "summary": summarize(reports)
+    }
+
+
+def compare(results, baseline, tolerance=0.0):
+    """
+    기준 결과보다 HWP 호출 수가 늘어난 시나리오를 찾음 (시간은 컴퓨터마다 달라 비교하지 않음)
+
+    :param results: 이번 결과의 "scenarios"
+    :param baseline: 기준 결과의 "scenarios"
+    :param tolerance: 허용할 증가 비율 (0.05면 5%)
+    :return: 호출 수가 늘어난 시나리오 목록 [{"mode", "managers", "months", "baseline", "calls"}]
+    """
+    expected = {(item["mode"], item["managers"], item["months"]): item["calls"] for item in baseline}
+    regressions = []
+    for item in results:
+        key = (item["mode"], item["managers"], item["months"])
+        if key in expected and item["calls"] > expected[key] * (1 + tolerance):
+            regressions.append({"mode": item["mode"], "managers": item["managers"], "months": item["months"],
+                                "baseline": expected[key], "calls": item["calls"]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="한글 오피스 없이 대용 백엔드로 출근부 생성의 HWP 호출 수와 단계별 시간 측정")
+    parser.add_argument("--start", type=parse_target_date, default=(2025, 1), help="첫 연월 (YYYY-MM)")
+    parser.add_argument("--months", type=int, default=3, help="측정할 달 수")
+    parser.add_argument("--sizes", type=int, nargs="*", default=SIZES, help="명단 크기 (매니저 수)")
+    parser.add_argument("--modes", nargs="*", default=MODES, choices=MODES, help="측정할 생성 방식")
+    parser.add_argument("--template", default=TEMPLATE_FILE, help="템플릿 파일")
+    parser.add_argument("--latency", type=float, default=0.0, help="호출마다 기다릴 시간(초)")
+    parser.add_argument("--latency-profile", default=None,
+                        help="한글 오피스에서 --profile로 남긴 보고서(JSON Lines), 호출별 평균 시간을 재현")
+    parser.add_argument("--seed", type=int, default=0, help="명단을 만들 난수 시드")
+    parser.add_argument("--output", default=None, help="결과를 저장할 JSON 파일 (기본값: 표준 출력)")
+    parser.add_argument("--baseline", default=None, help="호출 수를 비교할 기준 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="기준보다 늘어나도 되는 호출 수 비율")
+    args = parser.parse_args(argv)
+
+    latency = load_latency(args.latency_profile) if args.latency_profile else {}
+    if args.latency:
+        latency.setdefault("*", args.latency)
+    end_year, end_month = args.start
+    for _ in range(args.months - 1):
+        end_year, end_month = (end_year + 1, 1) if end_month == 12 else (end_year, end_month + 1)
+    months = list(iter_months(args.start, (end_year, end_month)))
+
+    scenarios = []
+    for size in args.sizes:
+        schedules = synthetic_roster(size, months, args.seed)
+        for mode in args.modes:
+            result = run_scenario(mode, schedules, months, args.template, latency)
+            print(f"{mode}\t{size}명\t{len(months)}개월\t{result['calls']}회\t{result['wall_seconds']:.3f}s",
+                  file=sys.stderr)
+            scenarios.append(result)
+
+    result = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "months": [f"{year}-{str(month).zfill(2)}" for year, month in months],
+        "latency": latency,
+        "scenarios": scenarios
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, mode='w', encoding='utf-8') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, mode='r', encoding='utf-8') as file:
+            regressions = compare(scenarios, json.load(file)["scenarios"], args.tolerance)
+        for item in regressions:
+            print(f"호출 수 증가: {item['mode']} {item['managers']}명 {item['months']}개월 "
+                  f"{item['baseline']}회 -> {item['calls']}회", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
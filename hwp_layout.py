@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+
+DAY_LABELS = ["%일1", "%일2"]  # 날짜 열의 머리글 셀
+DAY_ROWS = 16  # 머리글 아래 날짜 행 수
+DAY_SPAN = 5  # 날짜 셀 오른쪽의 출근/결근/지각·조퇴/확인 칸 수
+LAYOUT_CACHE_FILE = "hwp_layout_cache.json"
+
+
+def file_hash(file_path):
+    """파일 내용의 SHA-256 해시를 반환"""
+    digest = hashlib.sha256()
+    with open(file_path, mode='rb') as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TemplateLayout:
+    def __init__(self, template_hash, cells, span=DAY_SPAN):
+        """
+        출근부 템플릿의 날짜 셀 위치 색인
+
+        :param template_hash: 색인을 만든 템플릿 파일의 해시
+        :param cells: {날짜: {"table": 표 번호, "label": 머리글, "row": 머리글 기준 행, "column": 날짜 열 순번}}
+        :param span: 날짜 셀 오른쪽으로 대각선을 그을 칸 수
+        """
+        self.template_hash = template_hash
+        self.cells = cells
+        self.span = span
+        self.cells_read = 0  # 색인을 만들면서 읽은 셀 수 (캐시에서 불러오면 0)
+
+    def __repr__(self):
+        return f"TemplateLayout(template_hash={self.template_hash[:12]}, days={len(self.cells)}, span={self.span})"
+
+    def to_dict(self):
+        """객체를 딕셔너리 형태로 변환"""
+        return {
+            "template_hash": self.template_hash,
+            "span": self.span,
+            "cells": {str(day): cell for day, cell in self.cells.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["template_hash"], {int(day): cell for day, cell in data["cells"].items()}, data["span"])
+
+    def ordered_cells(self):
+        """(머리글, 행, 날짜) 목록을 표의 열 순서, 행 순서대로 반환"""
+        return sorted(((cell["label"], cell["row"], day) for day, cell in self.cells.items()),
+                      key=lambda item: (DAY_LABELS.index(item[0]), item[1]))
+
+    @classmethod
+    def scan(cls, processor, template_hash):
+        """
+        열린 템플릿 문서의 날짜 열을 한 번 훑어 색인 생성
+
+        :param processor: 템플릿이 열려 있는 HwpProcessor
+        """
+        cells = {}
+        cells_read = 0
+        for column, day_label in enumerate(DAY_LABELS):
+            if not processor.find_and_select_cell(day_label):
+                continue
+            for row in range(1, DAY_ROWS + 1):
+                processor.move_cell("down", 1)
+                cell_date = processor.read_cell_day()
+                cells_read += 1
+                if cell_date is not None:
+                    cells[cell_date] = {"table": 0, "label": day_label, "row": row, "column": column}
+        layout = cls(template_hash, cells)
+        layout.cells_read = cells_read
+        return layout
+
+
+def _read_cache(cache_path):
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, mode='r', encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_layout(template_path, processor=None, cache_path=None):
+    """
+    템플릿의 날짜 셀 색인을 디스크 캐시에서 읽고, 없으면 만든 뒤 저장
+
+    색인은 먼저 hwp_reader로 템플릿 파일을 직접 읽어 만들고, 실패하면 processor로 문서를 훑어서 만든다.
+
+    :param template_path: 템플릿 파일 경로
+    :param processor: 템플릿이 열려 있는 HwpProcessor (캐시가 없고 파일을 직접 읽지 못할 때만 사용)
+    :param cache_path: 캐시 파일 경로 (기본값: 템플릿과 같은 디렉토리의 hwp_layout_cache.json)
+    :return: TemplateLayout, 색인을 만들지 못하면 None
+    """
+    cache_path = cache_path or os.path.join(os.path.dirname(template_path), LAYOUT_CACHE_FILE)
+    template_hash = file_hash(template_path)
+    cache = _read_cache(cache_path)
+    if template_hash in cache:
+        return TemplateLayout.from_dict(cache[template_hash])
+
+    layout = None
+    try:
+        from hwp_reader import HwpDocument  # hwp_reader가 이 모듈을 불러오므로 여기서 불러옴
+        layout = HwpDocument(template_path).to_layout(template_hash)
+    except Exception as e:
+        print(f"템플릿을 직접 읽지 못해 한글 오피스로 색인을 만듭니다: {e}")
+    if (layout is None or not layout.cells) and processor is not None:
+        layout = TemplateLayout.scan(processor, template_hash)
+    if layout is None or not layout.cells:
+        return None
+    cache[template_hash] = layout.to_dict()
+    try:
+        with open(cache_path, mode='w', encoding='utf-8') as file:
+            json.dump(cache, file, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"레이아웃 캐시 저장 실패: {e}")
+    return layout
@@ -0,0 +1,165 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+
+PHASES = ["open", "mark_day_off", "remove_invalid_days", "find_and_replace", "save"]
+
+
+class HwpProfiler:
+    def __init__(self, document):
+        """
+        문서 한 건을 처리하는 동안의 HWP 호출 횟수와 소요 시간을 단계별로 기록하는 클래스
+
+        :param document: 보고서에 남길 문서 이름
+        """
+        self.document = document
+        self.phase_seconds = {phase: 0.0 for phase in PHASES}
+        self.phase_calls = {phase: 0 for phase in PHASES}
+        self.calls = {}  # {"메서드:동작": [횟수, 소요 시간]}
+        self._current = None
+        self._since = None
+
+    def _switch(self, phase):
+        now = time.perf_counter()
+        if self._current is not None:
+            self.phase_seconds[self._current] = self.phase_seconds.get(self._current, 0.0) + now - self._since
+        self._current = phase
+        self._since = now
+
+    @contextmanager
+    def phase(self, name):
+        """with 블록 동안의 호출과 시간을 name 단계로 기록 (중첩되면 안쪽 단계에만 기록)"""
+        previous = self._current
+        self._switch(name)
+        try:
+            yield
+        finally:
+            self._switch(previous)
+
+    def record(self, method, name, elapsed):
+        key = f"{method}:{name}" if name else method
+        entry = self.calls.setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+        if self._current is not None:
+            self.phase_calls[self._current] = self.phase_calls.get(self._current, 0) + 1
+
+    def to_dict(self):
+        """객체를 딕셔너리 형태로 변환"""
+        return {
+            "document": self.document,
+            "total_seconds": sum(self.phase_seconds.values()),
+            "total_calls": sum(count for count, _ in self.calls.values()),
+            "phases": {phase: {"seconds": self.phase_seconds[phase], "calls": self.phase_calls.get(phase, 0)}
+                       for phase in self.phase_seconds},
+            "calls": {key: {"count": count, "seconds": seconds}
+                      for key, (count, seconds) in sorted(self.calls.items())}
+        }
+
+    def write(self, file_path):
+        """보고서를 JSON 한 줄로 파일 끝에 추가"""
+        with open(file_path, mode='a', encoding='utf-8') as file:
+            file.write(json.dumps(self.to_dict(), ensure_ascii=False) + "\n")
+
+
+class _InstrumentedHAction:
+    def __init__(self, haction, profiler):
+        self._haction = haction
+        self._profiler = profiler
+
+    def _timed(self, method, action, *args):
+        started = time.perf_counter()
+        try:
+            return getattr(self._haction, method)(action, *args)
+        finally:
+            self._profiler.record(method, action, time.perf_counter() - started)
+
+    def Run(self, action):
+        return self._timed("Run", action)
+
+    def Execute(self, action, parameter_set):
+        return self._timed("Execute", action, parameter_set)
+
+    def GetDefault(self, action, parameter_set):
+        return self._timed("GetDefault", action, parameter_set)
+
+    def __getattr__(self, name):
+        return getattr(self._haction, name)
+
+
+class InstrumentedHwp:
+    """HwpObject를 감싸 HAction.Run/Execute/GetDefault와 문서 메서드 호출을 profiler에 기록"""
+    TIMED_METHODS = {"GetText", "InitScan", "ReleaseScan", "Open", "SaveAs", "Clear",
+                     "PutFieldText", "CreateField", "GetFieldList", "Insert"}
+
+    def __init__(self, hwp, profiler):
+        self.__dict__["_hwp"] = hwp
+        self.__dict__["_profiler"] = profiler
+        self.__dict__["HAction"] = _InstrumentedHAction(hwp.HAction, profiler)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._hwp, name)
+        if name not in self.TIMED_METHODS:
+            return attribute
+
+        def timed(*args):
+            started = time.perf_counter()
+            try:
+                return attribute(*args)
+            finally:
+                self._profiler.record(name, None, time.perf_counter() - started)
+        return timed
+
+    def __setattr__(self, name, value):
+        setattr(self._hwp, name, value)
+
+
+def percentile(values, q):
+    """최근접 순위 방식의 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(reports):
+    """
+    문서별 보고서(HwpProfiler.to_dict 결과)를 모아 단계별 p50/p95 요약 생성
+
+    :return: {"documents": 문서 수, "phases": {단계: {"p50": 초, "p95": 초, "calls_p50": 횟수}}}
+    """
+    phases = {}
+    for phase in PHASES:
+        seconds = [report["phases"][phase]["seconds"] for report in reports]
+        calls = [report["phases"][phase]["calls"] for report in reports]
+        phases[phase] = {"p50": percentile(seconds, 50), "p95": percentile(seconds, 95),
+                         "calls_p50": percentile(calls, 50)}
+    totals = [report["total_seconds"] for report in reports]
+    return {
+        "documents": len(reports),
+        "total_p50": percentile(totals, 50),
+        "total_p95": percentile(totals, 95),
+        "phases": phases
+    }
+
+
+def load_latency(file_path):
+    """
+    HwpProfiler 보고서(JSON Lines)에서 호출별 평균 소요 시간을 계산
+
+    한글 오피스가 있는 컴퓨터에서 --profile로 남긴 보고서를 FakeHwpBackend의 latency로 쓰면
+    리눅스에서도 실제와 비슷한 응답 시간으로 측정할 수 있다.
+
+    :return: {호출 이름: 평균 초}
+    """
+    totals = {}
+    with open(file_path, mode='r', encoding='utf-8') as file:
+        for line in file:
+            if not line.strip():
+                continue
+            for key, entry in json.loads(line)["calls"].items():
+                total = totals.setdefault(key, [0, 0.0])
+                total[0] += entry["count"]
+                total[1] += entry["seconds"]
+    return {key: seconds / count for key, (count, seconds) in totals.items() if count}
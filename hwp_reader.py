@@ -0,0 +1,340 @@
+import re
+import struct
+import sys
+import zlib
+
+from hwp_layout import DAY_LABELS, TemplateLayout, file_hash
+
+OLE_SIGNATURE = bytes.fromhex("D0CF11E0A1B11AE1")
+MAX_REGULAR_SECTOR = 0xFFFFFFFA  # 이 값 이상은 체인 끝, 빈 섹터 등 특수 값
+FREE_SECTOR = 0xFFFFFFFF
+
+# HWP 5.0 레코드 태그 (HWPTAG_BEGIN = 0x10)
+TAG_PARA_HEADER = 0x10 + 50
+TAG_PARA_TEXT = 0x10 + 51
+TAG_LIST_HEADER = 0x10 + 56
+TAG_TABLE = 0x10 + 61
+
+# 문단 텍스트에서 한 글자(2바이트)만 차지하는 제어 문자, 나머지 제어 문자는 8글자(16바이트)를 차지함
+CHAR_CONTROLS = {0, 10, 13, 24, 25, 26, 27, 28, 29, 30, 31}
+
+PLACEHOLDER_PATTERN = re.compile(r"%일\d|%[A-Za-z]+")
+REQUIRED_PLACEHOLDERS = ["%Name", "%Year", "%Month", "%Endday"] + DAY_LABELS
+
+
+class OleFile:
+    def __init__(self, data):
+        """
+        OLE 복합 파일(Compound File Binary)에서 스트림을 읽는 최소 구현
+
+        :param data: 파일 전체 바이트
+        """
+        if data[:8] != OLE_SIGNATURE:
+            raise ValueError("OLE 복합 파일이 아닙니다.")
+        self.data = data
+        self.sector_size = 1 << struct.unpack_from('<H', data, 30)[0]
+        self.mini_sector_size = 1 << struct.unpack_from('<H', data, 32)[0]
+        fat_count, directory_start = struct.unpack_from('<II', data, 44)
+        self.mini_cutoff, mini_fat_start, _, difat_start, difat_count = struct.unpack_from('<5I', data, 56)
+
+        fat_sectors = list(struct.unpack_from('<109I', data, 76))
+        for _ in range(difat_count):
+            entries = struct.unpack_from(f'<{self.sector_size // 4}I', self._sector(difat_start))
+            fat_sectors.extend(entries[:-1])
+            difat_start = entries[-1]
+        self.fat = []
+        for sector in fat_sectors[:fat_count]:
+            self.fat.extend(struct.unpack_from(f'<{self.sector_size // 4}I', self._sector(sector)))
+
+        self.entries = self._read_directory(self._chain(directory_start))
+        root = self.entries[0]
+        self.mini_stream = self._chain(root["start"])[:root["size"]]
+        mini_fat = self._chain(mini_fat_start) if mini_fat_start < MAX_REGULAR_SECTOR else b""
+        self.mini_fat = list(struct.unpack(f'<{len(mini_fat) // 4}I', mini_fat))
+        self.paths = {}
+        self._walk(root["child"], "")
+
+    def _sector(self, index):
+        # 헤더가 첫 섹터를 차지하므로 섹터 index는 (index + 1)번째 섹터 (버전 4의 4096바이트 섹터도 같음)
+        offset = (index + 1) * self.sector_size
+        return self.data[offset:offset + self.sector_size]
+
+    def _chain(self, start):
+        chunks = []
+        while start < MAX_REGULAR_SECTOR:
+            chunks.append(self._sector(start))
+            start = self.fat[start]
+        return b"".join(chunks)
+
+    def _mini_chain(self, start):
+        chunks = []
+        while start < MAX_REGULAR_SECTOR:
+            offset = start * self.mini_sector_size
+            chunks.append(self.mini_stream[offset:offset + self.mini_sector_size])
+            start = self.mini_fat[start]
+        return b"".join(chunks)
+
+    @staticmethod
+    def _read_directory(directory):
+        entries = []
+        for offset in range(0, len(directory), 128):
+            entry = directory[offset:offset + 128]
+            name_length = struct.unpack_from('<H', entry, 64)[0]
+            left, right, child = struct.unpack_from('<3I', entry, 68)
+            start, size = struct.unpack_from('<II', entry, 116)
+            entries.append({
+                "name": entry[:name_length].decode('utf-16-le').rstrip('\0'),
+                "type": entry[66],  # 1: 저장소, 2: 스트림, 5: 루트
+                "left": left, "right": right, "child": child,
+                "start": start, "size": size
+            })
+        return entries
+
+    def _walk(self, index, prefix):
+        """형제는 이진 트리(left/right), 하위 항목은 child로 연결된 디렉토리를 경로 사전으로 펼침"""
+        stack = [index]
+        while stack:
+            index = stack.pop()
+            if index == FREE_SECTOR:
+                continue
+            entry = self.entries[index]
+            stack.extend([entry["left"], entry["right"]])
+            path = prefix + entry["name"]
+            self.paths[path] = entry
+            if entry["type"] == 1:
+                self._walk(entry["child"], path + "/")
+
+    def listdir(self):
+        return sorted(path for path, entry in self.paths.items() if entry["type"] == 2)
+
+    def read(self, path):
+        """경로("BodyText/Section0" 형식)의 스트림 내용을 반환"""
+        if path not in self.paths:
+            raise KeyError(f"스트림이 없습니다: {path}")
+        entry = self.paths[path]
+        if entry["size"] < self.mini_cutoff:
+            return self._mini_chain(entry["start"])[:entry["size"]]
+        return self._chain(entry["start"])[:entry["size"]]
+
+
+def iter_records(data):
+    """HWP 레코드 스트림을 (태그, 레벨, 내용)으로 순회"""
+    offset = 0
+    while offset + 4 <= len(data):
+        header = struct.unpack_from('<I', data, offset)[0]
+        offset += 4
+        tag, level, size = header & 0x3FF, (header >> 10) & 0x3FF, header >> 20
+        if size == 0xFFF:
+            size = struct.unpack_from('<I', data, offset)[0]
+            offset += 4
+        yield tag, level, data[offset:offset + size]
+        offset += size
+
+
+def decode_para_text(body):
+    """문단 텍스트 레코드에서 제어 문자를 걷어낸 문자열"""
+    chars = []
+    offset = 0
+    while offset + 2 <= len(body):
+        code = struct.unpack_from('<H', body, offset)[0]
+        if code >= 32:
+            chars.append(chr(code))
+            offset += 2
+        elif code in CHAR_CONTROLS:
+            if code == 10:
+                chars.append("\n")
+            offset += 2
+        else:
+            offset += 16
+    return "".join(chars)
+
+
+class HwpCell:
+    def __init__(self, col, row, col_span, row_span):
+        self.col = col
+        self.row = row
+        self.col_span = col_span
+        self.row_span = row_span
+        self.paragraphs = []
+
+    @property
+    def text(self):
+        return "\n".join(self.paragraphs).strip()
+
+    def __repr__(self):
+        return f"HwpCell(col={self.col}, row={self.row}, span={self.col_span}x{self.row_span}, text={self.text!r})"
+
+
+class HwpTable:
+    def __init__(self, section, rows, cols):
+        self.section = section
+        self.rows = rows
+        self.cols = cols
+        self.cells = []
+
+    def __repr__(self):
+        return f"HwpTable(section={self.section}, rows={self.rows}, cols={self.cols}, cells={len(self.cells)})"
+
+    def cell_at(self, col, row):
+        """(열, 행) 위치를 시작점으로 하는 셀 (없으면 None)"""
+        for cell in self.cells:
+            if cell.col == col and cell.row == row:
+                return cell
+        return None
+
+    def grid(self):
+        """행마다 셀 텍스트를 열 순서로 나열한 2차원 목록 (병합으로 가려진 칸은 None)"""
+        rows = [[None] * self.cols for _ in range(self.rows)]
+        for cell in self.cells:
+            if cell.row < self.rows and cell.col < self.cols:
+                rows[cell.row][cell.col] = cell.text
+        return rows
+
+
+class HwpDocument:
+    def __init__(self, file_path):
+        """
+        HWP 5.0 문서의 표 구조와 텍스트를 읽는 읽기 전용 파서 (한글 오피스 불필요)
+
+        :param file_path: .hwp 파일 경로
+        """
+        with open(file_path, mode='rb') as file:
+            self.ole = OleFile(file.read())
+        file_header = self.ole.read("FileHeader")
+        if not file_header.startswith(b"HWP Document File"):
+            raise ValueError(f"HWP 문서가 아닙니다: {file_path}")
+        properties = struct.unpack_from('<I', file_header, 36)[0]
+        if properties & 0x04:
+            raise ValueError("배포용 문서는 읽을 수 없습니다.")
+        self.compressed = bool(properties & 0x01)
+        self.file_path = file_path
+        self.paragraphs = []  # 표 밖 본문 문단
+        self.tables = []
+        sections = sorted((path for path in self.ole.listdir() if path.startswith("BodyText/Section")),
+                          key=lambda path: int(path[len("BodyText/Section"):]))
+        for index, path in enumerate(sections):
+            data = self.ole.read(path)
+            self._parse_section(index, zlib.decompress(data, -15) if self.compressed else data)
+
+    def _parse_section(self, section, data):
+        table = None
+        cell = None
+        cell_level = None
+        remaining = 0  # 현재 셀에 남은 문단 수
+        for tag, level, body in iter_records(data):
+            if tag == TAG_TABLE and len(body) >= 8:
+                rows, cols = struct.unpack_from('<HH', body, 4)
+                table = HwpTable(section, rows, cols)
+                self.tables.append(table)
+            elif tag == TAG_LIST_HEADER and table is not None and len(body) >= 16:
+                paragraph_count = struct.unpack_from('<H', body, 0)[0]
+                col, row, col_span, row_span = struct.unpack_from('<4H', body, 8)
+                cell = HwpCell(col, row, col_span, row_span)
+                table.cells.append(cell)
+                cell_level, remaining = level, paragraph_count
+            elif tag == TAG_PARA_HEADER:
+                if cell is not None and level == cell_level and remaining > 0:
+                    remaining -= 1
+                    cell.paragraphs.append("")
+                else:
+                    cell = None
+                    if table is not None and cell_level is not None and level < cell_level:
+                        table, cell_level = None, None
+                    self.paragraphs.append("")
+            elif tag == TAG_PARA_TEXT:
+                target = cell.paragraphs if cell is not None else self.paragraphs
+                if target:
+                    target[-1] += decode_para_text(body)
+
+    def __repr__(self):
+        return f"HwpDocument(file_path={self.file_path}, tables={len(self.tables)})"
+
+    def placeholders(self):
+        """
+        % 자리표시자의 위치 목록
+
+        :return: (자리표시자, 표 번호, 열, 행) 목록, 표 밖이면 표 번호와 위치는 None
+        """
+        found = []
+        for text in self.paragraphs:
+            found.extend((token, None, None, None) for token in _placeholder_tokens(text))
+        for table_index, table in enumerate(self.tables):
+            for cell in table.cells:
+                found.extend((token, table_index, cell.col, cell.row) for token in _placeholder_tokens(cell.text))
+        return found
+
+    def day_cells(self):
+        """
+        날짜 열 머리글(%일1, %일2) 아래의 날짜 셀
+
+        :return: {날짜: (표 번호, 머리글, 머리글 기준 행, 열)}
+        """
+        days = {}
+        for table_index, table in enumerate(self.tables):
+            for header in table.cells:
+                if header.text not in DAY_LABELS:
+                    continue
+                first_row = header.row + header.row_span
+                for cell in table.cells:
+                    if cell.col != header.col or cell.row < first_row:
+                        continue
+                    try:
+                        day = int(cell.text)
+                    except ValueError:
+                        continue
+                    days[day] = (table_index, header.text, cell.row - first_row + 1, cell.col)
+        return days
+
+    def to_layout(self, template_hash=None):
+        """한글 오피스 없이 날짜 셀 색인(TemplateLayout)을 만듦"""
+        cells = {day: {"table": table, "label": label, "row": row, "column": DAY_LABELS.index(label)}
+                 for day, (table, label, row, _) in self.day_cells().items()}
+        return TemplateLayout(template_hash or file_hash(self.file_path), cells)
+
+    def validate(self):
+        """배치 실행 전 템플릿 점검, 문제점 목록을 반환 (문제가 없으면 빈 목록)"""
+        problems = []
+        found = {token.lower() for token, _, _, _ in self.placeholders()}
+        for placeholder in REQUIRED_PLACEHOLDERS:
+            if placeholder.lower() not in found:
+                problems.append(f"자리표시자가 없습니다: {placeholder}")
+        missing_days = sorted(set(range(1, 32)) - set(self.day_cells()))
+        if missing_days:
+            problems.append(f"날짜 셀이 없습니다: {missing_days}")
+        return problems
+
+
+def _placeholder_tokens(text):
+    return PLACEHOLDER_PATTERN.findall(text)
+
+
+_documents = {}
+
+
+def read_hwp(file_path):
+    """HWP 문서를 읽어 HwpDocument로 반환 (파일 해시별로 캐시)"""
+    key = file_hash(file_path)
+    if key not in _documents:
+        _documents[key] = HwpDocument(file_path)
+    return _documents[key]
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("사용법: python hwp_reader.py <템플릿.hwp>")
+        return 2
+    document = read_hwp(argv[0])
+    for index, table in enumerate(document.tables):
+        print(f"표 {index}: {table.rows}행 x {table.cols}열, 셀 {len(table.cells)}개")
+    for token, table, col, row in document.placeholders():
+        print(f"자리표시자 {token}: " + ("본문" if table is None else f"표 {table} ({col}, {row})"))
+    print(f"날짜 셀 {len(document.day_cells())}개")
+    problems = document.validate()
+    for problem in problems:
+        print(f"문제: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+import bisect
+import copy
+import io
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+from eroom import MetaData, EroomManagerSchedule, generate_replace_dict
+from hwp_layout import DAY_LABELS, DAY_SPAN
+
+HEADER_PART = "Contents/header.xml"
+SECTION_PART = re.compile(r"^Contents/section\d+\.xml$")
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>'
+
+
+def _local(tag):
+    """네임스페이스를 뗀 태그 이름"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _children(element, name):
+    return [child for child in element if _local(child.tag) == name]
+
+
+def _descendants(element, name):
+    return [child for child in element.iter() if _local(child.tag) == name]
+
+
+def _text_nodes(element):
+    return _descendants(element, "t")
+
+
+def _cell_text(cell):
+    return "".join(node.text or "" for node in _text_nodes(cell)).strip()
+
+
+def _register_namespaces(data):
+    """XML을 다시 쓸 때 원래 접두사(hp, hh, hc ...)가 유지되도록 등록"""
+    for _, (prefix, uri) in ET.iterparse(io.BytesIO(data), events=("start-ns",)):
+        ET.register_namespace(prefix, uri)
+
+
+class HwpxTemplate:
+    def __init__(self, template_path):
+        """
+        HWPX(OWPML) 출근부 템플릿을 읽어 XML을 직접 편집하는 엔진
+
+        템플릿은 한 번만 읽고, 문서마다 파싱된 XML을 복사하여 편집한다.
+
+        :param template_path: .hwpx 템플릿 파일 경로
+        """
+        self.template_path = template_path
+        with zipfile.ZipFile(template_path) as archive:
+            self.entries = [(info, archive.read(info.filename)) for info in archive.infolist()]
+        self.trees = {}
+        for info, data in self.entries:
+            if info.filename == HEADER_PART or SECTION_PART.match(info.filename):
+                _register_namespaces(data)
+                self.trees[info.filename] = ET.fromstring(data)
+        if HEADER_PART not in self.trees:
+            raise ValueError(f"HWPX 문서가 아닙니다: {template_path}")
+
+    def render(self, meta_data: MetaData, sc: EroomManagerSchedule):
+        """매니저의 출근부를 완성하여 meta_data의 출력 파일로 저장"""
+        output_path = os.path.join(meta_data.default_file_path, meta_data.output_file_name)
+        with open(output_path, mode='wb') as file:
+            file.write(self.render_bytes(meta_data, sc))
+
+    def render_bytes(self, meta_data: MetaData, sc: EroomManagerSchedule):
+        """매니저의 출근부를 완성한 .hwpx 파일 내용"""
+        header = copy.deepcopy(self.trees[HEADER_PART])
+        sections = {name: copy.deepcopy(tree) for name, tree in self.trees.items() if name != HEADER_PART}
+        border_fills = _BorderFills(header)
+        weekends = sc.get_day_off(meta_data)
+        invalid_days = meta_data.get_invalid_days()
+
+        for section in sections.values():
+            parents = {child: parent for parent in section.iter() for child in parent}
+            for day_cell, row_cells, day in _day_cells(section):
+                if day in weekends:
+                    for cell in row_cells:
+                        cell.set("borderFillIDRef", border_fills.diagonal(cell.get("borderFillIDRef")))
+                if day in invalid_days:
+                    # 한글의 셀 지우기(TableDeleteCell)와 같이 날짜 셀을 표에서 뺌 (오른쪽 칸은 그대로 둠)
+                    parents[day_cell].remove(day_cell)
+            _replace_text(section, generate_replace_dict(meta_data, sc))
+
+        parts = {HEADER_PART: header, **sections}
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, mode='w') as archive:
+            for info, data in self.entries:
+                if info.filename in parts:
+                    data = (XML_DECLARATION + ET.tostring(parts[info.filename], encoding="unicode")).encode("utf-8")
+                archive.writestr(info, data)  # mimetype의 무압축 저장 등 원래 항목 설정 유지
+        return buffer.getvalue()
+
+
+class _BorderFills:
+    """header.xml의 테두리/배경(borderFill) 목록에 대각선이 추가된 항목을 필요할 때 만들어 붙임"""
+
+    def __init__(self, header):
+        self.container = _descendants(header, "borderFills")[0]
+        self.fills = {fill.get("id"): fill for fill in _children(self.container, "borderFill")}
+        self.derived = {}
+
+    def diagonal(self, fill_id):
+        """fill_id 테두리에 오른쪽 위 대각선(/)을 더한 borderFill의 id"""
+        if fill_id in self.derived:
+            return self.derived[fill_id]
+        fill = copy.deepcopy(self.fills[fill_id])
+        new_id = str(max(int(key) for key in self.fills) + 1)
+        fill.set("id", new_id)
+        namespace = fill.tag[:-len("borderFill")]
+        slash = _children(fill, "slash")
+        slash = slash[0] if slash else ET.SubElement(fill, namespace + "slash")
+        slash.set("type", "CENTER")
+        diagonal = _children(fill, "diagonal")
+        diagonal = diagonal[0] if diagonal else ET.SubElement(fill, namespace + "diagonal")
+        diagonal.set("type", "SOLID")
+        diagonal.set("width", diagonal.get("width", "0.12 mm"))
+        diagonal.set("color", diagonal.get("color", "#000000"))
+        self.container.append(fill)
+        self.container.set("itemCnt", str(len(_children(self.container, "borderFill"))))
+        self.fills[new_id] = fill
+        self.derived[fill_id] = new_id
+        return new_id
+
+
+def _address(cell):
+    address = _children(cell, "cellAddr")[0]
+    span = _children(cell, "cellSpan")
+    row_span = int(span[0].get("rowSpan", 1)) if span else 1
+    return int(address.get("colAddr")), int(address.get("rowAddr")), row_span
+
+
+def _day_cells(section):
+    """
+    날짜 열 머리글(%일1, %일2) 아래의 날짜 셀을 찾음
+
+    :return: (날짜 셀, 오른쪽 칸 셀 목록, 날짜) 목록
+    """
+    found = []
+    for table in _descendants(section, "tbl"):
+        grid = {}
+        headers = []
+        for cell in _descendants(table, "tc"):
+            col, row, row_span = _address(cell)
+            grid[(col, row)] = cell
+            if _cell_text(cell) in DAY_LABELS:
+                headers.append((col, row + row_span))
+        for col, first_row in headers:
+            for (cell_col, row), cell in sorted(grid.items(), key=lambda item: item[0][1]):
+                if cell_col != col or row < first_row:
+                    continue
+                try:
+                    day = int(_cell_text(cell))
+                except ValueError:
+                    continue
+                row_cells = [grid[(col + offset, row)] for offset in range(1, DAY_SPAN + 1)
+                             if (col + offset, row) in grid]
+                found.append((cell, row_cells, day))
+    return found
+
+
+def _paragraph_segments(paragraph):
+    """
+    문단에 들어 있는 글자 조각을 순서대로 모음 (표 안의 문단은 따로 처리하므로 제외)
+
+    :return: (요소, "text" 또는 "tail") 목록, 탭이나 컨트롤처럼 글자가 아닌 요소의 자리는 None
+    """
+    segments = []
+    for run in _children(paragraph, "run"):
+        for element in run:
+            if _local(element.tag) != "t":
+                segments.append(None)
+                continue
+            segments.append((element, "text"))
+            for child in element:
+                segments.append(None)
+                segments.append((child, "tail"))
+    return segments
+
+
+def _replace_segments(segments, pattern, replacements):
+    """
+    글자 조각을 이어 붙인 문자열에서 치환 (서식이 바뀌어 자리표시자가 여러 <hp:run>에 나뉘어 있어도 찾음)
+
+    치환한 값은 자리표시자가 시작하는 조각에 넣고, 뒤 조각에 걸친 나머지 글자는 지운다.
+    """
+    texts = ["\0" if segment is None else getattr(*segment) or "" for segment in segments]
+    joined = "".join(texts)
+    if not pattern.search(joined):
+        return
+    ends = []
+    for text in texts:
+        ends.append((ends[-1] if ends else 0) + len(text))
+    parts = [[] for _ in segments]
+
+    def keep(start, end):
+        index = bisect.bisect_right(ends, start)
+        while start < end:
+            parts[index].append(joined[start:min(end, ends[index])])
+            start = ends[index]
+            index += 1
+
+    position = 0
+    for match in pattern.finditer(joined):
+        keep(position, match.start())
+        parts[bisect.bisect_right(ends, match.start())].append(replacements[match.group(0).lower()])
+        position = match.end()
+    keep(position, len(joined))
+    for segment, part in zip(segments, parts):
+        if segment is not None:
+            setattr(*segment, "".join(part))
+
+
+def _replace_text(section, replace_dict):
+    """모든 문단의 자리표시자를 대소문자 구분 없이 치환 (한글의 찾아 바꾸기와 같은 동작)"""
+    replacements = {key.lower(): value for key, value in replace_dict.items()}
+    # 글자가 아닌 요소의 자리(\0)를 넘어서는 자리표시자는 찾지 않음
+    pattern = re.compile("|".join(re.escape(key) for key in sorted(replace_dict, key=len, reverse=True)),
+                         re.IGNORECASE)
+    for paragraph in _descendants(section, "p"):
+        _replace_segments(_paragraph_segments(paragraph), pattern, replacements)
+
+
+class HwpxSession:
+    kind = "hwpx"  # batch.SESSIONS의 키
+    combined_extension = ".zip"
+
+    def __init__(self):
+        """HwpSession과 같은 방식으로 쓸 수 있는 HWPX 엔진 세션 (템플릿은 경로별로 한 번만 읽음)"""
+        self.templates = {}
+
+    def template_for(self, meta_data: MetaData):
+        template_path = os.path.join(meta_data.default_file_path, meta_data.input_file)
+        if template_path not in self.templates:
+            self.templates[template_path] = HwpxTemplate(template_path)
+        return self.templates[template_path]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.templates = {}
+
+    def cache_options(self):
+        """출력 캐시 키에 넣을 세션 설정"""
+        return {"session": self.kind}
+
+    def process(self, meta_data: MetaData, sc: EroomManagerSchedule):
+        """
+        매니저 한 명의 출근부를 HWPX로 생성
+
+        :return: 저장에 성공하면 True
+        """
+        try:
+            self.template_for(meta_data).render(meta_data, sc)
+        except Exception as e:
+            print(f"오류 발생: {e}")
+            return False
+        print(f"파일이 성공적으로 저장되었습니다: {meta_data.output_file_name}")
+        return True
+
+    def combine(self, documents, output_path):
+        """
+        여러 매니저의 출근부를 메모리에서 만들어 압축 파일 하나로 저장
+
+        .hwpx는 이미 압축된 파일이므로 다시 압축하지 않고 저장만 한다.
+
+        :param documents: (MetaData, EroomManagerSchedule) 목록
+        :param output_path: 압축 파일을 저장할 경로
+        :return: {"output": 경로, "documents": 문서 수, "pages": 쪽 수, "bytes": 파일 크기}
+        """
+        with zipfile.ZipFile(output_path, mode='w', compression=zipfile.ZIP_STORED) as archive:
+            for meta_data, sc in documents:
+                archive.writestr(meta_data.output_file_name, self.template_for(meta_data).render_bytes(meta_data, sc))
+        # 출근부 템플릿은 한 쪽짜리이므로 문서 수가 곧 쪽 수
+        return {"output": output_path, "documents": len(documents), "pages": len(documents),
+                "bytes": os.path.getsize(output_path)}
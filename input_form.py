@@ -1,20 +1,29 @@
 import sys
-import csv
 import os
+import sqlite3
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout,
-    QDateEdit, QMessageBox, QHBoxLayout, QTableWidget, QTableWidgetItem, QSplitter, QComboBox
+    QDateEdit, QMessageBox, QHBoxLayout, QTableView, QHeaderView, QAbstractItemView, QSplitter, QComboBox,
+    QProgressBar, QListWidget, QCheckBox, QFileDialog
 )
-from PyQt5.QtCore import QDate, Qt
+from PyQt5.QtCore import QDate, QEvent, Qt, QTimer, pyqtSignal
 
-from eroom import EroomManagerSchedule, MetaData
-from write_hwp import modify_hwp_file
+from eroom import ROTATION_WEEKS, EroomManagerSchedule, PublicHoliday
+from roster_import import import_roster
+from roster_repository import RosterRepository
+from roster_model import ScheduleTableModel, HolidayTableModel, RosterFilterProxyModel
+from roster_worker import RosterWorker
 
 class InputForm(QWidget):
+    roster_loaded = pyqtSignal()  # 창을 띄운 뒤 명단과 공휴일을 표에 채웠을 때
+
     def __init__(self):
         super().__init__()
         self.file_path = "user_data.txt"
         self.holiday_file_path = "holiday_data.txt"
+        self.db_path = "eroom.db"
+        self.repository = None  # 창을 먼저 그린 뒤 load_initial_data에서 엶
+        self.worker = None  # 출근부를 생성 중인 RosterWorker
         self.initUI()
 
     def initUI(self):
@@ -43,6 +52,17 @@ class InputForm(QWidget):
         date_layout.addWidget(self.year_label)
         date_layout.addWidget(self.year_combo)
         date_layout.addWidget(self.month_combo)
+
+        # 명단 검색: 이름, 선택한 달
+        self.search_input = QLineEdit(self)
+        self.search_input.setPlaceholderText("이름 검색")
+        self.search_input.textChanged.connect(self.apply_filters)
+        date_layout.addWidget(self.search_input)
+        self.month_filter_check = QCheckBox("선택한 달만 보기")
+        self.month_filter_check.toggled.connect(self.apply_filters)
+        self.year_combo.currentIndexChanged.connect(self.on_target_month_changed)
+        self.month_combo.currentIndexChanged.connect(self.on_target_month_changed)
+        date_layout.addWidget(self.month_filter_check)
         
         main_layout.addLayout(date_layout)
         
@@ -69,6 +89,9 @@ class InputForm(QWidget):
         self.saturday_input.setDate(QDate.currentDate())
         form_layout.addWidget(self.saturday_label)
         form_layout.addWidget(self.saturday_input)
+        self.repeat_check = QCheckBox(f"{ROTATION_WEEKS}주마다 반복")
+        self.repeat_check.setChecked(True)
+        form_layout.addWidget(self.repeat_check)
         # 다음달 버튼 추가
         self.next_month_button = QPushButton('다음달')
         self.next_month_button.clicked.connect(self.move_all_to_next_month)
@@ -86,10 +109,26 @@ class InputForm(QWidget):
         self.delete_button.clicked.connect(self.delete_data)
         form_layout.addWidget(self.delete_button)
 
+        self.import_button = QPushButton('명단 파일 가져오기')
+        self.import_button.clicked.connect(self.import_data)
+        form_layout.addWidget(self.import_button)
+
         self.print_button = QPushButton("한글 파일 출력")
         self.print_button.clicked.connect(self.print_to_hwp)
         form_layout.addWidget(self.print_button)
 
+        self.combine_check = QCheckBox("한 파일로 합쳐서 출력")
+        form_layout.addWidget(self.combine_check)
+
+        self.cancel_button = QPushButton("출력 취소")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_print)
+        form_layout.addWidget(self.cancel_button)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("%v / %m")
+        form_layout.addWidget(self.progress_bar)
+
         form_widget = QWidget()
         form_widget.setLayout(form_layout)
         left_splitter.addWidget(form_widget)
@@ -117,22 +156,32 @@ class InputForm(QWidget):
 
         splitter.addWidget(left_splitter)
 
+        # 명단을 불러오기 전에는 명단과 공휴일을 쓰는 버튼을 누를 수 없게 함
+        self.roster_buttons = [self.submit_button, self.delete_button, self.import_button, self.print_button,
+                               self.holiday_submit_button, self.holiday_delete_button]
+        for button in self.roster_buttons:
+            button.setEnabled(False)
+
         # 오른쪽: 테이블 출력
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["이름", "대체 휴무 날짜", "토요일 근무 날짜"])
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)  # 수정 불가 설정
-        self.table.itemSelectionChanged.connect(self.fill_form_from_selection)
+        self.schedule_model = ScheduleTableModel(parent=self)
+        self.schedule_model.year_month = self.target_year_month()
+        self.schedule_proxy = RosterFilterProxyModel(self)
+        self.schedule_proxy.setSourceModel(self.schedule_model)
+        self.table = self._create_table_view(self.schedule_proxy)
+        self.table.selectionModel().selectionChanged.connect(self.fill_form_from_selection)
         right_splitter.addWidget(self.table)
 
         # 공휴일 테이블 출력
-        self.holiday_table = QTableWidget()
-        self.holiday_table.setColumnCount(1)
-        self.holiday_table.setHorizontalHeaderLabels(["공휴일 날짜"])
-        self.holiday_table.setEditTriggers(QTableWidget.NoEditTriggers)  # 수정 불가 설정
+        self.holiday_model = HolidayTableModel(parent=self)
+        self.holiday_proxy = RosterFilterProxyModel(self)
+        self.holiday_proxy.setSourceModel(self.holiday_model)
+        self.holiday_table = self._create_table_view(self.holiday_proxy)
         right_splitter.addWidget(self.holiday_table)
 
+        # 생성된 출근부 목록 (생성하는 동안 한 건씩 추가됨)
+        self.result_list = QListWidget()
+        right_splitter.addWidget(self.result_list)
+
         splitter.addWidget(right_splitter)
         splitter.setStretchFactor(0, 1)
         splitter.setStretchFactor(1, 2)
@@ -142,16 +191,68 @@ class InputForm(QWidget):
 
         self.setWindowTitle('사용자 입력 및 데이터 보기')
 
+        # 창이 먼저 그려지도록 명단은 이벤트 루프가 시작된 뒤 불러옴
+        QTimer.singleShot(0, self.load_initial_data)
+
+    def load_initial_data(self):
+        # 처음 실행할 때 기존 user_data.txt / holiday_data.txt를 데이터베이스로 가져옴
+        self.repository = RosterRepository(self.db_path, self.file_path, self.holiday_file_path)
         self.load_data()
         self.load_holiday_data()
+        for button in self.roster_buttons:
+            button.setEnabled(True)
+        self.roster_loaded.emit()
+
+    def _create_table_view(self, model):
+        """수정할 수 없고 행 단위로 선택하는 표, 머리글을 눌러 정렬"""
+        view = QTableView()
+        view.setModel(model)
+        view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        view.setSelectionMode(QAbstractItemView.SingleSelection)
+        view.setEditTriggers(QAbstractItemView.NoEditTriggers)  # 수정 불가 설정
+        view.setSortingEnabled(True)
+        view.sortByColumn(-1, Qt.AscendingOrder)  # 처음에는 입력된 순서대로
+        # 행 높이를 고정해 두면 수만 행에서도 보이는 행만 계산함
+        view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        view.horizontalHeader().setStretchLastSection(True)
+        return view
+
+    def _selected_source_row(self, view, proxy):
+        """표에서 선택된 행의 원본 모델 행 번호 (선택이 없으면 -1)"""
+        rows = view.selectionModel().selectedRows()
+        if not rows:
+            return -1
+        return proxy.mapToSource(rows[0]).row()
+
+    def target_year_month(self):
+        """선택한 출근부 연월 (YYYY-MM)"""
+        return f"{self.year_combo.currentData()}-{str(self.month_combo.currentData()).zfill(2)}"
+
+    def on_target_month_changed(self):
+        # 저장된 명단은 그대로 두고 표의 날짜 열만 선택한 달로 다시 계산
+        self.schedule_model.set_year_month(self.target_year_month())
+        self.apply_filters()
+
+    def apply_filters(self):
+        self.schedule_proxy.set_name_filter(self.search_input.text())
+        year_month = None
+        if self.month_filter_check.isChecked():
+            year_month = self.target_year_month()
+        self.schedule_proxy.set_month_filter(year_month, (1, 2))
+        self.holiday_proxy.set_month_filter(year_month, (0,))
 
     def fill_form_from_selection(self):
-        selected_row = self.table.currentRow()
+        selected_row = self._selected_source_row(self.table, self.schedule_proxy)
         if selected_row == -1:
             return
-        self.name_input.setText(self.table.item(selected_row, 0).text())
-        self.alternative_input.setDate(QDate.fromString(self.table.item(selected_row, 1).text(), "yyyy-MM-dd"))
-        self.saturday_input.setDate(QDate.fromString(self.table.item(selected_row, 2).text(), "yyyy-MM-dd"))
+        schedule = self.schedule_model.schedule_at(selected_row)
+        self.name_input.setText(schedule.name)
+        # 선택한 달의 날짜가 있으면 그 날짜를, 없으면 저장된 날짜를 보여줌
+        alternative = self.schedule_model.index(selected_row, 1).data().split(", ")[0]
+        saturday = self.schedule_model.index(selected_row, 2).data().split(", ")[0]
+        self.alternative_input.setDate(QDate.fromString(alternative or schedule.substitute_holiday, "yyyy-MM-dd"))
+        self.saturday_input.setDate(QDate.fromString(saturday or schedule.saturday_workday, "yyyy-MM-dd"))
+        self.repeat_check.setChecked(bool(schedule.rules))
 
     def save_data(self):
         name = self.name_input.text()
@@ -162,164 +263,164 @@ class InputForm(QWidget):
             QMessageBox.warning(self, "입력 오류", "이름을 입력하세요!")
             return
 
-        updated_data = {}
-        if os.path.exists(self.file_path):
-            with open(self.file_path, mode='r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                headers = next(reader, None)
-                for row in reader:
-                    updated_data[row[0]] = row[1:]
-
-        updated_data[name] = [alternative_leave, saturday_work]
-        
-        with open(self.file_path, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(["이름", "대체 휴무 날짜", "토요일 근무 날짜"])
-            for key, value in updated_data.items():
-                writer.writerow([key] + value)
+        if self.repeat_check.isChecked():
+            schedule = EroomManagerSchedule.rotating(name, alternative_leave, saturday_work)
+        else:
+            schedule = EroomManagerSchedule(name, alternative_leave, saturday_work)
+        self.schedule_model.upsert(self.repository.save_schedule(schedule))
 
         QMessageBox.information(self, "저장 완료", "데이터가 성공적으로 저장되었습니다.")
-        self.load_data()
 
     def load_data(self):
-        if not os.path.exists(self.file_path):
-            return
-        with open(self.file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            next(reader, None)
-            data = list(reader)
-        self.table.setRowCount(len(data))
-        for row_idx, row_data in enumerate(data):
-            for col_idx, col_data in enumerate(row_data):
-                self.table.setItem(row_idx, col_idx, QTableWidgetItem(col_data))
+        self.schedule_model.reset(self.repository.schedules())
 
     def save_holiday(self):
         holiday_date = self.holiday_input.date().toString("yyyy-MM-dd")
-        with open(self.holiday_file_path, mode='a', newline='', encoding='utf-8') as file:
-            file.write(holiday_date + "\n")
-        self.load_holiday_data()
+        self.repository.add_holiday(PublicHoliday(holiday_date))
+        self.holiday_model.add(holiday_date)
 
     def load_holiday_data(self):
-        if not os.path.exists(self.holiday_file_path):
-            return
-        with open(self.holiday_file_path, mode='r', encoding='utf-8') as file:
-            holidays = file.readlines()
-        self.holiday_table.setRowCount(len(holidays))
-        for i, date in enumerate(holidays):
-            self.holiday_table.setItem(i, 0, QTableWidgetItem(date.strip()))
+        self.holiday_model.reset(self.repository.holiday_dates())
+
     def delete_data(self):
-        selected_row = self.table.currentRow()
+        selected_row = self._selected_source_row(self.table, self.schedule_proxy)
         if selected_row == -1:
             QMessageBox.warning(self, "삭제 오류", "삭제할 행을 선택하세요!")
             return
 
-        self.table.removeRow(selected_row)
-
-        # 데이터 파일에서 해당 행 삭제
-        updated_data = []
-        for row in range(self.table.rowCount()):
-            updated_data.append([
-                self.table.item(row, 0).text(),
-                self.table.item(row, 1).text(),
-                self.table.item(row, 2).text()
-            ])
-
-        with open(self.file_path, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(["이름", "대체 휴무 날짜", "토요일 근무 날짜"])
-            writer.writerows(updated_data)
+        name = self.schedule_model.schedule_at(selected_row).name
+        self.repository.delete_schedule(name)
+        self.schedule_model.remove(name)
 
         QMessageBox.information(self, "삭제 완료", "데이터가 성공적으로 삭제되었습니다.")
-        self.load_data()
 
-    def move_all_to_next_month(self):
-        """ CSV 파일의 모든 데이터를 4주(28일) 후로 이동 """
-        if not os.path.exists(self.file_path):
+    def import_data(self):
+        """인사 시스템에서 내보낸 CSV/TSV 명단을 한꺼번에 가져옴"""
+        file_path, _ = QFileDialog.getOpenFileName(self, "명단 파일 선택", "", "명단 파일 (*.csv *.tsv *.txt)")
+        if not file_path:
             return
-
-        updated_data = []
-        with open(self.file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            headers = next(reader, None)
-            for row in reader:
-                row[1] = QDate.fromString(row[1], "yyyy-MM-dd").addDays(28).toString("yyyy-MM-dd")
-                row[2] = QDate.fromString(row[2], "yyyy-MM-dd").addDays(28).toString("yyyy-MM-dd")
-                updated_data.append(row)
-
-        with open(self.file_path, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(headers)
-            writer.writerows(updated_data)
-
-        self.load_data()
-
-    def move_all_to_prev_month(self):
-        """ CSV 파일의 모든 데이터를 4주(28일) 전으로 이동 """
-        if not os.path.exists(self.file_path):
+        report_path = os.path.splitext(file_path)[0] + "_오류.csv"
+        try:
+            report = import_roster(file_path, self.repository.db, report_path)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.reload_if_changed()  # 앞서 저장을 마친 묶음은 반영되어 있음
+            QMessageBox.warning(self, "가져오기 오류", f"오류 발생: {str(e)}")
             return
+        self.reload_if_changed()
 
-        updated_data = []
-        with open(self.file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.reader(file)
-            headers = next(reader, None)
-            for row in reader:
-                row[1] = QDate.fromString(row[1], "yyyy-MM-dd").addDays(-28).toString("yyyy-MM-dd")
-                row[2] = QDate.fromString(row[2], "yyyy-MM-dd").addDays(-28).toString("yyyy-MM-dd")
-                updated_data.append(row)
+        message = f"{report.rows}행 중 {report.imported}행을 가져왔습니다. ({report.seconds:.1f}초)"
+        if report.errors:
+            QMessageBox.warning(self, "가져오기 완료", f"{message}\n오류가 있는 {report.errors}행은 건너뛰었습니다: {report_path}")
+        else:
+            os.remove(report_path)
+            QMessageBox.information(self, "가져오기 완료", message)
 
-        with open(self.file_path, mode='w', newline='', encoding='utf-8') as file:
-            writer = csv.writer(file)
-            writer.writerow(headers)
-            writer.writerows(updated_data)
+    def move_all_to_next_month(self):
+        """ 출근부 연월을 다음 달로 (날짜는 반복 규칙으로 계산하므로 명단을 고치지 않음) """
+        self.step_target_month(1)
 
-        self.load_data()
+    def move_all_to_prev_month(self):
+        """ 출근부 연월을 이전 달로 """
+        self.step_target_month(-1)
+
+    def step_target_month(self, months):
+        """선택한 연월을 months개월만큼 옮기고 표를 한 번만 다시 계산"""
+        index = self.year_combo.currentData() * 12 + self.month_combo.currentData() - 1 + months
+        year, month = divmod(index, 12)
+        if self.year_combo.findData(year) == -1:  # 목록 밖의 연도는 순서에 맞게 앞이나 뒤에 추가
+            position = 0 if year < self.year_combo.itemData(0) else self.year_combo.count()
+            self.year_combo.insertItem(position, f"{year}년", year)
+        for combo, value in ((self.year_combo, year), (self.month_combo, month + 1)):
+            combo.blockSignals(True)
+            combo.setCurrentIndex(combo.findData(value))
+            combo.blockSignals(False)
+        self.on_target_month_changed()
 
     def delete_holiday(self):
-        selected_row = self.holiday_table.currentRow()
+        selected_row = self._selected_source_row(self.holiday_table, self.holiday_proxy)
         if selected_row == -1:
             QMessageBox.warning(self, "삭제 오류", "삭제할 공휴일을 선택하세요!")
             return
 
-        self.holiday_table.removeRow(selected_row)
-        
-        updated_holidays = []
-        for row in range(self.holiday_table.rowCount()):
-            updated_holidays.append(self.holiday_table.item(row, 0).text())
-        
-        with open(self.holiday_file_path, mode='w', encoding='utf-8') as file:
-            file.writelines([date + "\n" for date in updated_holidays])
-        
+        holiday_date = self.holiday_model.dates[selected_row]
+        self.repository.delete_holiday(holiday_date)
+        self.holiday_model.remove(holiday_date)
+
         QMessageBox.information(self, "삭제 완료", "공휴일이 성공적으로 삭제되었습니다.")
-        self.load_holiday_data()
     
     def print_to_hwp(self):
-        try:
-            current_year = self.year_combo.currentData()
-            current_month = self.month_combo.currentData()
-            
-            if not os.path.exists(self.file_path):
-                QMessageBox.warning(self, "오류", "출력할 데이터가 없습니다.")
-                return
-            
-            with open(self.file_path, mode='r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                data = list(reader)
-            
-            for row in data:
-                ems = EroomManagerSchedule(row["이름"],row["대체 휴무 날짜"],row["토요일 근무 날짜"])
-                
-                meta_data = MetaData(
-                    default_file_path=os.getcwd(),
-                    input_file="청년이룸출근부.hwp",
-                    output_file_name=f"청년이룸출근부_{current_year}년_{current_month}월_{ems.name}.hwp",
-                    target_date=f"{current_year}-{str(current_month).zfill(2)}"
-                )
-                
-                modify_hwp_file(meta_data, ems)
-            
-            QMessageBox.information(self, "출력 완료", "한글 파일 출력이 완료되었습니다.")
-        except Exception as e:
-            QMessageBox.warning(self, "오류", f"오류 발생: {str(e)}")
+        if self.worker is not None:
+            return
+        current_year = self.year_combo.currentData()
+        current_month = self.month_combo.currentData()
+
+        self.reload_if_changed()
+        schedules = self.repository.schedules()
+        if not schedules:
+            QMessageBox.warning(self, "오류", "출력할 데이터가 없습니다.")
+            return
+
+        self.result_list.clear()
+        self.progress_bar.setRange(0, len(schedules))
+        self.progress_bar.setValue(0)
+        self.worker = RosterWorker(schedules, current_year, current_month, os.getcwd(),
+                                   self.repository.holiday_calendar(), self.combine_check.isChecked(), self)
+        self.worker.progress.connect(self.on_print_progress)
+        self.worker.error.connect(lambda message: QMessageBox.warning(self, "오류", message))
+        self.worker.completed.connect(self.on_print_completed)
+        self.print_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.worker.start()
+
+    def cancel_print(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_button.setEnabled(False)
+
+    def on_print_progress(self, done, total, name, ok, elapsed):
+        self.progress_bar.setValue(done)
+        self.result_list.addItem(f"{'성공' if ok else '실패'}\t{name}\t{elapsed:.2f}초")
+        self.result_list.scrollToBottom()
+
+    def on_print_completed(self, succeeded, failed, cancelled):
+        self.worker.wait()
+        cache = self.worker.output_cache
+        report = self.worker.combined_report
+        self.worker = None
+        self.print_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        if report is not None:
+            QMessageBox.information(self, "출력 완료",
+                                    f"{os.path.basename(report['output'])}에 {report['documents']}명의 출근부를 "
+                                    f"저장했습니다. ({report['pages']}쪽, {report['bytes'] / 1024:.0f}KB)")
+            return
+        summary = f"(성공 {succeeded}건, 실패 {failed}건 / 생성 {cache.generated}건, 재사용 {cache.reused}건, " \
+                  f"무효화 {cache.invalidated}건)"
+        if cancelled:
+            QMessageBox.information(self, "출력 취소", f"출력이 취소되었습니다. {summary}")
+        elif failed:
+            QMessageBox.warning(self, "출력 완료", f"일부 파일을 만들지 못했습니다. {summary}")
+        else:
+            QMessageBox.information(self, "출력 완료", f"한글 파일 출력이 완료되었습니다. {summary}")
+
+    def reload_if_changed(self):
+        """다른 프로그램에서 데이터베이스를 수정했으면 표를 다시 채움"""
+        if self.repository is not None and self.repository.refresh():
+            self.load_data()
+            self.load_holiday_data()
+
+    def changeEvent(self, event):
+        # 다른 창에서 돌아올 때 바깥에서 바뀐 내용을 반영 (바뀌지 않았으면 파일 상태만 확인)
+        if event.type() == QEvent.ActivationChange and self.isActiveWindow():
+            self.reload_if_changed()
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        """생성 중에 창을 닫으면 진행 중인 문서까지만 만들고 종료"""
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
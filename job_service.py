@@ -0,0 +1,314 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from batch import (ENGINES, HWPX_TEMPLATE_FILE, TEMPLATE_FILE, combine_roster, create_session, generate_roster,
+                   parse_target_date)
+from holiday_calendar import HolidayCalendar
+from hwp_backend import BACKENDS, get_backend
+from roster_db import DEFAULT_DB_FILE, RosterDatabase, open_database
+
+DEFAULT_HOST = "127.0.0.1"  # 같은 컴퓨터에서만 접속 가능
+DEFAULT_PORT = 8765
+
+
+class Job:
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, job_id, target_date, names=None, engine="hwp", combine=False):
+        """
+        출근부 생성 작업 하나
+
+        :param job_id: 작업 번호 (대기열에 넣을 때 정하면 None)
+        :param target_date: 대상 연월 (YYYY-MM, "2025-3"처럼 써도 YYYY-MM으로 맞춤)
+        :param names: 생성할 매니저 이름 목록 (None이면 명단 전체)
+        :param engine: "hwp" 또는 "hwpx"
+        :param combine: True이면 한 파일로 합쳐 저장
+        """
+        self.id = job_id
+        self.year, self.month = parse_target_date(target_date)
+        self.target_date = f"{self.year}-{self.month:02d}"
+        self.names = sorted(set(names)) if names else None
+        self.engine = engine
+        self.combine = combine
+        self.status = self.QUEUED
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.results = []  # (매니저 이름, 성공 여부, 소요 시간(초))
+        self.report = None  # combine_roster 결과
+        self.error = None
+
+    @classmethod
+    def from_request(cls, job_id, payload):
+        """요청 JSON으로 작업 생성 (형식이 틀리면 ValueError)"""
+        if not isinstance(payload, dict) or not isinstance(payload.get("target_date"), str):
+            raise ValueError("target_date(YYYY-MM 형식의 문자열)가 필요합니다.")
+        engine = payload.get("engine", "hwp")
+        if engine not in ENGINES:
+            raise ValueError(f"알 수 없는 엔진입니다: {engine}")
+        names = payload.get("names")
+        if names is not None and not (isinstance(names, list) and all(isinstance(name, str) for name in names)):
+            raise ValueError("names는 이름 목록이어야 합니다.")
+        try:
+            return cls(job_id, payload["target_date"], names, engine, bool(payload.get("combine", False)))
+        except argparse.ArgumentTypeError as e:
+            raise ValueError(str(e))
+
+    @property
+    def key(self):
+        """같은 작업인지 판단하는 값"""
+        return self.target_date, tuple(self.names or ()), self.engine, self.combine
+
+    def __repr__(self):
+        return f"Job(id={self.id}, target_date={self.target_date}, status={self.status})"
+
+    def to_dict(self):
+        """객체를 딕셔너리 형태로 변환"""
+        return {
+            "id": self.id,
+            "target_date": self.target_date,
+            "names": self.names,
+            "engine": self.engine,
+            "combine": self.combine,
+            "status": self.status,
+            "queue_seconds": (self.started_at or time.time()) - self.created_at,
+            "run_seconds": ((self.finished_at or time.time()) - self.started_at) if self.started_at else None,
+            "results": [{"name": name, "ok": ok, "seconds": seconds} for name, ok, seconds in self.results],
+            "report": self.report,
+            "error": self.error
+        }
+
+
+class JobQueue:
+    def __init__(self, db_path=DEFAULT_DB_FILE, directory=None, backend_name="com", workers=1):
+        """
+        출근부 생성 작업을 받아 순서대로 처리하는 대기열
+
+        대기 중인 작업과 같은 작업이 들어오면 새로 만들지 않고 기존 작업을 돌려준다.
+        작업자 스레드 수는 workers로 제한하며, 스레드마다 한글 오피스 세션을 하나씩 두고 재사용한다.
+
+        :param db_path: 매니저 명단과 공휴일을 읽을 데이터베이스 파일
+        :param directory: 템플릿이 있고 결과를 저장할 디렉토리 (기본값: 현재 디렉토리)
+        :param backend_name: hwp 엔진의 문서 엔진 백엔드 이름 (시험할 때는 "fake")
+        :param workers: 동시에 처리할 최대 작업 수 (한글 오피스가 하나면 1)
+        """
+        # 처음 실행이면 기존 CSV 파일을 가져오고 이전 형식의 데이터를 전환 (작업자 스레드가 시작하기 전에 한 번만)
+        open_database(db_path).close()
+        self.db_path = db_path
+        self.directory = os.path.abspath(directory or os.getcwd())
+        self.backend_name = backend_name
+        self.jobs = {}  # {작업 번호: Job}
+        self.pending = {}  # {Job.key: 대기 중인 Job}
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="roster-job")
+        self.local = threading.local()
+        self.sessions = []  # 작업자 스레드가 만든 세션 (종료할 때 모두 닫음)
+
+    def submit(self, payload):
+        """
+        작업 요청을 대기열에 추가
+
+        :return: (Job, 기존 작업을 돌려주었으면 True)
+        """
+        with self.lock:
+            job = Job.from_request(None, payload)
+            existing = self.pending.get(job.key)
+            if existing is not None:
+                return existing, True
+            job.id = next(self.ids)  # 검사를 통과한 새 작업에만 번호를 매김
+            self.jobs[job.id] = job
+            self.pending[job.key] = job
+        self.executor.submit(self._run, job)
+        return job, False
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def list(self):
+        return list(self.jobs.values())
+
+    def close(self):
+        """남은 작업을 마치고 세션을 모두 닫음"""
+        self.executor.shutdown(wait=True)
+        for session in self.sessions:
+            session.close()
+
+    def _session(self, engine):
+        """현재 작업자 스레드의 세션 (처음 쓸 때 만듦)"""
+        sessions = getattr(self.local, "sessions", None)
+        if sessions is None:
+            sessions = self.local.sessions = {}
+            self._initialize_com()
+        if engine not in sessions:
+            if engine == "hwpx":
+                sessions[engine] = create_session("hwpx")
+            else:
+                sessions[engine] = create_session("staged", get_backend(self.backend_name))
+            with self.lock:
+                self.sessions.append(sessions[engine])
+        return sessions[engine]
+
+    @staticmethod
+    def _initialize_com():
+        """작업자 스레드에서 COM을 쓰려면 스레드마다 초기화해야 함 (pywin32가 없으면 건너뜀)"""
+        try:
+            import pythoncom
+        except ImportError:
+            return
+        pythoncom.CoInitialize()
+
+    def _run(self, job):
+        with self.lock:
+            self.pending.pop(job.key, None)  # 실행을 시작한 뒤 들어온 같은 요청은 새 작업으로 받음
+            job.status = Job.RUNNING
+            job.started_at = time.time()
+        try:
+            database = RosterDatabase(self.db_path)  # SQLite 연결은 스레드마다 따로 엶
+            try:
+                schedules = database.schedules_for_month(job.year, job.month)
+                holiday_calendar = HolidayCalendar(database.holidays_in_range(f"{job.year}-01-01", f"{job.year}-12-31"))
+            finally:
+                database.close()
+            if job.names is not None:
+                schedules = [schedule for schedule in schedules if schedule.name in job.names]
+            session = self._session(job.engine)
+            input_file = HWPX_TEMPLATE_FILE if job.engine == "hwpx" else TEMPLATE_FILE
+            if job.combine:
+                job.report = combine_roster(schedules, job.year, job.month, session, self.directory, input_file,
+                                            holiday_calendar)
+                ok = job.report is not None
+            else:
+                job.results = generate_roster(schedules, job.year, job.month, self.directory, session=session,
+                                              input_file=input_file, holiday_calendar=holiday_calendar)
+                ok = all(result_ok for _, result_ok, _ in job.results)
+            job.status = Job.DONE if ok else Job.FAILED
+        except Exception as e:
+            job.error = str(e)
+            job.status = Job.FAILED
+        job.finished_at = time.time()
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /jobs        작업 추가 ({"target_date": "YYYY-MM", "names": [...], "engine": "hwp", "combine": false})
+    GET  /jobs        모든 작업 상태
+    GET  /jobs/<번호>  작업 하나의 상태와 소요 시간
+    """
+
+    def _send(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self._send(404, {"error": "없는 경로입니다."})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            job, deduplicated = self.server.queue.submit(payload)
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        self._send(200 if deduplicated else 202, {**job.to_dict(), "deduplicated": deduplicated})
+
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if parts == ["jobs"]:
+            self._send(200, [job.to_dict() for job in self.server.queue.list()])
+            return
+        if len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+            job = self.server.queue.get(int(parts[1]))
+            if job is not None:
+                self._send(200, job.to_dict())
+                return
+        self._send(404, {"error": "없는 작업입니다."})
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 콘솔에 남기지 않음
+
+
+def create_server(queue, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """queue의 작업을 받는 HTTP 서버 생성 (port가 0이면 빈 포트를 사용)"""
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.queue = queue
+    return server
+
+
+def submit_job(url, payload):
+    """서비스에 작업을 보내고 작업 상태를 반환"""
+    request = urllib.request.Request(f"{url}/jobs", data=json.dumps(payload).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def get_job(url, job_id):
+    """서비스에서 작업 상태를 조회"""
+    with urllib.request.urlopen(f"{url}/jobs/{job_id}") as response:
+        return json.load(response)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="청년이룸 출근부 생성 작업 서비스")
+    parser.add_argument("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", help="submit/status가 접속할 주소")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="작업 서비스 실행")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--roster", default=DEFAULT_DB_FILE, help="매니저 명단 데이터베이스")
+    serve.add_argument("--dir", default=os.getcwd(), help="템플릿이 있고 결과를 저장할 디렉토리")
+    serve.add_argument("--backend", default="com", choices=sorted(BACKENDS), help="hwp 엔진의 문서 엔진 백엔드")
+    serve.add_argument("--workers", type=int, default=1, help="동시에 처리할 최대 작업 수")
+
+    submit = commands.add_parser("submit", help="작업 추가")
+    submit.add_argument("target_date", help="대상 연월 (YYYY-MM)")
+    submit.add_argument("--names", nargs="*", default=None, help="생성할 매니저 이름 (기본값: 명단 전체)")
+    submit.add_argument("--engine", default="hwp", choices=ENGINES)
+    submit.add_argument("--combine", action="store_true", help="한 파일로 합쳐 저장")
+
+    status = commands.add_parser("status", help="작업 상태 조회")
+    status.add_argument("job_id", type=int)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "serve":
+        queue = JobQueue(args.roster, args.dir, args.backend, args.workers)
+        server = create_server(queue, port=args.port)
+        print(f"작업 서비스를 시작합니다: http://{DEFAULT_HOST}:{server.server_port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            queue.close()
+        return 0
+    if args.command == "submit":
+        result = submit_job(args.url, {"target_date": args.target_date, "names": args.names,
+                                       "engine": args.engine, "combine": args.combine})
+    else:
+        result = get_job(args.url, args.job_id)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+
+from eroom import MetaData, EroomManagerSchedule, generate_replace_dict
+from hwp_layout import file_hash
+
+OUTPUT_CACHE_FILE = ".eroom_output_cache.json"
+CACHE_VERSION = 1  # 문서 생성 방식이 바뀌면 올려서 기존 결과를 모두 무효화
+
+
+def _output_signature(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class OutputCache:
+    def __init__(self, directory, cache_file=OUTPUT_CACHE_FILE):
+        """
+        이미 만든 출근부를 다시 만들지 않도록 결과 파일마다 생성 조건의 해시를 기록하는 캐시
+
+        해시는 템플릿 파일 해시, 치환 딕셔너리, 휴무일 집합, 존재하지 않는 날짜 집합과
+        문서를 만든 세션의 설정(세션 종류, 백엔드, 필드 사용 여부 등)으로 만든다.
+        결과 파일이 있고 기록한 뒤로 바뀌지 않았으며 해시가 같으면 그 문서는 다시 만들지 않는다.
+
+        :param directory: 결과 파일이 저장되는 디렉토리
+        :param cache_file: 기록을 저장할 파일 이름 (directory 안)
+        """
+        self.directory = directory
+        self.cache_path = os.path.join(directory, cache_file)
+        self.entries = {}  # {결과 파일 이름: {"key": 해시, "signature": [수정 시각(ns), 크기]}}
+        if os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, mode='r', encoding='utf-8') as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError) as e:
+                print(f"출력 캐시를 읽지 못해 새로 만듭니다: {e}")
+        self.template_hashes = {}  # {템플릿 경로: 해시}
+        self.generated = 0
+        self.reused = 0
+        self.invalidated = 0
+
+    def __repr__(self):
+        return (f"OutputCache(directory={self.directory}, generated={self.generated}, "
+                f"reused={self.reused}, invalidated={self.invalidated})")
+
+    def to_dict(self):
+        """이번 실행의 집계를 딕셔너리 형태로 변환"""
+        return {"generated": self.generated, "reused": self.reused, "invalidated": self.invalidated}
+
+    def template_hash(self, meta_data: MetaData):
+        template_path = os.path.join(meta_data.default_file_path, meta_data.input_file)
+        if template_path not in self.template_hashes:
+            self.template_hashes[template_path] = file_hash(template_path)
+        return self.template_hashes[template_path]
+
+    def key(self, meta_data: MetaData, sc: EroomManagerSchedule, options=None):
+        """
+        문서의 생성 조건 해시
+
+        :param options: 문서를 만들 세션의 설정 (세션의 cache_options() 결과)
+        """
+        content = {
+            "version": CACHE_VERSION,
+            "template": self.template_hash(meta_data),
+            "replace": generate_replace_dict(meta_data, sc),
+            "day_off": sorted(sc.get_day_off(meta_data)),
+            "invalid_days": sorted(meta_data.get_invalid_days()),
+            "session": options or {}
+        }
+        return hashlib.sha256(json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def lookup(self, meta_data: MetaData, key):
+        """
+        결과 파일을 다시 쓸 수 있으면 True
+
+        기록이 있지만 조건이나 결과 파일이 바뀐 경우 invalidated로 센다.
+        """
+        entry = self.entries.get(meta_data.output_file_name)
+        if entry is None:
+            return False
+        output_path = os.path.join(self.directory, meta_data.output_file_name)
+        if entry["key"] == key and entry["signature"] == _output_signature(output_path):
+            self.reused += 1
+            return True
+        self.invalidated += 1
+        del self.entries[meta_data.output_file_name]
+        return False
+
+    def store(self, meta_data: MetaData, key):
+        """새로 만든 결과 파일을 기록"""
+        output_path = os.path.join(self.directory, meta_data.output_file_name)
+        self.entries[meta_data.output_file_name] = {"key": key, "signature": _output_signature(output_path)}
+        self.generated += 1
+
+    def save(self):
+        with open(self.cache_path, mode='w', encoding='utf-8') as file:
+            json.dump(self.entries, file, ensure_ascii=False, indent=2)
@@ -0,0 +1,317 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+from eroom import ROTATION_WEEKS, EroomManagerSchedule, PublicHoliday, RecurrenceRule, ScheduleOverride
+from holiday_calendar import load_holidays
+from store_data import load_schedules
+
+DEFAULT_DB_FILE = "eroom.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS managers (
+    name TEXT PRIMARY KEY,
+    substitute_holiday TEXT NOT NULL,
+    saturday_workday TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_managers_substitute_holiday ON managers (substitute_holiday);
+CREATE INDEX IF NOT EXISTS idx_managers_saturday_workday ON managers (saturday_workday);
+CREATE TABLE IF NOT EXISTS holidays (
+    date TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS overrides (
+    name TEXT NOT NULL REFERENCES managers (name) ON DELETE CASCADE ON UPDATE CASCADE,
+    date TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    UNIQUE (name, date, kind)
+);
+CREATE INDEX IF NOT EXISTS idx_overrides_date ON overrides (date);
+CREATE TABLE IF NOT EXISTS rules (
+    name TEXT NOT NULL REFERENCES managers (name) ON DELETE CASCADE ON UPDATE CASCADE,
+    kind TEXT NOT NULL,
+    anchor TEXT NOT NULL,
+    interval_weeks INTEGER NOT NULL,
+    exceptions TEXT NOT NULL DEFAULT '',
+    UNIQUE (name, kind)
+);
+CREATE TABLE IF NOT EXISTS fields (
+    name TEXT NOT NULL REFERENCES managers (name) ON DELETE CASCADE ON UPDATE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    UNIQUE (name, key)
+);
+"""
+SCHEMA_VERSION = 2  # 1: 기존 대체 휴무일/토요일 근무일을 반복 규칙으로 전환, 2: 명단 CSV의 추가 항목을 가져옴
+UPSERT_SCHEDULE = (
+    "INSERT INTO managers (name, substitute_holiday, saturday_workday) VALUES (?, ?, ?) "
+    "ON CONFLICT(name) DO UPDATE SET substitute_holiday = excluded.substitute_holiday, "
+    "saturday_workday = excluded.saturday_workday"
+)
+
+
+INSERT_OVERRIDE = "INSERT OR IGNORE INTO overrides (name, date, kind) VALUES (?, ?, ?)"
+UPSERT_FIELD = (
+    "INSERT INTO fields (name, key, value) VALUES (?, ?, ?) "
+    "ON CONFLICT(name, key) DO UPDATE SET value = excluded.value"
+)
+INSERT_RULE = "INSERT OR REPLACE INTO rules (name, kind, anchor, interval_weeks, exceptions) VALUES (?, ?, ?, ?, ?)"
+RULES_FROM_CURRENT_DATES = (
+    "INSERT OR IGNORE INTO rules (name, kind, anchor, interval_weeks) "
+    "SELECT name, ?1, substitute_holiday, ?3 FROM managers WHERE substitute_holiday != '' "
+    "UNION ALL SELECT name, ?2, saturday_workday, ?3 FROM managers WHERE saturday_workday != ''"
+)
+RECORD_CURRENT_DATES = (
+    "INSERT OR IGNORE INTO overrides (name, date, kind) "
+    "SELECT name, substitute_holiday, ? FROM managers WHERE substitute_holiday != '' "
+    "UNION ALL SELECT name, saturday_workday, ? FROM managers WHERE saturday_workday != ''"
+)
+
+
+def _schedule_row(schedule: EroomManagerSchedule):
+    return schedule.name, schedule.substitute_holiday, schedule.saturday_workday
+
+
+def _rule_row(name, rule: RecurrenceRule):
+    data = rule.to_dict()
+    return name, data["kind"], data["anchor"], data["interval_weeks"], ",".join(data["exceptions"])
+
+
+def _field_rows(schedule: EroomManagerSchedule):
+    return [(schedule.name, key, str(value)) for key, value in schedule.fields.items()]
+
+
+def _month_range(year, month):
+    """해당 월의 첫날과 마지막 날 (YYYY-MM-DD)"""
+    prefix = f"{year}-{str(month).zfill(2)}"
+    return f"{prefix}-01", f"{prefix}-31"
+
+
+class RosterDatabase:
+    def __init__(self, db_path=DEFAULT_DB_FILE):
+        """
+        매니저 명단과 공휴일을 SQLite에 저장하는 클래스
+
+        이름과 날짜에 색인이 있어 한 건의 추가/수정/삭제는 파일 전체를 다시 쓰지 않는다.
+
+        :param db_path: 데이터베이스 파일 경로
+        """
+        self.db_path = db_path
+        self.created = not os.path.exists(db_path)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def __repr__(self):
+        return f"RosterDatabase(db_path={self.db_path})"
+
+    def close(self):
+        self.connection.close()
+
+    @contextmanager
+    def transaction(self):
+        """with 블록 안의 변경을 하나의 트랜잭션으로 처리 (예외가 나면 모두 취소)"""
+        with self.connection:
+            yield self.connection
+
+    # 매니저 명단
+    def save_schedule(self, schedule: EroomManagerSchedule):
+        """
+        매니저 일정을 추가하거나, 같은 이름이 있으면 수정
+
+        새 대체 휴무일/토요일 근무일은 이력에 남기고, 같은 달의 같은 종류 예외는 새 날짜로 바꾼다.
+        반복 규칙이 있으면 기준 날짜가 있는 달부터 기록된 같은 종류의 예외를 지우고 규칙으로 대신한다.
+        추가 항목(fields)은 같은 항목만 새 값으로 바꾸며, 일정에 없는 항목은 그대로 둔다 (입력 창에서 저장해도 유지).
+        """
+        with self.transaction() as connection:
+            self._save_schedules(connection, [schedule])
+
+    def save_schedules(self, schedules):
+        """여러 매니저 일정을 한 트랜잭션으로 추가/수정"""
+        with self.transaction() as connection:
+            self._save_schedules(connection, schedules)
+
+    def _save_schedules(self, connection, schedules):
+        # 같은 이름이 여러 번 있으면 뒤의 일정만 남김 (규칙 테이블의 UNIQUE (name, kind)와 부딪히지 않도록)
+        schedules = list({schedule.name: schedule for schedule in schedules}.values())
+        connection.executemany(UPSERT_SCHEDULE, [_schedule_row(schedule) for schedule in schedules])
+        connection.executemany(UPSERT_FIELD, [row for schedule in schedules for row in _field_rows(schedule)])
+        for schedule in schedules:
+            overrides = schedule.get_overrides()
+            connection.executemany(
+                "DELETE FROM overrides WHERE name = ? AND kind = ? AND date BETWEEN ? AND ?",
+                [(schedule.name, override.kind, override.month + "-01", override.month + "-31") for override in overrides])
+            connection.executemany(INSERT_OVERRIDE, [(schedule.name, override.date, override.kind)
+                                                     for override in overrides])
+        # 반복 규칙은 저장하는 일정의 규칙으로 바꿈 (규칙이 없으면 지움)
+        connection.executemany("DELETE FROM rules WHERE name = ?", [(schedule.name,) for schedule in schedules])
+        rules = [_rule_row(schedule.name, rule) for schedule in schedules for rule in schedule.rules]
+        connection.executemany(INSERT_RULE, rules)
+        # 기준 날짜가 있는 달부터는 규칙이 날짜를 정하므로 그 이후로 기록된 같은 종류의 예외는 지움
+        # (RecurrenceRule.covers와 같은 범위, 한 달에 두 날짜가 되지 않도록)
+        connection.executemany("DELETE FROM overrides WHERE name = ? AND kind = ? AND date >= ?",
+                               [(name, kind, anchor[:7] + "-01") for name, kind, anchor, _, _ in rules])
+
+    def delete_schedule(self, name):
+        """이름으로 매니저 일정 삭제, 삭제되면 True"""
+        with self.transaction() as connection:
+            return connection.execute("DELETE FROM managers WHERE name = ?", (name,)).rowcount > 0
+
+    def get_schedule(self, name):
+        row = self.connection.execute(
+            "SELECT name, substitute_holiday, saturday_workday FROM managers WHERE name = ?", (name,)).fetchone()
+        return self._attach_overrides([EroomManagerSchedule(*row)])[0] if row else None
+
+    def list_schedules(self):
+        """입력된 순서대로 모든 매니저 일정을 (여러 달의 일정 예외 이력과 함께) 반환"""
+        rows = self.connection.execute(
+            "SELECT name, substitute_holiday, saturday_workday FROM managers ORDER BY rowid")
+        return self._attach_overrides([EroomManagerSchedule(*row) for row in rows])
+
+    def schedules_for_month(self, year, month):
+        """
+        모든 매니저 일정에 해당 월의 일정 예외만 붙여 반환
+
+        overrides 테이블의 날짜 색인으로 그 달의 행만 읽으므로 이력이 길어져도 조회 비용이 늘지 않는다.
+        """
+        rows = self.connection.execute(
+            "SELECT name, substitute_holiday, saturday_workday FROM managers ORDER BY rowid")
+        return self._attach_overrides([EroomManagerSchedule(*row) for row in rows], *_month_range(year, month))
+
+    def _attach_overrides(self, schedules, start=None, end=None):
+        by_name = {schedule.name: schedule for schedule in schedules}
+        if start is None:
+            rows = self.connection.execute("SELECT name, date, kind FROM overrides ORDER BY date")
+        else:
+            rows = self.connection.execute(
+                "SELECT name, date, kind FROM overrides WHERE date BETWEEN ? AND ? ORDER BY date", (start, end))
+        for name, date, kind in rows:
+            if name in by_name:
+                by_name[name].add_override(ScheduleOverride(date, kind))
+        rows = self.connection.execute("SELECT name, kind, anchor, interval_weeks, exceptions FROM rules")
+        for name, kind, anchor, interval_weeks, exceptions in rows:
+            if name in by_name:
+                by_name[name].rules.append(
+                    RecurrenceRule(kind, anchor, interval_weeks, [date for date in exceptions.split(",") if date]))
+        for name, key, value in self.connection.execute("SELECT name, key, value FROM fields ORDER BY rowid"):
+            if name in by_name:
+                by_name[name].fields[key] = value
+        return schedules
+
+    def add_override(self, name, override: ScheduleOverride):
+        """매니저 일정에 특정 날짜의 예외 추가 (이미 있으면 무시)"""
+        with self.transaction() as connection:
+            connection.execute(INSERT_OVERRIDE, (name, override.date, override.kind))
+
+    def delete_override(self, name, override: ScheduleOverride):
+        """일정 예외 삭제, 삭제되면 True"""
+        with self.transaction() as connection:
+            return connection.execute("DELETE FROM overrides WHERE name = ? AND date = ? AND kind = ?",
+                                      (name, override.date, override.kind)).rowcount > 0
+
+    def overrides_in_month(self, year, month):
+        """
+        해당 월의 일정 예외
+
+        :return: {매니저 이름: [ScheduleOverride]}
+        """
+        overrides = {}
+        rows = self.connection.execute(
+            "SELECT name, date, kind FROM overrides WHERE date BETWEEN ? AND ? ORDER BY date", _month_range(year, month))
+        for name, date, kind in rows:
+            overrides.setdefault(name, []).append(ScheduleOverride(date, kind))
+        return overrides
+
+    def schedules_in_range(self, start, end):
+        """대체 휴무일이나 토요일 근무일이 start~end(YYYY-MM-DD, 양끝 포함) 안에 있는 매니저 일정"""
+        rows = self.connection.execute(
+            "SELECT name, substitute_holiday, saturday_workday FROM managers "
+            "WHERE substitute_holiday BETWEEN ?1 AND ?2 "
+            "UNION SELECT name, substitute_holiday, saturday_workday FROM managers "
+            "WHERE saturday_workday BETWEEN ?1 AND ?2 ORDER BY name", (start, end))
+        return [EroomManagerSchedule(*row) for row in rows]
+
+    def shift_all(self, days):
+        """
+        모든 매니저의 대체 휴무일과 토요일 근무일을 days일만큼 이동
+
+        이동한 날짜는 일정 예외 이력에도 남겨, 지난 달 출근부를 다시 만들어도 그 달의 일정이 유지된다.
+        """
+        modifier = f"{days:+d} days"
+        with self.transaction() as connection:
+            connection.execute(RECORD_CURRENT_DATES, (ScheduleOverride.DAY_OFF, ScheduleOverride.WORKDAY))
+            # 비어 있는 날짜는 date('', ...)가 NULL이 되므로 그대로 둠
+            connection.execute(
+                "UPDATE managers SET substitute_holiday = date(substitute_holiday, ?1) WHERE substitute_holiday != ''",
+                (modifier,))
+            connection.execute(
+                "UPDATE managers SET saturday_workday = date(saturday_workday, ?1) WHERE saturday_workday != ''",
+                (modifier,))
+            connection.execute(RECORD_CURRENT_DATES, (ScheduleOverride.DAY_OFF, ScheduleOverride.WORKDAY))
+
+    def upgrade(self, user_file_path=None):
+        """
+        이전 형식의 데이터를 SCHEMA_VERSION에 맞게 전환 (이미 전환했으면 아무것도 하지 않음)
+
+        1: 지금까지는 다음달/이전달 버튼으로 모든 날짜를 4주씩 옮겼으므로, 현재 날짜를 기준으로 하는
+           ROTATION_WEEKS주 반복 규칙을 만든다. 규칙은 기준 날짜 이후에만 적용되므로 지난 달은 이력대로 유지된다.
+        2: 추가 항목을 저장하지 않던 때 명단 CSV에서 가져온 매니저는 부서 등이 빠져 있으므로,
+           user_file_path가 있으면 그 파일의 추가 항목을 명단에 있는 매니저에게 채운다 (이미 있는 항목은 유지).
+
+        :param user_file_path: 처음 가져온 매니저 명단 CSV 파일
+        """
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self.transaction() as connection:
+            if version < 1:
+                connection.execute(RULES_FROM_CURRENT_DATES, (ScheduleOverride.DAY_OFF, ScheduleOverride.WORKDAY,
+                                                              ROTATION_WEEKS))
+            if version < 2 and user_file_path and os.path.exists(user_file_path):
+                names = {row[0] for row in connection.execute("SELECT name FROM managers")}
+                connection.executemany(
+                    "INSERT OR IGNORE INTO fields (name, key, value) VALUES (?, ?, ?)",
+                    [row for schedule in load_schedules(user_file_path) if schedule.name in names
+                     for row in _field_rows(schedule)])
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # 공휴일
+    def add_holiday(self, holiday: PublicHoliday):
+        """공휴일 추가 (이미 있으면 무시)"""
+        with self.transaction() as connection:
+            connection.execute("INSERT OR IGNORE INTO holidays (date) VALUES (?)", (holiday.to_dict()["date"],))
+
+    def delete_holiday(self, date):
+        """YYYY-MM-DD 날짜의 공휴일 삭제, 삭제되면 True"""
+        with self.transaction() as connection:
+            return connection.execute("DELETE FROM holidays WHERE date = ?", (date,)).rowcount > 0
+
+    def list_holidays(self):
+        return [PublicHoliday(row[0]) for row in self.connection.execute("SELECT date FROM holidays ORDER BY date")]
+
+    def holidays_in_range(self, start, end):
+        rows = self.connection.execute("SELECT date FROM holidays WHERE date BETWEEN ? AND ? ORDER BY date",
+                                       (start, end))
+        return [PublicHoliday(row[0]) for row in rows]
+
+    def import_csv(self, user_file_path, holiday_file_path=None):
+        """
+        기존 user_data.txt / holiday_data.txt를 한 번에 가져옴
+
+        :return: (가져온 매니저 수, 가져온 공휴일 수)
+        """
+        schedules = load_schedules(user_file_path) if os.path.exists(user_file_path) else []
+        holidays = load_holidays(holiday_file_path) if holiday_file_path else []
+        with self.transaction() as connection:
+            self._save_schedules(connection, schedules)
+            connection.executemany("INSERT OR IGNORE INTO holidays (date) VALUES (?)",
+                                   [(holiday.to_dict()["date"],) for holiday in holidays])
+        return len(schedules), len(holidays)
+
+
+def open_database(db_path=DEFAULT_DB_FILE, user_file_path="user_data.txt", holiday_file_path="holiday_data.txt"):
+    """데이터베이스를 열고, 처음 만들어진 경우 기존 CSV 파일을 가져온 뒤 이전 형식의 데이터를 전환"""
+    database = RosterDatabase(db_path)
+    if database.created:
+        database.import_csv(user_file_path, holiday_file_path)
+    database.upgrade(user_file_path)
+    return database
@@ -0,0 +1,172 @@
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+
+from eroom import ROTATION_WEEKS, EroomManagerSchedule, PublicHoliday
+from roster_db import DEFAULT_DB_FILE, RosterDatabase
+from store_data import ROSTER_HEADERS
+
+BATCH_SIZE = 1000  # 한 트랜잭션으로 저장할 행 수
+REPORT_HEADERS = ["행", "이름", "항목", "오류"]
+# 인사 시스템 내보내기 파일의 영문 머리글도 받음
+HEADER_ALIASES = {
+    "name": ROSTER_HEADERS[0],
+    "substitute_holiday": ROSTER_HEADERS[1],
+    "saturday_workday": ROSTER_HEADERS[2],
+}
+
+
+class ImportReport:
+    def __init__(self, source):
+        """
+        일괄 가져오기 결과
+
+        :param source: 가져온 파일 경로
+        """
+        self.source = source
+        self.rows = 0  # 읽은 데이터 행 수
+        self.imported = 0  # 명단에 반영한 행 수
+        self.errors = 0  # 오류가 있어 건너뛴 행 수
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return f"ImportReport(source={self.source}, rows={self.rows}, imported={self.imported}, errors={self.errors})"
+
+    def to_dict(self):
+        """객체를 딕셔너리 형태로 변환"""
+        return {"source": self.source, "rows": self.rows, "imported": self.imported, "errors": self.errors,
+                "seconds": self.seconds}
+
+
+def _normalize_date(value):
+    """PublicHoliday와 같은 규칙으로 날짜를 검증하고 YYYY-MM-DD로 맞춤 (잘못되면 ValueError)"""
+    return PublicHoliday((value or "").strip()).to_dict()["date"]
+
+
+def _open_reader(file):
+    """머리글 줄의 탭과 쉼표 수로 CSV/TSV를 구분하여 DictReader 생성 (확장자가 실제 형식과 달라도 읽음)"""
+    sample = file.readline()
+    file.seek(0)
+    delimiter = "\t" if "\t" in sample and sample.count("\t") >= sample.count(",") else ","
+    reader = csv.DictReader(file, delimiter=delimiter)
+    reader.fieldnames = [HEADER_ALIASES.get(name.strip().lower(), name.strip()) for name in reader.fieldnames or []]
+    missing = [header for header in ROSTER_HEADERS if header not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"필수 머리글이 없습니다: {', '.join(missing)}")
+    return reader
+
+
+def iter_schedules(file_path, errors=None, rotation_weeks=ROTATION_WEEKS):
+    """
+    명단 CSV/TSV 파일을 한 행씩 읽어 검증된 EroomManagerSchedule을 생성
+
+    파일 전체를 메모리에 올리지 않는다. 잘못된 행은 None을 내고 errors에 (행 번호, 이름, 항목, 오류)를 추가한다.
+
+    :param file_path: 가져올 파일 (UTF-8, 엑셀에서 저장한 BOM 포함 가능)
+    :param errors: 오류를 받을 목록 또는 append를 가진 객체 (None이면 버림)
+    :param rotation_weeks: 파일의 날짜부터 이 간격(주)으로 반복하는 규칙을 붙임 (0이면 그 날짜에만 적용)
+    """
+    with open(file_path, mode='r', encoding='utf-8-sig', newline='') as file:
+        reader = _open_reader(file)
+        for row in reader:
+            line = reader.line_num
+            name = (row.get(ROSTER_HEADERS[0]) or "").strip()
+            problems = []
+            if not name:
+                problems.append((ROSTER_HEADERS[0], "이름이 비어 있습니다."))
+            dates = []
+            for header in ROSTER_HEADERS[1:]:
+                try:
+                    dates.append(_normalize_date(row.get(header)))
+                except ValueError as e:
+                    problems.append((header, str(e)))
+            if problems:
+                if errors is not None:
+                    for header, message in problems:
+                        errors.append((line, name, header, message))
+                yield None
+                continue
+            if rotation_weeks:
+                yield EroomManagerSchedule.rotating(name, *dates, rotation_weeks)
+            else:
+                yield EroomManagerSchedule(name, *dates)
+
+
+class _ReportWriter:
+    """오류를 바로 파일에 쓰고 개수만 세는 append 대상"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.rows = set()
+
+    def append(self, error):
+        self.writer.writerow(error)
+        self.rows.add(error[0])
+
+
+def import_roster(file_path, database: RosterDatabase, report_path=None, batch_size=BATCH_SIZE,
+                  rotation_weeks=ROTATION_WEEKS):
+    """
+    대용량 명단 파일을 스트리밍으로 읽어 batch_size 행마다 한 트랜잭션으로 명단에 반영
+
+    같은 이름은 새 값으로 수정되며, 파일 안에서 이름이 겹치면 뒤의 행이 남는다.
+
+    :param file_path: 가져올 CSV/TSV 파일
+    :param database: 반영할 RosterDatabase
+    :param report_path: 행별 오류 보고서(CSV)를 저장할 파일 (None이면 저장하지 않음)
+    :param batch_size: 한 번에 저장할 행 수
+    :param rotation_weeks: 대체 휴무일/토요일 근무일의 반복 간격(주), 0이면 반복하지 않음
+    :return: ImportReport
+    """
+    report = ImportReport(file_path)
+    started = time.perf_counter()
+    report_file = open(report_path, mode='w', encoding='utf-8-sig', newline='') if report_path else open(os.devnull, 'w')
+    with report_file:
+        writer = csv.writer(report_file)
+        writer.writerow(REPORT_HEADERS)
+        errors = _ReportWriter(writer)
+        batch = []
+        for schedule in iter_schedules(file_path, errors, rotation_weeks):
+            report.rows += 1
+            if schedule is None:
+                continue
+            batch.append(schedule)
+            if len(batch) >= batch_size:
+                database.save_schedules(batch)
+                report.imported += len(batch)
+                batch = []
+        if batch:
+            database.save_schedules(batch)
+            report.imported += len(batch)
+    report.errors = len(errors.rows)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="인사 시스템 명단 파일(CSV/TSV) 일괄 가져오기")
+    parser.add_argument("file", help="가져올 명단 파일 (머리글: 이름, 대체 휴무 날짜, 토요일 근무 날짜)")
+    parser.add_argument("--db", default=DEFAULT_DB_FILE, help="명단 데이터베이스")
+    parser.add_argument("--report", default=None, help="행별 오류 보고서(CSV) 파일")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="한 트랜잭션으로 저장할 행 수")
+    parser.add_argument("--rotation-weeks", type=int, default=ROTATION_WEEKS,
+                        help="대체 휴무일/토요일 근무일의 반복 간격(주), 0이면 파일의 날짜에만 적용")
+    args = parser.parse_args(argv)
+
+    database = RosterDatabase(args.db)
+    try:
+        report = import_roster(args.file, database, args.report, args.batch_size, args.rotation_weeks)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"가져오기 실패: {e}")
+        return 1
+    finally:
+        database.close()
+    print(f"{report.rows}행 중 {report.imported}행 반영, 오류 {report.errors}행, {report.seconds:.3f}s")
+    return 1 if report.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
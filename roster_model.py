@@ -0,0 +1,199 @@
+import bisect
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+from eroom import EroomManagerSchedule, ScheduleOverride
+
+
+class ScheduleTableModel(QAbstractTableModel):
+    HEADERS = ["이름", "대체 휴무 날짜", "토요일 근무 날짜"]
+
+    def __init__(self, schedules=(), parent=None):
+        """
+        매니저 명단을 메모리에 두고 표에 보여주는 모델
+
+        추가/수정/삭제는 해당 행만 알리므로 명단이 커져도 표 전체를 다시 그리지 않는다.
+        year_month를 정하면 날짜 열에는 반복 규칙과 일정 예외로 계산한 그 달의 날짜를 보여주며,
+        화면에 그려지는 행만 처음 그릴 때 계산하고, 연월이나 그 행의 일정이 바뀔 때까지 재사용한다.
+
+        :param schedules: EroomManagerSchedule 목록
+        """
+        super().__init__(parent)
+        self.year_month = None  # YYYY-MM, None이면 저장된 날짜를 그대로 보여줌
+        self.schedules = list(schedules)
+        self.rows = {schedule.name: row for row, schedule in enumerate(self.schedules)}  # {이름: 행}
+        self._month_texts = {}  # {이름: (year_month의 대체 휴무 날짜, 토요일 근무 날짜)}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.schedules)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        schedule = self.schedules[index.row()]
+        if role == Qt.DisplayRole:
+            if index.column() == 0:
+                return schedule.name
+            if self.year_month is None:
+                return (schedule.substitute_holiday, schedule.saturday_workday)[index.column() - 1]
+            return self.month_texts(schedule)[index.column() - 1]
+        if role == Qt.UserRole:
+            return schedule
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def schedule_at(self, row):
+        return self.schedules[row]
+
+    def month_texts(self, schedule):
+        """year_month의 (대체 휴무 날짜, 토요일 근무 날짜) 열 문자열 (처음 그릴 때 한 번만 계산)"""
+        texts = self._month_texts.get(schedule.name)
+        if texts is None:
+            texts = self._month_texts[schedule.name] = (self.month_dates(schedule, ScheduleOverride.DAY_OFF),
+                                                        self.month_dates(schedule, ScheduleOverride.WORKDAY))
+        return texts
+
+    def month_dates(self, schedule, kind):
+        """year_month에 적용되는 kind 날짜 (여러 날이면 쉼표로 이음)"""
+        return ", ".join(sorted(override.date for override in schedule.get_overrides(self.year_month)
+                                if override.kind == kind))
+
+    def set_year_month(self, year_month):
+        """날짜 열에 보여줄 연월을 바꿈 (저장된 명단은 바꾸지 않고 날짜 열만 다시 그림)"""
+        self.year_month = year_month
+        self._month_texts.clear()
+        if self.schedules:
+            self.dataChanged.emit(self.index(0, 1), self.index(len(self.schedules) - 1, len(self.HEADERS) - 1))
+
+    def reset(self, schedules):
+        """명단 전체를 바꿈 (모든 날짜를 한꺼번에 옮긴 경우 등)"""
+        self.beginResetModel()
+        self.schedules = list(schedules)
+        self.rows = {schedule.name: row for row, schedule in enumerate(self.schedules)}
+        self._month_texts.clear()
+        self.endResetModel()
+
+    def upsert(self, schedule: EroomManagerSchedule):
+        """같은 이름이 있으면 그 행만 갱신하고, 없으면 맨 끝에 한 행 추가"""
+        row = self.rows.get(schedule.name)
+        self._month_texts.pop(schedule.name, None)
+        if row is not None:
+            self.schedules[row] = schedule
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+            return
+        row = len(self.schedules)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.schedules.append(schedule)
+        self.rows[schedule.name] = row
+        self.endInsertRows()
+
+    def remove(self, name):
+        """이름으로 한 행 삭제, 삭제되면 True"""
+        row = self.rows.get(name)
+        if row is None:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.schedules[row]
+        del self.rows[name]
+        self._month_texts.pop(name, None)
+        for following in self.schedules[row:]:
+            self.rows[following.name] -= 1
+        self.endRemoveRows()
+        return True
+
+
+class HolidayTableModel(QAbstractTableModel):
+    HEADERS = ["공휴일 날짜"]
+
+    def __init__(self, dates=(), parent=None):
+        """
+        공휴일 날짜(YYYY-MM-DD)를 정렬된 상태로 메모리에 두고 표에 보여주는 모델
+
+        :param dates: YYYY-MM-DD 형식의 문자열 목록
+        """
+        super().__init__(parent)
+        self.dates = sorted(set(dates))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.dates)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.UserRole):
+            return self.dates[index.row()]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def reset(self, dates):
+        """공휴일 전체를 바꿈"""
+        self.beginResetModel()
+        self.dates = sorted(set(dates))
+        self.endResetModel()
+
+    def add(self, date):
+        """날짜 순서에 맞는 위치에 한 행 추가 (이미 있으면 무시)"""
+        row = bisect.bisect_left(self.dates, date)
+        if row < len(self.dates) and self.dates[row] == date:
+            return False
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.dates.insert(row, date)
+        self.endInsertRows()
+        return True
+
+    def remove(self, date):
+        """날짜로 한 행 삭제, 삭제되면 True"""
+        row = bisect.bisect_left(self.dates, date)
+        if row == len(self.dates) or self.dates[row] != date:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.dates[row]
+        self.endRemoveRows()
+        return True
+
+
+class RosterFilterProxyModel(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        """
+        이름이나 연월로 행을 거르고 열 머리글을 눌러 정렬할 수 있게 하는 프록시 모델
+
+        날짜는 YYYY-MM-DD 문자열이므로 문자열 순서가 곧 날짜 순서다.
+        """
+        super().__init__(parent)
+        self.name_filter = ""
+        self.month_filter = None  # YYYY-MM, None이면 모든 달
+        self.date_columns = ()  # 연월을 비교할 열
+
+    def set_name_filter(self, text):
+        self.name_filter = text.strip()
+        self.invalidateFilter()
+
+    def set_month_filter(self, year_month, date_columns):
+        """
+        :param year_month: YYYY-MM 형식의 연월 (None이면 거르지 않음)
+        :param date_columns: 날짜가 들어 있는 열 번호들, 하나라도 해당 연월이면 보여줌
+        """
+        self.month_filter = year_month
+        self.date_columns = tuple(date_columns)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        if self.name_filter and self.name_filter not in (model.index(source_row, 0, source_parent).data() or ""):
+            return False
+        if self.month_filter:
+            return any((model.index(source_row, column, source_parent).data() or "").startswith(self.month_filter)
+                       for column in self.date_columns)
+        return True
@@ -0,0 +1,136 @@
+import bisect
+import os
+
+from eroom import EroomManagerSchedule, PublicHoliday
+from holiday_calendar import HolidayCalendar
+from roster_db import DEFAULT_DB_FILE, open_database
+
+
+def file_signature(file_path):
+    """파일 변경 여부를 판단할 (수정 시각(ns), 크기), 파일이 없으면 None"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RosterRepository:
+    def __init__(self, db_path=DEFAULT_DB_FILE, user_file_path="user_data.txt", holiday_file_path="holiday_data.txt"):
+        """
+        매니저 명단과 공휴일을 한 번 읽어 메모리에 두고 공유하는 저장소
+
+        데이터베이스 파일의 수정 시각이나 크기가 바뀐 경우(다른 프로그램에서 수정한 경우)에만 다시 읽는다.
+        이 저장소를 통한 수정은 데이터베이스와 메모리에 함께 반영한다.
+
+        :param db_path: 데이터베이스 파일 경로
+        :param user_file_path: 데이터베이스를 처음 만들 때 가져올 매니저 명단 CSV 파일
+        :param holiday_file_path: 데이터베이스를 처음 만들 때 가져올 공휴일 파일
+        """
+        self.db = open_database(db_path, user_file_path, holiday_file_path)
+        self.signature = None
+        self.loads = 0  # 데이터베이스에서 전체를 다시 읽은 횟수
+        self._schedules = []
+        self._holidays = []  # YYYY-MM-DD 문자열, 정렬된 상태
+        self._holiday_calendar = None
+
+    def __repr__(self):
+        return f"RosterRepository(db_path={self.db.db_path}, loads={self.loads})"
+
+    def close(self):
+        self.db.close()
+
+    def refresh(self):
+        """데이터베이스 파일이 바뀌었으면 다시 읽음, 다시 읽었으면 True"""
+        signature = file_signature(self.db.db_path)
+        if self.loads and signature == self.signature:
+            return False
+        self._schedules = self.db.list_schedules()
+        self._holidays = [holiday.to_dict()["date"] for holiday in self.db.list_holidays()]
+        self._holiday_calendar = None
+        self.signature = signature
+        self.loads += 1
+        return True
+
+    def _written(self):
+        """이 저장소를 통해 쓴 뒤 메모리를 직접 고쳤으므로 새 파일 상태를 기준으로 삼음"""
+        self.signature = file_signature(self.db.db_path)
+
+    # 읽기
+    def schedules(self):
+        """입력된 순서대로 모든 매니저 일정"""
+        self.refresh()
+        return list(self._schedules)
+
+    def holidays(self):
+        """날짜 순서대로 모든 공휴일"""
+        self.refresh()
+        return [PublicHoliday(date) for date in self._holidays]
+
+    def holiday_dates(self):
+        """날짜 순서대로 모든 공휴일 (YYYY-MM-DD 문자열)"""
+        self.refresh()
+        return list(self._holidays)
+
+    def holiday_calendar(self):
+        """공휴일로 만든 HolidayCalendar (공휴일이 바뀔 때까지 재사용하며, 내준 달력은 바꾸지 않음)"""
+        self.refresh()
+        if self._holiday_calendar is None:
+            self._holiday_calendar = HolidayCalendar(PublicHoliday(date) for date in self._holidays)
+        return self._holiday_calendar
+
+    # 쓰기
+    def save_schedule(self, schedule: EroomManagerSchedule):
+        """
+        매니저 일정을 추가하거나 수정
+
+        :return: 일정 예외 이력까지 붙은 저장된 일정
+        """
+        self.refresh()
+        self.db.save_schedule(schedule)
+        saved = self.db.get_schedule(schedule.name)
+        for row, existing in enumerate(self._schedules):
+            if existing.name == schedule.name:
+                self._schedules[row] = saved
+                break
+        else:
+            self._schedules.append(saved)
+        self._written()
+        return saved
+
+    def delete_schedule(self, name):
+        """이름으로 매니저 일정 삭제, 삭제되면 True"""
+        self.refresh()
+        deleted = self.db.delete_schedule(name)
+        self._schedules = [schedule for schedule in self._schedules if schedule.name != name]
+        self._written()
+        return deleted
+
+    def shift_all(self, days):
+        """모든 매니저의 대체 휴무일과 토요일 근무일을 days일만큼 이동 (명단 전체를 다시 읽음)"""
+        self.db.shift_all(days)
+        self.signature = None
+        self.refresh()
+
+    def add_holiday(self, holiday: PublicHoliday):
+        """공휴일 추가, 새로 추가되면 True"""
+        self.refresh()
+        date = holiday.to_dict()["date"]
+        self.db.add_holiday(holiday)
+        row = bisect.bisect_left(self._holidays, date)
+        added = row == len(self._holidays) or self._holidays[row] != date
+        if added:
+            self._holidays.insert(row, date)
+            self._holiday_calendar = None  # 이미 내준 달력(생성 중인 작업이 쓰는)은 고치지 않고 새로 만듦
+        self._written()
+        return added
+
+    def delete_holiday(self, date):
+        """YYYY-MM-DD 날짜의 공휴일 삭제, 삭제되면 True"""
+        self.refresh()
+        deleted = self.db.delete_holiday(date)
+        if date in self._holidays:
+            self._holidays.remove(date)
+            self._holiday_calendar = None
+        self._written()
+        return deleted
@@ -0,0 +1,104 @@
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from batch import combine_roster, create_session, iter_roster
+from output_cache import OutputCache
+
+
+class RosterWorker(QThread):
+    """
+    출근부 일괄 생성을 별도 스레드에서 실행하는 작업자
+
+    문서 한 건이 끝날 때마다 progress 시그널을 보내며, cancel()을 호출하면 진행 중인 문서까지만 만들고 멈춘다.
+    명단과 공휴일은 시작할 때 복사해 두므로 생성하는 동안 창에서 명단을 계속 수정해도 된다.
+    """
+    progress = pyqtSignal(int, int, str, bool, float)  # (완료 수, 전체 수, 매니저 이름, 성공 여부, 소요 시간(초))
+    error = pyqtSignal(str)
+    completed = pyqtSignal(int, int, bool)  # (성공 수, 실패 수, 취소 여부)
+
+    def __init__(self, schedules, year, month, default_file_path, holiday_calendar=None, combine=False, parent=None):
+        """
+        :param schedules: EroomManagerSchedule 목록
+        :param year: 대상 연도
+        :param month: 대상 월
+        :param default_file_path: 템플릿이 있고 결과를 저장할 디렉토리
+        :param holiday_calendar: 공휴일을 휴무일에 더할 HolidayCalendar
+        :param combine: True이면 모든 매니저의 출근부를 문서 하나로 합쳐 저장
+        """
+        super().__init__(parent)
+        self.schedules = list(schedules)
+        self.year = year
+        self.month = month
+        self.default_file_path = default_file_path
+        self.holiday_calendar = holiday_calendar
+        self.output_cache = OutputCache(default_file_path)  # 바뀌지 않은 문서는 다시 만들지 않음
+        self.combine = combine
+        self.combined_report = None  # combine_roster 결과
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """다음 문서부터 생성을 멈추도록 요청"""
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        if self.combine:
+            self._run_combined()
+            return
+        com_initialized = self._initialize_com()
+        succeeded = failed = 0
+        session = create_session("staged")  # 같은 달, 같은 휴무일의 문서는 중간 문서를 복사해 이름만 치환
+        documents = iter_roster(self.schedules, self.year, self.month, self.default_file_path, session=session,
+                                holiday_calendar=self.holiday_calendar, output_cache=self.output_cache)
+        try:
+            for name, ok, elapsed in documents:
+                if ok:
+                    succeeded += 1
+                else:
+                    failed += 1
+                self.progress.emit(succeeded + failed, len(self.schedules), name, ok, elapsed)
+                if self.is_cancelled():
+                    break
+        except Exception as e:
+            self.error.emit(f"오류 발생: {e}")
+        finally:
+            documents.close()
+            session.close()  # 취소된 경우에도 한글 오피스 인스턴스를 닫음
+            if com_initialized:
+                import pythoncom
+                pythoncom.CoUninitialize()
+        self.completed.emit(succeeded, failed, self.is_cancelled())
+
+    def _run_combined(self):
+        """합친 문서 하나를 만듦 (문서 한 건이므로 중간 취소 없이 끝까지 진행)"""
+        com_initialized = self._initialize_com()
+        started = time.perf_counter()
+        session = create_session("staged")
+        try:
+            self.combined_report = combine_roster(self.schedules, self.year, self.month, session,
+                                                  self.default_file_path, holiday_calendar=self.holiday_calendar)
+        except Exception as e:
+            self.error.emit(f"오류 발생: {e}")
+        finally:
+            session.close()
+            if com_initialized:
+                import pythoncom
+                pythoncom.CoUninitialize()
+        ok = self.combined_report is not None
+        total = len(self.schedules)
+        self.progress.emit(total, total, "전체", ok, time.perf_counter() - started)
+        self.completed.emit(int(ok), int(not ok), False)
+
+    @staticmethod
+    def _initialize_com():
+        """작업 스레드에서 COM을 쓰려면 스레드마다 초기화해야 함 (pywin32가 없으면 건너뜀)"""
+        try:
+            import pythoncom
+        except ImportError:
+            return False
+        pythoncom.CoInitialize()
+        return True
@@ -0,0 +1,277 @@
+import argparse
+import calendar
+import json
+import sys
+from datetime import date
+
+from batch import iter_months, parse_target_date
+from eroom import ROTATION_WEEKS, ScheduleOverride
+from holiday_calendar import HolidayCalendar, mask_to_days
+from roster_db import DEFAULT_DB_FILE, open_database
+from store_data import load_schedules
+
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없으면 파이썬 정수 비트 연산으로 같은 값을 계산
+    np = None
+
+DAY_BITS = 32  # 비트 d가 d일 (0번 비트는 쓰지 않음)
+
+
+def _override_bits(schedules, months):
+    """
+    명단 전체의 일정 예외를 (행, 열, 비트) 배열로 모음 (EroomManagerSchedule.get_overrides와 같은 규칙)
+
+    기록된 예외와 대체휴무일/토요일 근무일 필드는 매니저마다 한 번씩만 훑고,
+    반복 규칙은 달마다 계산하지 않고 "기준 날짜 서수 + k × 간격"으로 모든 달의 날짜를 한꺼번에 만든다.
+
+    :return: (토요일 근무 (행, 열, 비트), 대체 휴무 (행, 열, 비트)), 각각 NumPy 배열 세 개
+    """
+    column_of_month = {f"{year}-{str(month).zfill(2)}": column for column, (year, month) in enumerate(months)}
+    first = min(date(year, month, 1) for year, month in months).toordinal()
+    last = max(date(year, month, calendar.monthrange(year, month)[1]) for year, month in months).toordinal()
+    # first부터의 날짜 차이 -> (열, 날짜), months에 없는 달의 날짜는 열이 -1
+    day_column = np.full(last - first + 1, -1, dtype=np.int64)
+    day_of_month = np.zeros(last - first + 1, dtype=np.int64)
+    for column, (year, month) in enumerate(months):
+        start = date(year, month, 1).toordinal() - first
+        last_day = calendar.monthrange(year, month)[1]
+        day_column[start:start + last_day] = column
+        day_of_month[start:start + last_day] = np.arange(1, last_day + 1)
+
+    recorded = {ScheduleOverride.WORKDAY: ([], [], []), ScheduleOverride.DAY_OFF: ([], [], [])}  # (행, 열, 날짜)
+    rule_rows, rule_kinds, anchors, steps = [], [], [], []
+    exceptions = []  # (규칙 번호, first부터의 날짜 차이)
+    for row, schedule in enumerate(schedules):
+        covered = {}  # {종류: 규칙이 날짜를 정하기 시작하는 연월}, RecurrenceRule.covers와 같은 범위
+        for rule in schedule.rules:
+            anchor_month = rule.anchor.strftime("%Y-%m")
+            covered[rule.kind] = min(covered.get(rule.kind, anchor_month), anchor_month)
+            exceptions.extend((len(anchors), day.toordinal() - first) for day in rule.exceptions)
+            rule_rows.append(row)
+            rule_kinds.append(rule.kind)
+            anchors.append(rule.anchor.toordinal())
+            steps.append(rule.interval_weeks * 7)
+        dates = [(schedule.saturday_workday, ScheduleOverride.WORKDAY),
+                 (schedule.substitute_holiday, ScheduleOverride.DAY_OFF)]
+        for month, overrides in schedule.overrides_by_month.items():
+            if month in column_of_month:
+                dates.extend((override.date, override.kind) for override in overrides)
+        for day, kind in dates:
+            column = column_of_month.get(day[:7])
+            if column is None or (kind in covered and day[:7] >= covered[kind]):
+                continue
+            target = recorded[kind]
+            target[0].append(row)
+            target[1].append(column)
+            target[2].append(int(day[8:]))
+
+    result = {kind: tuple(np.array(values, dtype=np.int64) for values in target) for kind, target in recorded.items()}
+    if anchors:
+        anchors = np.array(anchors, dtype=np.int64)
+        steps = np.array(steps, dtype=np.int64)
+        # 규칙마다 first~last 안에 드는 반복 번호 k의 범위 (기준 날짜 이전은 적용하지 않음)
+        k_first = -(-np.maximum(first - anchors, 0) // steps)
+        counts = np.maximum((last - anchors) // steps - k_first + 1, 0)
+        rules = np.repeat(np.arange(len(anchors)), counts)
+        k = k_first[rules] + np.arange(len(rules)) - np.repeat(np.cumsum(counts) - counts, counts)
+        offsets = anchors[rules] + k * steps[rules] - first
+        keep = day_column[offsets] >= 0
+        if exceptions:
+            span = last - first + 1
+            skipped = np.array([rule * span + offset for rule, offset in exceptions if 0 <= offset < span],
+                               dtype=np.int64)
+            keep &= ~np.isin(rules * span + offsets, skipped)
+        rules, offsets = rules[keep], offsets[keep]
+        rule_rows = np.array(rule_rows, dtype=np.int64)[rules]
+        rule_kinds = np.array(rule_kinds)[rules]
+        for kind in result:
+            selected = rule_kinds == kind
+            result[kind] = tuple(np.concatenate(pair) for pair in zip(
+                result[kind], (rule_rows[selected], day_column[offsets[selected]], day_of_month[offsets[selected]])))
+    return tuple((rows, columns, np.left_shift(np.uint32(1), days.astype(np.uint32)))
+                 for rows, columns, days in (result[ScheduleOverride.WORKDAY], result[ScheduleOverride.DAY_OFF]))
+
+
+class DayOffMatrix:
+    def __init__(self, names, months, masks, base_masks):
+        """
+        명단 전체의 여러 달 휴무일을 매니저 × 월 비트 행렬로 담는 클래스
+
+        :param names: 매니저 이름 목록 (행 순서)
+        :param months: (연도, 월) 목록 (열 순서)
+        :param masks: 매니저 × 월 휴무일 비트 (NumPy uint32 배열 또는 정수 목록의 목록)
+        :param base_masks: 월마다 주말과 공휴일을 합친 비트 (토요일 근무 판단 기준)
+        """
+        self.names = list(names)
+        self.months = list(months)
+        self.masks = masks
+        self.base_masks = list(base_masks)
+        self.rows = {name: row for row, name in enumerate(self.names)}
+
+    def __repr__(self):
+        return f"DayOffMatrix(managers={len(self.names)}, months={len(self.months)}, numpy={self.uses_numpy})"
+
+    @property
+    def uses_numpy(self):
+        return np is not None and isinstance(self.masks, np.ndarray)
+
+    @classmethod
+    def build(cls, schedules, months, holiday_calendar=None, use_numpy=True):
+        """
+        명단 전체의 months 휴무일 행렬 생성 (HolidayCalendar.days_off와 같은 규칙)
+
+        NumPy가 있으면 주말·공휴일 비트를 모든 매니저에 한꺼번에 깔고, 일정 예외와 반복 규칙의 날짜를
+        배열로 계산하여(_override_bits) bitwise_and.at/bitwise_or.at 한 번씩으로 적용한다.
+
+        :param schedules: EroomManagerSchedule 목록
+        :param months: (연도, 월) 목록
+        :param holiday_calendar: 공휴일을 반영할 HolidayCalendar (None이면 주말만)
+        :param use_numpy: False이면 NumPy가 있어도 파이썬 정수로 계산
+        """
+        holiday_calendar = holiday_calendar or HolidayCalendar()
+        schedules = list(schedules)
+        months = list(months)
+        base_masks = [holiday_calendar.day_off_mask(year, month) for year, month in months]
+        if np is None or not use_numpy:
+            masks = [[holiday_calendar.days_off_mask(schedule, year, month) for year, month in months]
+                     for schedule in schedules]
+            return cls([schedule.name for schedule in schedules], months, masks, base_masks)
+
+        masks = np.tile(np.array(base_masks, dtype=np.uint32), (len(schedules), 1))
+        if schedules and months:
+            cleared, added = _override_bits(schedules, months)
+            # get_day_off와 같이 근무일을 먼저 빼고 휴무일을 더함
+            np.bitwise_and.at(masks, (cleared[0], cleared[1]), ~cleared[2])
+            np.bitwise_or.at(masks, (added[0], added[1]), added[2])
+        return cls([schedule.name for schedule in schedules], months, masks, base_masks)
+
+    def mask(self, name, year, month):
+        """매니저의 해당 월 휴무일 비트"""
+        return int(self.masks[self.rows[name]][self.months.index((year, month))])
+
+    def days_off(self, name, year, month):
+        """매니저의 해당 월 휴무일 집합"""
+        return mask_to_days(self.mask(name, year, month))
+
+    def _day_counts(self, masks_by_month):
+        """
+        월마다 날짜별로 비트가 켜진 매니저 수
+
+        :param masks_by_month: 매니저 × 월 비트 (self.masks와 같은 모양)
+        :return: 월 × DAY_BITS 개수 목록
+        """
+        if self.uses_numpy:
+            bits = (masks_by_month[:, :, None] >> np.arange(DAY_BITS, dtype=np.uint32)) & 1
+            return bits.sum(axis=0, dtype=np.int64).tolist()
+        counts = [[0] * DAY_BITS for _ in self.months]
+        for row in masks_by_month:
+            for column, mask in enumerate(row):
+                for day in range(1, DAY_BITS):
+                    counts[column][day] += mask >> day & 1
+        return counts
+
+    def _worked_off_days(self):
+        """매니저 × 월로 주말·공휴일인데 근무하는 날의 비트 (토요일 근무 등)"""
+        if self.uses_numpy:
+            return np.array(self.base_masks, dtype=np.uint32)[None, :] & ~self.masks
+        return [[base & ~mask for base, mask in zip(self.base_masks, row)] for row in self.masks]
+
+    def on_duty(self):
+        """
+        월마다 날짜별 근무 인원
+
+        :return: {(연도, 월): {날짜: 근무 인원}}
+        """
+        off_counts = self._day_counts(self.masks)
+        result = {}
+        for column, (year, month) in enumerate(self.months):
+            last_day = calendar.monthrange(year, month)[1]
+            result[(year, month)] = {day: len(self.names) - off_counts[column][day] for day in range(1, last_day + 1)}
+        return result
+
+    def understaffed(self, minimum):
+        """
+        주말·공휴일이 아닌 날 중 근무 인원이 minimum보다 적은 날
+
+        :return: {(연도, 월): [날짜]}
+        """
+        result = {}
+        for column, ((year, month), counts) in enumerate(self.on_duty().items()):
+            base = self.base_masks[column]
+            result[(year, month)] = [day for day, count in counts.items() if not base >> day & 1 and count < minimum]
+        return result
+
+    def saturday_collisions(self, limit=1):
+        """
+        주말·공휴일 근무자가 limit명보다 많은 날과 그 날 근무하는 매니저
+
+        :return: {(연도, 월): {날짜: [매니저 이름]}}
+        """
+        worked = self._worked_off_days()
+        counts = self._day_counts(worked)
+        result = {}
+        for column, month_key in enumerate(self.months):
+            collisions = {}
+            for day in range(1, DAY_BITS):
+                if counts[column][day] <= limit:
+                    continue
+                if self.uses_numpy:
+                    rows = np.nonzero((worked[:, column] >> day) & 1)[0].tolist()
+                else:
+                    rows = [row for row in range(len(self.names)) if worked[row][column] >> day & 1]
+                collisions[day] = [self.names[row] for row in rows]
+            result[month_key] = collisions
+        return result
+
+    def report(self, minimum=1, saturday_limit=1):
+        """
+        근무 인원 보고서
+
+        :param minimum: 평일 최소 근무 인원
+        :param saturday_limit: 주말·공휴일 하루에 근무할 수 있는 최대 인원
+        :return: {"YYYY-MM": {"on_duty": {날짜: 인원}, "understaffed": [날짜], "saturday_collisions": {날짜: [이름]}}}
+        """
+        on_duty = self.on_duty()
+        understaffed = self.understaffed(minimum)
+        collisions = self.saturday_collisions(saturday_limit)
+        return {
+            f"{year}-{str(month).zfill(2)}": {
+                "on_duty": on_duty[(year, month)],
+                "understaffed": understaffed[(year, month)],
+                "saturday_collisions": collisions[(year, month)]
+            }
+            for year, month in self.months
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="명단 전체의 날짜별 근무 인원 보고서")
+    parser.add_argument("target_date", type=parse_target_date, help="시작 연월 (YYYY-MM)")
+    parser.add_argument("--until", type=parse_target_date, default=None, help="마지막 연월 (YYYY-MM)")
+    parser.add_argument("--roster", default=DEFAULT_DB_FILE, help="매니저 명단 SQLite 데이터베이스(.db) 또는 CSV 파일")
+    parser.add_argument("--holidays", default="holiday_data.txt",
+                        help="공휴일 파일, --roster가 CSV일 때 또는 데이터베이스를 처음 만들 때 사용")
+    parser.add_argument("--rotation-weeks", type=int, default=ROTATION_WEEKS,
+                        help="--roster가 CSV일 때 대체 휴무일/토요일 근무일의 반복 간격(주), 데이터베이스에 처음 "
+                             "가져올 때와 같은 규칙 (0이면 파일의 날짜에만 적용, 데이터베이스는 저장된 규칙을 사용)")
+    parser.add_argument("--minimum", type=int, default=1, help="평일 최소 근무 인원")
+    parser.add_argument("--saturday-limit", type=int, default=1, help="주말·공휴일 하루 최대 근무 인원")
+    args = parser.parse_args(argv)
+
+    if args.roster.endswith(".db"):
+        database = open_database(args.roster, holiday_file_path=args.holidays)
+        schedules = database.list_schedules()
+        holiday_calendar = HolidayCalendar(database.list_holidays())
+        database.close()
+    else:
+        schedules = load_schedules(args.roster, args.rotation_weeks)
+        holiday_calendar = HolidayCalendar.from_file(args.holidays)
+    months = list(iter_months(args.target_date, args.until or args.target_date))
+    matrix = DayOffMatrix.build(schedules, months, holiday_calendar)
+    print(json.dumps(matrix.report(args.minimum, args.saturday_limit), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
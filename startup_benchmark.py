@@ -0,0 +1,156 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPOSITORY_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORT_MODULES = ["eroom", "batch", "input_form"]
+# 창을 띄우는 데 필요 없어 처음 문서를 만들 때까지 불러오지 않아야 하는 모듈
+LAZY_MODULES = ["write_hwp", "hwpx_engine", "hwp_reader", "win32com", "win32com.client"]
+
+IMPORT_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [name for name in {lazy!r} if name in sys.modules]}}))
+"""
+
+
+def _run_child(args, env=None, cwd=REPOSITORY_DIR):
+    """하위 프로세스를 cwd에서 실행하여 마지막 줄의 JSON 결과를 읽음"""
+    completed = subprocess.run([sys.executable, *args], capture_output=True, text=True, cwd=cwd, env=env)
+    if completed.returncode != 0:
+        lines = (completed.stderr or completed.stdout).strip().splitlines()
+        return {"error": lines[-1] if lines else f"종료 코드 {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _summarize(samples, key):
+    values = [sample[key] for sample in samples if sample.get(key) is not None]
+    if not values:
+        return None
+    return {"median": statistics.median(values), "min": min(values), "max": max(values)}
+
+
+def measure_imports(modules=IMPORT_MODULES, runs=5):
+    """
+    모듈마다 새 프로세스에서 import 시간을 runs번 측정
+
+    :return: {모듈: {"seconds": {"median", "min", "max"}, "loaded": 불러온 LAZY_MODULES, "error": 오류}}
+    """
+    results = {}
+    for module in modules:
+        samples = [_run_child(["-c", IMPORT_CHILD.format(module=module, lazy=LAZY_MODULES)]) for _ in range(runs)]
+        errors = [sample["error"] for sample in samples if "error" in sample]
+        results[module] = {
+            "seconds": _summarize(samples, "seconds"),
+            "loaded": sorted({name for sample in samples for name in sample.get("loaded", [])}),
+            "error": errors[0] if errors else None
+        }
+    return results
+
+
+def _prepare_roster(directory, managers):
+    """
+    directory에 벤치마크용 명단 데이터베이스를 만듦 (실제 eroom.db는 건드리지 않음)
+
+    매니저 managers명의 합성 명단과 저장소의 공휴일 파일을 넣고 형식 전환까지 마쳐, 측정마다 같은 상태에서 시작한다.
+    """
+    from hwp_benchmark import synthetic_roster
+    from roster_db import DEFAULT_DB_FILE, open_database
+
+    today = time.localtime()
+    database = open_database(os.path.join(directory, DEFAULT_DB_FILE), os.path.join(directory, "user_data.txt"),
+                             os.path.join(REPOSITORY_DIR, "holiday_data.txt"))
+    try:
+        database.save_schedules(synthetic_roster(managers, [(today.tm_year, today.tm_mon)]))
+    finally:
+        database.close()
+
+
+def measure_window(runs=5, managers=50):
+    """
+    새 프로세스에서 창을 띄우는 시간을 runs번 측정 (화면이 없으면 offscreen 플랫폼 사용)
+
+    창은 임시 디렉토리에서 띄우므로 저장소의 eroom.db를 만들거나 전환하지 않고, 측정 결과도 실제 명단에 좌우되지 않는다.
+
+    :param managers: 임시 데이터베이스에 넣을 합성 명단의 매니저 수
+    :return: {"import_seconds", "window_seconds", "roster_seconds"} 요약, 실행할 수 없으면 "error"
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    with tempfile.TemporaryDirectory() as directory:
+        _prepare_roster(directory, managers)
+        samples = [_run_child([os.path.abspath(__file__), "--window-child"], env, directory) for _ in range(runs)]
+    errors = [sample["error"] for sample in samples if "error" in sample]
+    if errors:
+        return {"error": errors[0]}
+    return {key: _summarize(samples, key) for key in ("import_seconds", "window_seconds", "roster_seconds")}
+
+
+def _window_child():
+    """
+    하위 프로세스에서 실행: 프로세스 시작부터 잰 시간을 JSON으로 출력
+
+    window_seconds는 창을 띄운 뒤 이벤트 루프가 처음 돌 때까지, roster_seconds는 명단을 표에 채울 때까지의 시간이다.
+    """
+    started = time.perf_counter()
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from input_form import InputForm
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv[:1])
+    form = InputForm()
+    timings = {"import_seconds": imported - started}
+
+    def on_shown():
+        timings["window_seconds"] = time.perf_counter() - started
+
+    def on_loaded():
+        timings["roster_seconds"] = time.perf_counter() - started
+        app.quit()
+
+    form.roster_loaded.connect(on_loaded)
+    form.show()
+    QTimer.singleShot(0, on_shown)
+    app.exec_()
+    timings["loaded"] = [name for name in LAZY_MODULES if name in sys.modules]
+    print(json.dumps(timings))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="프로그램 시작 시간 측정 (import 시간, 첫 창까지의 시간)")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수")
+    parser.add_argument("--modules", nargs="*", default=IMPORT_MODULES, help="import 시간을 잴 모듈")
+    parser.add_argument("--managers", type=int, default=50, help="창을 띄울 때 쓸 합성 명단의 매니저 수")
+    parser.add_argument("--output", default=None, help="결과를 저장할 JSON 파일 (기본값: 표준 출력)")
+    parser.add_argument("--window-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.window_child:
+        _window_child()
+        return 0
+
+    result = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "runs": args.runs,
+        "imports": measure_imports(args.modules, args.runs),
+        "managers": args.managers,
+        "window": measure_window(args.runs, args.managers)
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, mode='w', encoding='utf-8') as file:
+            file.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,10 @@
 import csv
 
+from eroom import EroomManagerSchedule
+
+ROSTER_HEADERS = ["이름", "대체 휴무 날짜", "토요일 근무 날짜"]
+
+
 def save_to_csv(file_path, data):
     """입력 데이터를 CSV 파일로 저장"""
     try:
@@ -10,6 +15,29 @@ def save_to_csv(file_path, data):
     except Exception as e:
         print(f"파일 저장 중 오류 발생: {e}")
 
-# 사용 예시
-user_data = ["홍길동", "2025-02-01", "2025-02-10", "2025-02-15"]
-save_to_csv("user_data.txt", user_data)
\ No newline at end of file
+
+def load_schedules(file_path, rotation_weeks=0):
+    """
+    매니저 명단 CSV 파일을 읽어 EroomManagerSchedule 목록으로 반환
+
+    ROSTER_HEADERS 외의 열(부서, 센터 등)은 머리글을 이름으로 하는 추가 항목(fields)으로 읽는다.
+
+    :param rotation_weeks: 파일의 날짜부터 이 간격(주)으로 반복하는 규칙을 붙임 (0이면 그 날짜에만 적용)
+    """
+    schedules = []
+    with open(file_path, mode='r', encoding='utf-8') as file:
+        reader = csv.DictReader(file)
+        extra_headers = [header for header in reader.fieldnames or [] if header not in ROSTER_HEADERS]
+        for row in reader:
+            dates = row[ROSTER_HEADERS[0]], row[ROSTER_HEADERS[1]], row[ROSTER_HEADERS[2]]
+            schedule = EroomManagerSchedule.rotating(*dates, rotation_weeks) if rotation_weeks \
+                else EroomManagerSchedule(*dates)
+            schedule.fields = {header: row[header] for header in extra_headers if row.get(header)}
+            schedules.append(schedule)
+    return schedules
+
+
+if __name__ == '__main__':
+    # 사용 예시
+    user_data = ["홍길동", "2025-02-01", "2025-02-10", "2025-02-15"]
+    save_to_csv("user_data.txt", user_data)
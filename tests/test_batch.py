@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import pytest
+
+import batch
+from batch import TEMPLATE_FILE
+from roster_db import open_database
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROSTER = "이름,대체 휴무 날짜,토요일 근무 날짜\n김단아,2025-01-27,2025-02-01\n"
+
+
+@pytest.fixture
+def directory(tmp_path, monkeypatch):
+    shutil.copyfile(os.path.join(REPOSITORY_DIR, TEMPLATE_FILE), tmp_path / TEMPLATE_FILE)
+    (tmp_path / "roster.csv").write_text(ROSTER, encoding="utf-8")
+    (tmp_path / "holiday_data.txt").write_text("", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def rendered_schedules(monkeypatch, argv):
+    """batch.main이 문서를 만들려고 넘긴 (매니저 이름, 휴무일) 목록"""
+    rendered = []
+
+    def fake_generate_roster(schedules, year, month, *args, **kwargs):
+        for schedule in schedules:
+            meta_data = batch.build_meta_data(year, month, schedule.name)
+            rendered.append((schedule.name, sorted(schedule.get_day_off(meta_data) - meta_data.get_weekends())))
+        return []
+
+    monkeypatch.setattr(batch, "generate_roster", fake_generate_roster)
+    assert batch.main(argv + ["--backend", "fake"]) == 0
+    return rendered
+
+
+def test_csv_roster_rotates_like_the_database(directory, monkeypatch):
+    from_csv = rendered_schedules(monkeypatch, ["2025-02", "--roster", "roster.csv"])
+
+    database = open_database("eroom.db", "roster.csv", "holiday_data.txt")
+    database.close()
+    from_database = rendered_schedules(monkeypatch, ["2025-02", "--roster", "eroom.db"])
+
+    assert from_csv == from_database == [("김단아", [24])]
+
+
+def test_csv_roster_without_rotation_uses_the_file_dates(directory, monkeypatch):
+    assert rendered_schedules(monkeypatch, ["2025-02", "--roster", "roster.csv", "--rotation-weeks", "0"]) == \
+        [("김단아", [])]
+
+
+def test_batch_writes_one_document_per_manager_and_month(directory, capsys):
+    with open("roster.csv", mode="a", encoding="utf-8") as file:
+        file.write("이서준,2025-02-12,2025-02-15\n")
+    assert batch.main(["2025-02", "--until", "2025-03", "--roster", "roster.csv", "--backend", "fake"]) == 0
+    outputs = sorted(name for name in os.listdir(directory) if name.endswith(".hwp") and name != TEMPLATE_FILE)
+    assert len(outputs) == 4
+    assert any("2025년_3월" in name and "이서준" in name for name in outputs)
+    assert "총 4건 (실패 0건)" in capsys.readouterr().out
+
+
+def test_combine_writes_one_document_per_month(directory, capsys):
+    with open("roster.csv", mode="a", encoding="utf-8") as file:
+        file.write("이서준,2025-02-12,2025-02-15\n")
+    assert batch.main(["2025-02", "--until", "2025-03", "--roster", "roster.csv", "--backend", "fake", "--combine"]) == 0
+    outputs = sorted(name for name in os.listdir(directory) if name.endswith(".hwp") and name != TEMPLATE_FILE)
+    assert outputs == ["청년이룸출근부_2025년_2월_전체.hwp", "청년이룸출근부_2025년_3월_전체.hwp"]
+    out = capsys.readouterr().out
+    assert "2건\t2쪽" in out and "총 2개월" in out
@@ -0,0 +1,59 @@
+import pytest
+
+from eroom import EroomManagerSchedule, MetaData, RecurrenceRule, ScheduleOverride
+
+
+def test_overrides_are_indexed_by_month():
+    schedule = EroomManagerSchedule("홍길동", "2025-04-09", "2025-04-12", overrides=[
+        ScheduleOverride("2025-03-12", ScheduleOverride.DAY_OFF),
+        ScheduleOverride("2025-03-15", ScheduleOverride.WORKDAY),
+        ScheduleOverride("2025-03-12", ScheduleOverride.DAY_OFF),
+    ])
+    assert sorted(schedule.overrides_by_month) == ["2025-03"]
+    assert schedule.get_overrides("2025-03") == [ScheduleOverride("2025-03-12", ScheduleOverride.DAY_OFF),
+                                                 ScheduleOverride("2025-03-15", ScheduleOverride.WORKDAY)]
+    assert {override.date for override in schedule.get_overrides("2025-04")} == {"2025-04-09", "2025-04-12"}
+    assert len(schedule.get_overrides()) == 4
+
+
+def test_day_off_uses_only_the_target_month():
+    schedule = EroomManagerSchedule("홍길동", "2025-04-09", "2025-04-12", overrides=[
+        ScheduleOverride("2025-03-12", ScheduleOverride.DAY_OFF),
+        ScheduleOverride("2025-03-15", ScheduleOverride.WORKDAY),
+    ])
+    march = MetaData(".", "template.hwp", "out.hwp", "2025-03")
+    day_off = schedule.get_day_off(march)
+    assert 12 in day_off and 15 not in day_off
+    assert day_off - {12} | {15} == march.get_weekends()
+
+
+def test_rule_dates_follow_the_anchor():
+    rule = RecurrenceRule(ScheduleOverride.DAY_OFF, "2025-02-10", 4, exceptions=["2025-05-05"])
+    assert rule.dates_in_month(2025, 1) == []
+    assert [date.day for date in rule.dates_in_month(2025, 2)] == [10]
+    assert [date.day for date in rule.dates_in_month(2025, 3)] == [10]
+    assert rule.dates_in_month(2025, 5) == []
+    assert [date.day for date in rule.dates_in_month(2025, 6)] == [2, 30]
+    assert [date.day for date in rule.dates_in_month(2026, 2)] == [9]
+
+
+def test_rule_rejects_bad_interval():
+    with pytest.raises(ValueError):
+        RecurrenceRule(ScheduleOverride.DAY_OFF, "2025-02-10", 0)
+
+
+def test_rule_replaces_recorded_overrides_from_its_anchor_month():
+    schedule = EroomManagerSchedule.rotating("홍길동", "2025-03-10", "2025-03-15")
+    schedule.add_override(ScheduleOverride("2025-02-12", ScheduleOverride.DAY_OFF))
+    schedule.add_override(ScheduleOverride("2025-04-16", ScheduleOverride.DAY_OFF))
+    assert [override.date for override in schedule.get_overrides("2025-02")] == ["2025-02-12"]
+    assert sorted(override.date for override in schedule.get_overrides("2025-04")) == ["2025-04-07", "2025-04-12"]
+
+
+def test_duplicate_kinds_allows_a_rule_that_returns_twice_in_a_month():
+    schedule = EroomManagerSchedule.rotating("홍길동", "2025-02-10", "")
+    assert schedule.duplicate_kinds("2025-06") == []
+
+    schedule = EroomManagerSchedule("홍길동", "2025-06-02", "", overrides=[
+        ScheduleOverride("2025-06-20", ScheduleOverride.DAY_OFF)])
+    assert schedule.duplicate_kinds("2025-06") == [ScheduleOverride.DAY_OFF]
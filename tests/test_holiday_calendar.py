@@ -0,0 +1,42 @@
+from eroom import EroomManagerSchedule, MetaData, PublicHoliday
+from holiday_calendar import HolidayCalendar, load_holidays, mask_to_days, weekend_mask
+
+
+def test_weekend_mask_matches_metadata_weekends():
+    for month in range(1, 13):
+        meta_data = MetaData(".", "template.hwp", "out.hwp", f"2025-{month:02d}")
+        assert mask_to_days(weekend_mask(2025, month)) == meta_data.get_weekends()
+
+
+def test_holidays_are_indexed_by_year_and_month():
+    calendar = HolidayCalendar([PublicHoliday("2025-03-01"), PublicHoliday("2025-03-03"),
+                                PublicHoliday("2026-03-02")])
+    assert calendar.month_holidays(2025, 3) == {1, 3}
+    assert calendar.month_holidays(2025, 4) == set()
+    assert calendar.month_holidays(2026, 3) == {2}
+    assert calendar.month_holidays(2027, 3) == set()
+
+
+def test_added_holiday_invalidates_cached_day_off_mask():
+    calendar = HolidayCalendar()
+    before = calendar.day_off_mask(2025, 3)
+    calendar.add(PublicHoliday("2025-03-03"))
+    assert calendar.day_off_mask(2025, 3) == before | 1 << 3
+
+
+def test_days_off_match_get_day_off():
+    calendar = HolidayCalendar([PublicHoliday("2025-03-03")])
+    schedule = EroomManagerSchedule("홍길동", "2025-03-12", "2025-03-15")
+    meta_data = MetaData(".", "template.hwp", "out.hwp", "2025-03", calendar.month_holidays(2025, 3))
+
+    days_off = calendar.days_off(schedule, 2025, 3)
+    assert days_off == schedule.get_day_off(meta_data)
+    assert 3 in days_off and 12 in days_off and 15 not in days_off
+    assert calendar.roster_days_off([schedule], 2025, [3]) == {"홍길동": {3: days_off}}
+
+
+def test_load_holidays_skips_blank_lines_and_missing_files(tmp_path):
+    holidays = tmp_path / "holiday_data.txt"
+    holidays.write_text("2025-03-01\n\n2025-05-05\n", encoding="utf-8")
+    assert [holiday.to_dict()["date"] for holiday in load_holidays(str(holidays))] == ["2025-03-01", "2025-05-05"]
+    assert load_holidays(str(tmp_path / "missing.txt")) == []
@@ -0,0 +1,34 @@
+import os
+
+from batch import TEMPLATE_FILE
+from hwp_benchmark import MODES, compare, run_scenario, synthetic_roster
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONTHS = [(2025, 3)]
+
+
+def test_scenarios_count_calls_for_every_mode():
+    schedules = synthetic_roster(4, MONTHS)
+    results = {mode: run_scenario(mode, schedules, MONTHS, os.path.join(REPOSITORY_DIR, TEMPLATE_FILE))
+               for mode in MODES}
+    for result in results.values():
+        assert result["documents"] == 4 and result["failed"] == 0
+        assert result["calls"] == sum(result["calls_by_name"].values())
+    # 한 세션이 인스턴스와 레이아웃을 재사용하므로 문서마다 템플릿을 다시 여는 방식보다 호출이 적음
+    assert results["session"]["calls"] < results["modify_hwp_file"]["calls"]
+
+
+def test_synthetic_roster_is_reproducible():
+    assert ([schedule.to_dict() for schedule in synthetic_roster(5, MONTHS, seed=1)]
+            == [schedule.to_dict() for schedule in synthetic_roster(5, MONTHS, seed=1)])
+
+
+def test_compare_reports_only_call_increases():
+    baseline = [{"mode": "session", "managers": 50, "months": 1, "calls": 100},
+                {"mode": "staged", "managers": 50, "months": 1, "calls": 100}]
+    results = [{"mode": "session", "managers": 50, "months": 1, "calls": 104},
+               {"mode": "staged", "managers": 50, "months": 1, "calls": 90},
+               {"mode": "staged", "managers": 500, "months": 1, "calls": 900}]
+    assert compare(results, baseline, tolerance=0.05) == []
+    assert compare(results, baseline) == [{"mode": "session", "managers": 50, "months": 1,
+                                           "baseline": 100, "calls": 104}]
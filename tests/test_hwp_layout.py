@@ -0,0 +1,55 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import hwp_reader
+from batch import TEMPLATE_FILE
+from eroom import MetaData
+from hwp_backend import FakeHwpBackend
+from hwp_layout import LAYOUT_CACHE_FILE, TemplateLayout, file_hash, load_layout
+from write_hwp import HwpProcessor
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    path = tmp_path / TEMPLATE_FILE
+    shutil.copyfile(os.path.join(REPOSITORY_DIR, TEMPLATE_FILE), path)
+    return str(path)
+
+
+def _unreadable(file_path):
+    raise ValueError("읽을 수 없는 템플릿")
+
+
+def test_layout_is_built_once_and_cached_by_template_hash(template_path, monkeypatch):
+    layout = load_layout(template_path)
+    assert sorted(layout.cells) == list(range(1, 32))
+    cache_path = os.path.join(os.path.dirname(template_path), LAYOUT_CACHE_FILE)
+    with open(cache_path, encoding="utf-8") as file:
+        assert list(json.load(file)) == [file_hash(template_path)]
+
+    # 캐시가 있으면 템플릿을 다시 읽지 않음
+    monkeypatch.setattr(hwp_reader, "HwpDocument", _unreadable)
+    cached = load_layout(template_path)
+    assert cached.to_dict() == layout.to_dict()
+    assert cached.cells_read == 0
+
+
+def test_scan_through_the_document_matches_the_file_reader(template_path, tmp_path, monkeypatch):
+    expected = load_layout(template_path, cache_path=str(tmp_path / "reader.json"))
+    monkeypatch.setattr(hwp_reader, "HwpDocument", _unreadable)
+    backend = FakeHwpBackend()
+    meta_data = MetaData(str(tmp_path), TEMPLATE_FILE, "out.hwp", "2025-03")
+    processor = HwpProcessor(meta_data, backend, backend.create())
+    scanned = load_layout(template_path, processor, cache_path=str(tmp_path / "scan.json"))
+    assert scanned.ordered_cells() == expected.ordered_cells()
+    assert scanned.cells_read > 0
+
+
+def test_layout_round_trips_through_dict():
+    layout = TemplateLayout("0" * 64, {1: {"table": 0, "label": "%일1", "row": 1, "column": 0}})
+    assert TemplateLayout.from_dict(json.loads(json.dumps(layout.to_dict()))).to_dict() == layout.to_dict()
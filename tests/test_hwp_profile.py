@@ -0,0 +1,67 @@
+import json
+import os
+import shutil
+from collections import Counter
+
+import pytest
+
+from batch import TEMPLATE_FILE
+from hwp_backend import FakeHwpBackend, latency_key
+from hwp_benchmark import _documents, synthetic_roster
+from hwp_profile import PHASES, load_latency, percentile, summarize
+from write_hwp import HwpSession
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONTHS = [(2025, 3)]
+
+
+class RecordingBackend(FakeHwpBackend):
+    def create(self):
+        self.hwp = super().create()
+        return self.hwp
+
+
+@pytest.fixture
+def profiled(tmp_path):
+    shutil.copyfile(os.path.join(REPOSITORY_DIR, TEMPLATE_FILE), tmp_path / TEMPLATE_FILE)
+    profile_path = str(tmp_path / "profile.jsonl")
+    backend = RecordingBackend()
+    with HwpSession(backend, profile_path=profile_path) as session:
+        for meta_data, sc in _documents(synthetic_roster(3, MONTHS), MONTHS, str(tmp_path)):
+            assert session.process(meta_data, sc)
+    with open(profile_path, encoding="utf-8") as file:
+        reports = [json.loads(line) for line in file]
+    return profile_path, reports, backend.hwp, session
+
+
+def test_every_hwp_call_is_recorded_by_phase(profiled):
+    _, reports, hwp, session = profiled
+    assert [report["document"] for report in reports] == [
+        f"청년이룸출근부_2025년_3월_매니저{index:04d}.hwp" for index in (1, 2, 3)]
+    assert reports == session.reports
+    for report in reports:
+        assert set(report["phases"]) == set(PHASES)
+        assert report["total_calls"] == sum(phase["calls"] for phase in report["phases"].values())
+
+    recorded = Counter()
+    for report in reports:
+        recorded.update({key: entry["count"] for key, entry in report["calls"].items()})
+    # 문서 처리 밖의 호출(응답 확인용 Clear, 종료할 때의 Quit)은 보고서에 없음
+    made = Counter(latency_key(method, name) for method, name in hwp.calls)
+    made.subtract({"Clear": len(reports), "Quit": 1})
+    assert +made == recorded
+
+
+def test_reports_summarise_and_replay_as_latency(profiled):
+    profile_path, reports, _, _ = profiled
+    summary = summarize(reports)
+    assert summary["documents"] == 3
+    assert summary["total_p95"] >= summary["total_p50"] > 0
+    latency = load_latency(profile_path)
+    assert set(latency) == {key for report in reports for key in report["calls"]}
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([], 50) == 0.0
+    assert percentile([4, 1, 3, 2], 50) == 2
+    assert percentile([4, 1, 3, 2], 95) == 4
@@ -0,0 +1,63 @@
+import os
+import struct
+
+import pytest
+
+from batch import TEMPLATE_FILE
+from hwp_reader import OLE_SIGNATURE, REQUIRED_PLACEHOLDERS, HwpDocument, OleFile
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+END_OF_CHAIN = 0xFFFFFFFE
+FREE = 0xFFFFFFFF
+FAT_SECTOR = 0xFFFFFFFD
+
+
+def _entry(name, kind, child, start, size):
+    entry = bytearray(128)
+    encoded = (name + "\0").encode("utf-16-le")
+    entry[:len(encoded)] = encoded
+    struct.pack_into("<H", entry, 64, len(encoded))
+    entry[66] = kind
+    struct.pack_into("<3I", entry, 68, FREE, FREE, child)
+    struct.pack_into("<II", entry, 116, start, size)
+    return bytes(entry)
+
+
+def build_ole(payload, sector_shift):
+    """스트림 하나(Test)가 있는 복합 파일: 섹터 0은 FAT, 1은 디렉토리, 2부터 스트림"""
+    size = 1 << sector_shift
+    stream_sectors = -(-len(payload) // size)
+    header = bytearray(size)
+    header[:8] = OLE_SIGNATURE
+    struct.pack_into("<HHHH", header, 24, 0x3E, 3 if size == 512 else 4, 0xFFFE, sector_shift)
+    struct.pack_into("<H", header, 32, 6)
+    struct.pack_into("<II", header, 44, 1, 1)
+    struct.pack_into("<5I", header, 56, 4096, END_OF_CHAIN, 0, END_OF_CHAIN, 0)
+    struct.pack_into("<109I", header, 76, 0, *[FREE] * 108)
+    fat = [FAT_SECTOR, END_OF_CHAIN] + [sector + 1 for sector in range(2, 1 + stream_sectors)] + [END_OF_CHAIN]
+    fat += [FREE] * (size // 4 - len(fat))
+    directory = _entry("Root Entry", 5, 1, END_OF_CHAIN, 0) + _entry("Test", 2, FREE, 2, len(payload))
+    return (bytes(header) + struct.pack(f"<{size // 4}I", *fat) + directory.ljust(size, b"\0")
+            + payload.ljust(stream_sectors * size, b"\0"))
+
+
+@pytest.mark.parametrize("sector_shift", [9, 12])  # 버전 3(512바이트), 버전 4(4096바이트) 섹터
+def test_streams_are_read_for_both_sector_sizes(sector_shift):
+    payload = bytes(range(256)) * 20
+    ole = OleFile(build_ole(payload, sector_shift))
+    assert ole.sector_size == 1 << sector_shift
+    assert ole.listdir() == ["Test"]
+    assert ole.read("Test") == payload
+
+
+def test_rejects_files_that_are_not_ole():
+    with pytest.raises(ValueError):
+        OleFile(b"PK\x03\x04" + b"\0" * 600)
+
+
+def test_template_is_read_without_hangul():
+    document = HwpDocument(os.path.join(REPOSITORY_DIR, TEMPLATE_FILE))
+    assert document.validate() == []
+    assert sorted(document.day_cells()) == list(range(1, 32))
+    found = {token.lower() for token, _, _, _ in document.placeholders()}
+    assert {placeholder.lower() for placeholder in REQUIRED_PLACEHOLDERS} <= found
@@ -0,0 +1,87 @@
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from eroom import EroomManagerSchedule, MetaData
+from hwpx_engine import HwpxTemplate
+
+HP = "http://www.hancom.co.kr/hwpml/2011/paragraph"
+HH = "http://www.hancom.co.kr/hwpml/2011/head"
+HEADER = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes" ?>
+<hh:head xmlns:hh="{HH}"><hh:refList><hh:borderFills itemCnt="1">
+<hh:borderFill id="1"><hh:slash type="NONE"/></hh:borderFill>
+</hh:borderFills></hh:refList></hh:head>"""
+
+
+def _paragraph(*runs):
+    """runs: 글자 조각 목록, None은 탭"""
+    content = "".join("<hp:run><hp:tab/></hp:run>" if text is None else f"<hp:run><hp:t>{text}</hp:t></hp:run>"
+                      for text in runs)
+    return f"<hp:p>{content}</hp:p>"
+
+
+def _cell(col, row, text):
+    return (f'<hp:tc borderFillIDRef="1"><hp:subList>{_paragraph(text)}</hp:subList>'
+            f'<hp:cellAddr colAddr="{col}" rowAddr="{row}"/><hp:cellSpan rowSpan="1" colSpan="1"/></hp:tc>')
+
+
+def _section():
+    rows = [f"<hp:tr>{_cell(0, 0, '%일1')}{''.join(_cell(col, 0, '') for col in range(1, 6))}</hp:tr>"]
+    rows += [f"<hp:tr>{_cell(0, day, str(day))}{''.join(_cell(col, day, '') for col in range(1, 6))}</hp:tr>"
+             for day in range(1, 32)]
+    return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes" ?><hs:sec xmlns:hs="{HP}s" xmlns:hp="{HP}">'
+            + _paragraph("%Year년 %Month월 ", "%Na", "me")  # 서식이 바뀌어 이름이 두 run에 나뉨
+            + _paragraph("%Name", None, "%Endday일")
+            + f'<hp:p><hp:run><hp:tbl rowCnt="32" colCnt="6">{"".join(rows)}</hp:tbl></hp:run></hp:p></hs:sec>')
+
+
+@pytest.fixture
+def template(tmp_path):
+    path = tmp_path / "template.hwpx"
+    with zipfile.ZipFile(path, mode="w") as archive:
+        archive.writestr("mimetype", "application/hwp+zip")
+        archive.writestr("Contents/header.xml", HEADER)
+        archive.writestr("Contents/section0.xml", _section())
+    return HwpxTemplate(str(path))
+
+
+def render(template, tmp_path, target_date="2025-02"):
+    meta_data = MetaData(str(tmp_path), "template.hwpx", "out.hwpx", target_date)
+    data = template.render_bytes(meta_data, EroomManagerSchedule("홍길동", "2025-02-10", "2025-02-15"))
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return ET.fromstring(archive.read("Contents/section0.xml")), ET.fromstring(archive.read("Contents/header.xml"))
+
+
+def paragraph_texts(section):
+    return ["".join(node.text or "" for node in paragraph.iter(f"{{{HP}}}t"))
+            for paragraph in section.findall(f"{{{HP}}}p")]
+
+
+def test_placeholders_are_replaced_across_runs(template, tmp_path):
+    section, _ = render(template, tmp_path)
+    assert paragraph_texts(section)[:2] == ["2025년 2월 홍길동", "홍길동28일"]
+    runs = section.find(f"{{{HP}}}p").findall(f"{{{HP}}}run")
+    assert [run.find(f"{{{HP}}}t").text or "" for run in runs] == ["2025년 2월 ", "홍길동", ""]
+    # 탭 앞뒤의 글자는 하나로 이어 치환하지 않음
+    assert section.findall(f"{{{HP}}}p")[1].find(f".//{{{HP}}}tab") is not None
+
+
+def test_invalid_day_cells_are_deleted(template, tmp_path):
+    section, _ = render(template, tmp_path)
+    days = [int(cell.find(f".//{{{HP}}}t").text) for cell in section.iter(f"{{{HP}}}tc")
+            if cell.find(f"{{{HP}}}cellAddr").get("colAddr") == "0"
+            and (cell.find(f".//{{{HP}}}t").text or "").isdigit()]
+    assert days == list(range(1, 29))
+    # 지운 날짜의 오른쪽 칸은 남음
+    assert len(section.find(f".//{{{HP}}}tbl").findall(f"{{{HP}}}tr")[31]) == 5
+
+
+def test_day_off_rows_get_a_diagonal_border(template, tmp_path):
+    section, header = render(template, tmp_path)
+    fills = {fill.get("id"): fill for fill in header.iter(f"{{{HH}}}borderFill")}
+    diagonal = [row for row in section.find(f".//{{{HP}}}tbl").findall(f"{{{HP}}}tr")[1:]
+                if fills[row[1].get("borderFillIDRef")].find(f"{{{HH}}}slash").get("type") == "CENTER"]
+    marked = sorted(int(row[0].find(f".//{{{HP}}}t").text) for row in diagonal)
+    assert 10 in marked and 15 not in marked and 1 in marked  # 2월 1일은 토요일
@@ -0,0 +1,39 @@
+import threading
+
+import pytest
+
+from job_service import Job, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "eroom.db"), str(tmp_path), backend_name="fake")
+    # 작업자를 붙잡아 두어 들어온 작업이 대기 상태로 남게 함
+    release = threading.Event()
+    queue.executor.submit(release.wait)
+    yield queue
+    release.set()
+    queue.close()
+
+
+def test_same_month_written_differently_is_one_job(queue):
+    job, deduplicated = queue.submit({"target_date": "2025-03"})
+    again, deduplicated_again = queue.submit({"target_date": "2025-3"})
+    assert (deduplicated, deduplicated_again) == (False, True)
+    assert again is job
+    assert job.target_date == "2025-03"
+
+
+def test_rejected_and_duplicate_requests_do_not_use_job_ids(queue):
+    first, _ = queue.submit({"target_date": "2025-03"})
+    for payload in ({"target_date": 202503}, {"target_date": "2025-13"}, {"target_date": "2025-03", "engine": "pdf"}):
+        with pytest.raises(ValueError):
+            queue.submit(payload)
+    queue.submit({"target_date": "2025-03"})
+    second, _ = queue.submit({"target_date": "2025-04"})
+    assert (first.id, second.id) == (1, 2)
+    assert [job.id for job in queue.list()] == [1, 2]
+
+
+def test_job_key_ignores_name_order():
+    assert Job(None, "2025-03", ["박석진", "홍길동"]).key == Job(None, "2025-3", ["홍길동", "박석진"]).key
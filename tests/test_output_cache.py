@@ -0,0 +1,52 @@
+import os
+import shutil
+
+import pytest
+
+from batch import TEMPLATE_FILE, create_session, generate_roster
+from eroom import EroomManagerSchedule
+from hwp_backend import FakeHwpBackend
+from output_cache import CACHE_VERSION, OutputCache
+from worker_farm import WorkerFarm
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCHEDULES = [EroomManagerSchedule("홍길동", "2025-03-10", "2025-03-15")]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    shutil.copyfile(os.path.join(REPOSITORY_DIR, TEMPLATE_FILE), tmp_path / TEMPLATE_FILE)
+    return str(tmp_path)
+
+
+def run(directory, kind, **options):
+    cache = OutputCache(directory)
+    with create_session(kind, FakeHwpBackend(), **options) as session:
+        results = generate_roster(SCHEDULES, 2025, 3, directory, session=session, output_cache=cache)
+    assert all(ok for _, ok, _ in results)
+    return cache.to_dict()
+
+
+def test_same_session_reuses_documents(directory):
+    assert run(directory, "staged") == {"generated": 1, "reused": 0, "invalidated": 0}
+    assert run(directory, "staged") == {"generated": 0, "reused": 1, "invalidated": 0}
+
+
+@pytest.mark.parametrize("kind, options", [("hwp", {}), ("staged", {"use_fields": False})])
+def test_different_session_options_regenerate(directory, kind, options):
+    run(directory, "staged")
+    assert run(directory, kind, **options) == {"generated": 1, "reused": 0, "invalidated": 1}
+
+
+def test_farm_uses_the_same_options_as_its_sessions():
+    session = create_session("staged", FakeHwpBackend(), use_fields=False)
+    farm = WorkerFarm(2, "staged", "fake", session_kwargs={"use_fields": False})
+    assert farm.cache_options() == session.cache_options()
+    assert WorkerFarm(2, "hwpx").cache_options() == create_session("hwpx").cache_options()
+
+
+def test_stage_documents_are_versioned(directory):
+    run(directory, "staged")
+    stages = os.listdir(os.path.join(directory, ".eroom_stages"))
+    months = [name for name in stages if name.startswith("month_")]
+    assert months and all(name.startswith(f"month_v{CACHE_VERSION}_") for name in months)
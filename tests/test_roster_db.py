@@ -0,0 +1,101 @@
+import pytest
+
+from eroom import EroomManagerSchedule, MetaData
+from roster_db import SCHEMA_VERSION, RosterDatabase, open_database
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = RosterDatabase(str(tmp_path / "eroom.db"))
+    yield database
+    database.close()
+
+
+def month_dates(database, name, year_month):
+    """해당 월에 더해진 휴무일과 빠진 주말"""
+    year, month = map(int, year_month.split("-"))
+    schedule = next(schedule for schedule in database.schedules_for_month(year, month) if schedule.name == name)
+    meta = MetaData(".", "", "", year_month)
+    day_off, weekends = schedule.get_day_off(meta), meta.get_weekends()
+    return sorted(day_off - weekends), sorted(weekends - day_off)
+
+
+def test_rule_replaces_recorded_dates_from_its_anchor_month(database):
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-03-10", "2025-03-15"))
+    database.save_schedule(EroomManagerSchedule.rotating("홍길동", "2025-02-12", "2025-02-22"))
+
+    assert month_dates(database, "홍길동", "2025-02") == ([12], [22])
+    assert month_dates(database, "홍길동", "2025-03") == ([12], [22])
+    assert database.get_schedule("홍길동").duplicate_kinds("2025-03") == []
+
+
+def test_fields_round_trip(database):
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-02-10", "2025-02-15",
+                                                fields={"Department": "운영팀", "Center": "강남"}))
+    assert database.get_schedule("홍길동").fields == {"Department": "운영팀", "Center": "강남"}
+    assert database.list_schedules()[0].fields == {"Department": "운영팀", "Center": "강남"}
+
+
+def test_saving_without_fields_keeps_stored_fields(database):
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-02-10", "2025-02-15", fields={"Department": "운영팀"}))
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-02-11", "2025-02-15", fields={"Center": "강남"}))
+    assert database.get_schedule("홍길동").fields == {"Department": "운영팀", "Center": "강남"}
+
+
+def test_upgrade_fills_fields_from_the_original_csv(tmp_path):
+    users = tmp_path / "user_data.txt"
+    users.write_text("이름,대체 휴무 날짜,토요일 근무 날짜,Department\n"
+                     "홍길동,2025-02-10,2025-02-15,운영팀\n"
+                     "박석진,2025-02-11,2025-02-22,상담팀\n", encoding="utf-8")
+    db_path = str(tmp_path / "eroom.db")
+    # 추가 항목을 저장하지 않던 때(버전 1)의 데이터베이스
+    database = RosterDatabase(db_path)
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-02-10", "2025-02-15"))
+    database.connection.execute("DELETE FROM fields")
+    database.connection.execute("PRAGMA user_version = 1")
+    database.connection.commit()
+    database.close()
+
+    database = open_database(db_path, str(users), str(tmp_path / "holiday_data.txt"))
+    try:
+        assert database.connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert [(schedule.name, schedule.fields) for schedule in database.list_schedules()] == \
+            [("홍길동", {"Department": "운영팀"})]
+        assert database.get_schedule("홍길동").rules == []  # 버전 1 전환은 다시 하지 않음
+    finally:
+        database.close()
+
+
+def test_new_database_imports_csv_fields(tmp_path):
+    users = tmp_path / "user_data.txt"
+    users.write_text("이름,대체 휴무 날짜,토요일 근무 날짜,Department\n홍길동,2025-02-10,2025-02-15,운영팀\n",
+                     encoding="utf-8")
+    database = open_database(str(tmp_path / "eroom.db"), str(users), str(tmp_path / "holiday_data.txt"))
+    try:
+        schedule = database.get_schedule("홍길동")
+        assert schedule.fields == {"Department": "운영팀"}
+        assert len(schedule.rules) == 2
+    finally:
+        database.close()
+
+
+def test_saving_a_new_month_keeps_the_previous_month(database):
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-03-12", "2025-03-15"))
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-04-09", "2025-04-12"))
+    assert month_dates(database, "홍길동", "2025-03") == ([12], [15])
+    assert month_dates(database, "홍길동", "2025-04") == ([9], [12])
+
+
+def test_saving_the_same_month_replaces_its_dates(database):
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-03-12", "2025-03-15"))
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-03-13", "2025-03-22"))
+    assert month_dates(database, "홍길동", "2025-03") == ([13], [22])
+    assert [override.date for override in database.overrides_in_month(2025, 3)["홍길동"]] == ["2025-03-13", "2025-03-22"]
+
+
+def test_shift_all_records_the_previous_dates(database):
+    database.save_schedule(EroomManagerSchedule("홍길동", "2025-03-26", "2025-03-29"))
+    database.shift_all(14)
+    assert database.get_schedule("홍길동").substitute_holiday == "2025-04-09"
+    assert month_dates(database, "홍길동", "2025-03") == ([26], [29])
+    assert month_dates(database, "홍길동", "2025-04") == ([9], [12])
@@ -0,0 +1,60 @@
+from roster_db import RosterDatabase
+from roster_import import import_roster, main
+
+ROSTER = (
+    "이름,대체 휴무 날짜,토요일 근무 날짜\n"
+    "홍길동,2025-02-10,2025-02-15\n"
+    "김단아,2025-02-11,2025-02-22\n"
+    "홍길동,2025-02-12,2025-02-08\n"
+)
+
+
+def test_duplicate_names_keep_the_last_row(tmp_path):
+    roster = tmp_path / "roster.csv"
+    roster.write_text(ROSTER, encoding="utf-8")
+    database = RosterDatabase(str(tmp_path / "eroom.db"))
+    try:
+        report = import_roster(str(roster), database)
+        schedules = {schedule.name: schedule for schedule in database.list_schedules()}
+    finally:
+        database.close()
+
+    assert (report.rows, report.imported, report.errors) == (3, 3, 0)
+    assert sorted(schedules) == ["김단아", "홍길동"]
+    hong = schedules["홍길동"]
+    assert (hong.substitute_holiday, hong.saturday_workday) == ("2025-02-12", "2025-02-08")
+    assert sorted(rule.to_dict()["anchor"] for rule in hong.rules) == ["2025-02-08", "2025-02-12"]
+
+
+def test_duplicate_names_across_batches(tmp_path):
+    roster = tmp_path / "roster.csv"
+    roster.write_text(ROSTER, encoding="utf-8")
+    database = RosterDatabase(str(tmp_path / "eroom.db"))
+    try:
+        import_roster(str(roster), database, batch_size=1)
+        hong = database.get_schedule("홍길동")
+    finally:
+        database.close()
+    assert hong.substitute_holiday == "2025-02-12"
+
+
+def test_cli_reports_invalid_rows(tmp_path):
+    roster = tmp_path / "roster.csv"
+    roster.write_text(ROSTER + "박석진,2025-13-01,2025-02-15\n", encoding="utf-8")
+    report = tmp_path / "errors.csv"
+    assert main([str(roster), "--db", str(tmp_path / "eroom.db"), "--report", str(report)]) == 1
+    lines = report.read_text(encoding="utf-8-sig").splitlines()
+    assert len(lines) == 2 and lines[1].startswith("5,박석진,대체 휴무 날짜,")
+
+
+def test_delimiter_is_detected_from_the_header_line(tmp_path):
+    # 인사 시스템에서 내보낸 파일은 확장자와 관계없이 탭으로 구분되기도 함
+    roster = tmp_path / "export.csv"
+    roster.write_text("name\tsubstitute_holiday\tsaturday_workday\n홍길동\t2025-02-10\t2025-02-15\n",
+                      encoding="utf-8")
+    database = RosterDatabase(str(tmp_path / "eroom.db"))
+    try:
+        assert import_roster(str(roster), database).imported == 1
+        assert database.get_schedule("홍길동").substitute_holiday == "2025-02-10"
+    finally:
+        database.close()
@@ -0,0 +1,38 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from eroom import EroomManagerSchedule  # noqa: E402
+from roster_model import ScheduleTableModel  # noqa: E402
+
+
+class CountingSchedule(EroomManagerSchedule):
+    calls = 0
+
+    def get_overrides(self, year_month=None):
+        CountingSchedule.calls += 1
+        return super().get_overrides(year_month)
+
+
+def test_month_dates_are_computed_once_per_month():
+    CountingSchedule.calls = 0
+    model = ScheduleTableModel([CountingSchedule.rotating("홍길동", "2025-02-10", "2025-02-15")])
+    model.set_year_month("2025-03")
+    for _ in range(3):
+        texts = [model.index(0, column).data() for column in (1, 2)]
+    assert texts == ["2025-03-10", "2025-03-15"]
+    assert CountingSchedule.calls == 2
+
+    model.set_year_month("2025-04")
+    assert model.index(0, 1).data() == "2025-04-07"
+    assert CountingSchedule.calls == 4
+
+
+def test_updated_schedule_is_recomputed():
+    model = ScheduleTableModel([EroomManagerSchedule("홍길동", "2025-03-10", "2025-03-15")])
+    model.set_year_month("2025-03")
+    assert model.index(0, 1).data() == "2025-03-10"
+    model.upsert(EroomManagerSchedule("홍길동", "2025-03-11", "2025-03-15"))
+    assert model.index(0, 1).data() == "2025-03-11"
+    model.reset([EroomManagerSchedule("홍길동", "2025-03-12", "2025-03-15")])
+    assert model.index(0, 1).data() == "2025-03-12"
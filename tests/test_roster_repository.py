@@ -0,0 +1,29 @@
+import pytest
+
+from eroom import PublicHoliday
+from roster_repository import RosterRepository
+
+
+@pytest.fixture
+def repository(tmp_path):
+    holidays = tmp_path / "holiday_data.txt"
+    holidays.write_text("2025-03-01\n", encoding="utf-8")
+    repository = RosterRepository(str(tmp_path / "eroom.db"), str(tmp_path / "user_data.txt"), str(holidays))
+    yield repository
+    repository.close()
+
+
+def test_added_holiday_does_not_change_a_calendar_already_handed_out(repository):
+    calendar = repository.holiday_calendar()
+    assert calendar.month_holidays(2025, 3) == {1}
+
+    assert repository.add_holiday(PublicHoliday("2025-03-03"))
+    assert calendar.month_holidays(2025, 3) == {1}
+    assert repository.holiday_calendar().month_holidays(2025, 3) == {1, 3}
+
+
+def test_holiday_calendar_is_reused_until_holidays_change(repository):
+    calendar = repository.holiday_calendar()
+    assert repository.holiday_calendar() is calendar
+    assert not repository.add_holiday(PublicHoliday("2025-03-01"))
+    assert repository.holiday_calendar() is calendar
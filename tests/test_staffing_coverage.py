@@ -0,0 +1,53 @@
+import pytest
+
+from eroom import EroomManagerSchedule, PublicHoliday, RecurrenceRule, ScheduleOverride
+from holiday_calendar import HolidayCalendar
+from staffing_coverage import DayOffMatrix
+
+MONTHS = [(2025, month) for month in range(1, 13)] + [(2026, 1)]
+
+
+@pytest.fixture
+def schedules():
+    rotating = EroomManagerSchedule("홍길동", "2025-02-10", "2025-02-15", rules=[
+        RecurrenceRule(ScheduleOverride.DAY_OFF, "2025-02-10", 4, exceptions=["2025-05-05"]),
+        RecurrenceRule(ScheduleOverride.WORKDAY, "2025-02-15", 2, exceptions=["2025-03-01"]),
+    ])
+    recorded = EroomManagerSchedule("김철수", "2025-04-09", "2025-04-12", overrides=[
+        ScheduleOverride("2025-03-12", ScheduleOverride.DAY_OFF),
+        ScheduleOverride("2025-03-15", ScheduleOverride.WORKDAY),
+        ScheduleOverride("2024-12-14", ScheduleOverride.WORKDAY),
+    ])
+    return [rotating, recorded, EroomManagerSchedule("이영희", "", "")]
+
+
+@pytest.fixture
+def holiday_calendar():
+    return HolidayCalendar([PublicHoliday("2025-03-03"), PublicHoliday("2025-05-05")])
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_matrix_matches_holiday_calendar(schedules, holiday_calendar, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    matrix = DayOffMatrix.build(schedules, MONTHS, holiday_calendar, use_numpy=use_numpy)
+    assert matrix.uses_numpy == use_numpy
+    for schedule in schedules:
+        for year, month in MONTHS:
+            assert matrix.days_off(schedule.name, year, month) == holiday_calendar.days_off(schedule, year, month)
+
+
+def test_numpy_and_python_reports_are_equal(schedules, holiday_calendar):
+    pytest.importorskip("numpy")
+    fast = DayOffMatrix.build(schedules, MONTHS, holiday_calendar)
+    slow = DayOffMatrix.build(schedules, MONTHS, holiday_calendar, use_numpy=False)
+    assert fast.report(minimum=3, saturday_limit=0) == slow.report(minimum=3, saturday_limit=0)
+
+
+def test_report_lists_understaffed_days_and_saturday_collisions():
+    schedules = [EroomManagerSchedule("홍길동", "2025-03-12", "2025-03-15"),
+                 EroomManagerSchedule("김철수", "2025-03-13", "2025-03-15")]
+    report = DayOffMatrix.build(schedules, [(2025, 3)], use_numpy=False).report(minimum=2)["2025-03"]
+    assert report["on_duty"][12] == 1 and report["on_duty"][15] == 2 and report["on_duty"][16] == 0
+    assert report["understaffed"] == [12, 13]
+    assert report["saturday_collisions"] == {15: ["홍길동", "김철수"]}
@@ -0,0 +1,20 @@
+import os
+
+from roster_db import DEFAULT_DB_FILE, RosterDatabase
+from startup_benchmark import _prepare_roster, measure_imports
+
+
+def test_batch_import_defers_document_engines():
+    result = measure_imports(["eroom", "batch"], runs=1)
+    for module in ("eroom", "batch"):
+        assert result[module]["error"] is None
+        assert result[module]["loaded"] == []
+
+
+def test_benchmark_roster_is_created_in_the_given_directory(tmp_path):
+    _prepare_roster(str(tmp_path), 7)
+    database = RosterDatabase(os.path.join(str(tmp_path), DEFAULT_DB_FILE))
+    try:
+        assert len(database.list_schedules()) == 7
+    finally:
+        database.close()
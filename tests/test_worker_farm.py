@@ -0,0 +1,49 @@
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from batch import TEMPLATE_FILE
+from eroom import EroomManagerSchedule
+from worker_farm import WorkerFarm, iter_roster_parallel
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NAMES = ["홍길동", "김단아", "박석진", "이서윤", "최민준"]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    shutil.copyfile(os.path.join(REPOSITORY_DIR, TEMPLATE_FILE), tmp_path / TEMPLATE_FILE)
+    return str(tmp_path)
+
+
+def test_farm_recycles_workers_and_collects_profiles(directory):
+    schedules = [EroomManagerSchedule(name, "2025-03-10", "2025-03-15") for name in NAMES]
+    profile_path = os.path.join(directory, "profile.jsonl")
+    with WorkerFarm(2, "staged", "fake", max_documents=2, timeout=60, profile_path=profile_path) as farm:
+        results = list(iter_roster_parallel(schedules, 2025, 3, farm, directory))
+
+    assert [(name, ok) for name, ok, _ in results] == [(name, True) for name in NAMES]
+    summary = farm.to_dict()
+    assert (summary["succeeded"], summary["failed"], summary["timeouts"]) == (5, 0, 0)
+    assert summary["recycled"] == 2  # 2건씩 처리한 작업자 둘만 교체
+    with open(profile_path, encoding="utf-8") as file:
+        reports = [json.loads(line) for line in file]
+    assert sorted(report["document"] for report in reports) == sorted(
+        f"청년이룸출근부_2025년_3월_{name}.hwp" for name in NAMES)
+    assert len(farm.reports) == 5
+
+
+def test_timed_out_worker_is_not_counted_as_recycled(tmp_path):
+    farm = WorkerFarm(1, "staged", "fake", max_documents=1)
+    try:
+        worker = farm._spawn()
+        worker.job = (0, "홍길동", time.perf_counter(), str(tmp_path))
+        # run()의 시간 초과 처리와 같은 순서: 강제 종료한 뒤 실패로 기록
+        farm._retire(worker, kill=True)
+        farm._finish(worker, [None], 0, "홍길동", False, 1.0)
+    finally:
+        farm.close()
+    assert (farm.failed, farm.recycled, farm.pool) == (1, 0, [])
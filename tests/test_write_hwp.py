@@ -0,0 +1,192 @@
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import pytest
+
+from batch import TEMPLATE_FILE
+from eroom import EroomManagerSchedule, MetaData, generate_replace_dict
+from hwp_backend import DEFAULT_TEXTS, FakeHwpBackend, FakeHwpObject
+from hwp_benchmark import _documents, synthetic_roster
+from hwp_layout import DAY_LABELS, DAY_SPAN
+from write_hwp import HwpSession, StagedHwpSession
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MONTHS = [(2025, 3)]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    shutil.copyfile(os.path.join(REPOSITORY_DIR, TEMPLATE_FILE), tmp_path / TEMPLATE_FILE)
+    return str(tmp_path)
+
+
+class CountingBackend(FakeHwpBackend):
+    def __init__(self):
+        super().__init__()
+        self.created = []
+
+    def create(self):
+        hwp = super().create()
+        self.created.append(hwp)
+        return hwp
+
+
+def documents(directory, size=5):
+    return list(_documents(synthetic_roster(size, MONTHS), MONTHS, directory))
+
+
+def test_one_instance_serves_the_whole_roster(directory):
+    backend = CountingBackend()
+    with HwpSession(backend) as session:
+        assert all(session.process(meta_data, sc) for meta_data, sc in documents(directory))
+    assert len(backend.created) == 1
+    assert [method for method, _ in backend.created[0].calls].count("Quit") == 1
+    assert len([name for name in os.listdir(directory) if name.endswith(".hwp")]) == 6  # 템플릿 + 5건
+
+
+def test_instance_is_replaced_after_max_documents(directory):
+    backend = CountingBackend()
+    with HwpSession(backend, max_documents=2) as session:
+        assert all(session.process(meta_data, sc) for meta_data, sc in documents(directory))
+    assert len(backend.created) == 3
+
+
+class _HangingObject(FakeHwpObject):
+    """한 번은 대화 상자에 멈춘 것처럼 프로세스가 종료될 때까지 SaveAs가 돌아오지 않는 객체"""
+    hung = False
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+
+    def _check(self):
+        if self.child.poll() is not None:
+            raise RuntimeError("RPC 서버를 사용할 수 없습니다")
+
+    def SaveAs(self, path, *args):
+        if not _HangingObject.hung:
+            _HangingObject.hung = True
+            while self.child.poll() is None:
+                time.sleep(0.05)
+        self._check()
+        return super().SaveAs(path, *args)
+
+    def Clear(self, option=None):
+        self._check()
+        return super().Clear(option)
+
+    def Quit(self):
+        self._check()
+        self.child.terminate()
+        self.child.wait()
+
+
+class _HangingBackend(FakeHwpBackend):
+    def create(self):
+        return _HangingObject(self.day_columns, self.documents, self.latency)
+
+    def process_id(self, hwp):
+        return hwp.child.pid
+
+
+def test_watchdog_kills_a_hung_instance_and_retries(directory):
+    _HangingObject.hung = False
+    with HwpSession(_HangingBackend(), document_timeout=1) as session:
+        results = [session.process(meta_data, sc) for meta_data, sc in documents(directory, 3)]
+    assert results == [True, True, True]
+    assert (session.timeouts, session.restarts) == (1, 1)
+
+
+def _marked_document(directory, sc, target_date):
+    meta_data = MetaData(directory, TEMPLATE_FILE, "out.hwp", target_date)
+    session = HwpSession(FakeHwpBackend(), use_fields=False)
+    with session:
+        assert session.process(meta_data, sc)
+        return meta_data, session.layout, session.hwp
+
+
+def _blocks(rows):
+    """연속된 행 묶음 수"""
+    rows = sorted(rows)
+    return sum(1 for index, row in enumerate(rows) if index == 0 or rows[index - 1] != row - 1)
+
+
+def test_day_cells_are_marked_and_removed_in_one_pass(directory):
+    sc = EroomManagerSchedule("홍길동", "2025-02-12", "2025-02-15")
+    meta_data, layout, hwp = _marked_document(directory, sc, "2025-02")
+    day_off = sc.get_day_off(meta_data)
+
+    cells = {day: (cell["label"], cell["row"]) for day, cell in layout.cells.items()}
+    assert hwp.diagonals == {(*cells[day], col) for day in day_off for col in range(1, DAY_SPAN + 1)}
+    assert hwp.deleted == {(*cells[day], 0) for day in (29, 30, 31)}
+    # 날짜 열마다 머리글을 한 번만 찾음 (나머지는 자리 표시자 치환)
+    finds = [name for method, name in hwp.calls if method == "Execute" and name == "RepeatFind"]
+    assert len(finds) <= len(DAY_LABELS) + len(DEFAULT_TEXTS)
+
+
+def test_consecutive_day_off_rows_share_one_diagonal_block(directory):
+    # 2025-03-08(토)~09(일)과 10일 대체 휴무가 이어지므로 한 블록
+    sc = EroomManagerSchedule("홍길동", "2025-03-10", "2025-03-15")
+    meta_data, layout, hwp = _marked_document(directory, sc, "2025-03")
+    rows = {label: [] for label in DAY_LABELS}
+    for day in sc.get_day_off(meta_data):
+        rows[layout.cells[day]["label"]].append(layout.cells[day]["row"])
+
+    diagonal_runs = [name for _, name in hwp.calls if name == "TableCellBorderDiagonalUp"]
+    assert len(diagonal_runs) == sum(_blocks(label_rows) for label_rows in rows.values())
+    assert len(diagonal_runs) < len(sc.get_day_off(meta_data))
+
+
+def saved_fields(backend, meta_data):
+    """백엔드가 기억하는 출력 문서의 필드 값"""
+    texts, fields = backend.documents[FakeHwpObject._document_key(
+        os.path.join(meta_data.default_file_path, meta_data.output_file_name))]
+    return dict(fields)
+
+
+def test_staged_session_builds_month_and_patterns_once(directory):
+    backend = FakeHwpBackend()
+    roster = documents(directory, size=8)
+    patterns = {frozenset(sc.get_day_off(meta_data)) for meta_data, sc in roster}
+    with StagedHwpSession(backend) as session:
+        assert all(session.process(meta_data, sc) for meta_data, sc in roster)
+        assert session.stages_built == {"month": 1, "pattern": len(patterns)}
+    for meta_data, sc in roster:
+        assert saved_fields(backend, meta_data)["Name"] == sc.name
+
+    with StagedHwpSession(backend) as session:
+        assert all(session.process(meta_data, sc) for meta_data, sc in roster)
+        assert session.stages_built == {"month": 0, "pattern": 0}
+
+
+def document_calls(session, meta_data, sc):
+    """문서 한 건을 만드는 동안의 HWP 호출 (method, name) 목록"""
+    if session.hwp is None:
+        session.start()
+    hwp = session.hwp
+    start = len(hwp.calls)
+    assert session.process(meta_data, sc)
+    return hwp.calls[start:]
+
+
+@pytest.mark.parametrize("use_fields", [True, False])
+def test_placeholders_are_filled_through_fields(directory, use_fields):
+    backend = FakeHwpBackend()
+    roster = documents(directory, size=3)
+    with HwpSession(backend, use_fields=use_fields) as session:
+        document_calls(session, *roster[0])  # 첫 문서에서 필드 템플릿을 만듦
+        calls = [method_name for meta_data, sc in roster[1:] for method_name in document_calls(session, meta_data, sc)]
+    methods = [method for method, _ in calls]
+    replaced = calls.count(("Execute", "AllReplace")) // (len(roster) - 1)
+    if use_fields:
+        # 날짜 열 머리글은 셀을 찾는 데 쓰므로 필드로 바꾸지 않고 찾아 바꾸기로 남음
+        assert methods.count("PutFieldText") == len(roster) - 1
+        assert replaced == len(DAY_LABELS)
+        for meta_data, sc in roster:
+            assert saved_fields(backend, meta_data)["Name"] == sc.name
+    else:
+        assert "PutFieldText" not in methods
+        assert replaced == len(generate_replace_dict(*roster[0]))
@@ -0,0 +1,306 @@
+import json
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from batch import TEMPLATE_FILE, _cache_key, _check_overrides, build_meta_data, create_session
+from hwp_backend import HwpBackend, get_backend, kill_process
+from write_hwp import STAGE_DIR, release_locks
+
+DEFAULT_TIMEOUT = 120.0  # 문서 한 건을 기다릴 최대 시간(초), 넘으면 작업자 프로세스를 강제로 종료
+DEFAULT_MAX_DOCUMENTS = 50  # 작업자 프로세스 하나로 처리할 최대 문서 수
+SHUTDOWN_TIMEOUT = 10.0  # 작업자에게 종료를 요청한 뒤 기다릴 시간(초)
+
+
+def _initialize_com():
+    """작업자 프로세스에서 COM을 초기화 (pywin32가 없으면 건너뜀)"""
+    try:
+        import pythoncom
+    except ImportError:
+        return False
+    pythoncom.CoInitialize()
+    return True
+
+
+class _TrackedBackend(HwpBackend):
+    """만든 한글 오피스 인스턴스의 프로세스 ID를 부모 프로세스와 나눠 쓰는 값(hwp_pid)에 적어 두는 백엔드"""
+
+    def __init__(self, backend, hwp_pid):
+        self.backend = backend
+        self.hwp_pid = hwp_pid
+        self.name = backend.name
+
+    def create(self):
+        hwp = self.backend.create()
+        self.hwp_pid.value = self.backend.process_id(hwp) or 0
+        return hwp
+
+    def process_id(self, hwp):
+        return self.backend.process_id(hwp)
+
+
+def _worker_main(connection, hwp_pid, session_kind, backend_name, session_kwargs):
+    """
+    작업자 프로세스: 세션(한글 오피스 인스턴스)을 하나 만들어 종료 요청(None)을 받을 때까지 문서를 처리
+
+    받는 작업: (순번, MetaData, EroomManagerSchedule),
+    보내는 결과: (순번, 성공 여부, 소요 시간(초), 호출 보고서(HwpProfiler.to_dict 결과, 기록하지 않으면 None))
+    세션이 한글 오피스 인스턴스를 새로 만들 때마다 그 프로세스 ID를 hwp_pid에 적는다.
+    """
+    com_initialized = _initialize_com()
+    args = () if session_kind == "hwpx" else (_TrackedBackend(get_backend(backend_name), hwp_pid),)
+    session = create_session(session_kind, *args, **session_kwargs)
+    try:
+        while True:
+            job = connection.recv()
+            if job is None:
+                break
+            index, meta_data, sc = job
+            started = time.perf_counter()
+            try:
+                ok = session.process(meta_data, sc)
+            except Exception as e:
+                print(f"오류 발생: {e}")
+                ok = False
+            reports = getattr(session, "reports", None)
+            connection.send((index, ok, time.perf_counter() - started, reports.pop() if reports else None))
+    finally:
+        session.close()
+        if com_initialized:
+            import pythoncom
+            pythoncom.CoUninitialize()
+
+
+class _Worker:
+    def __init__(self, process, connection, hwp_pid):
+        self.process = process
+        self.connection = connection
+        self.hwp_pid = hwp_pid  # 작업자가 구동 중인 한글 오피스의 프로세스 ID (없으면 0)
+        self.documents = 0  # 이 프로세스로 처리한 문서 수
+        self.job = None  # 처리 중인 (순번, 매니저 이름, 시작 시각, 중간 문서 디렉토리)
+
+    def __repr__(self):
+        return f"_Worker(pid={self.process.pid}, documents={self.documents}, busy={self.job is not None})"
+
+
+class WorkerFarm:
+    def __init__(self, workers=None, session_kind="hwp", backend_name="com", max_documents=DEFAULT_MAX_DOCUMENTS,
+                 timeout=DEFAULT_TIMEOUT, session_kwargs=None, profile_path=None):
+        """
+        여러 작업자 프로세스에 문서를 나누어 생성하는 실행기
+
+        작업자마다 자기 백엔드와 세션을 가지며 문서를 한 건씩 받는다.
+        문서 한 건이 timeout을 넘기면(한글 오피스 대화 상자에 멈춘 경우 등) 그 작업자와 작업자가 구동하던
+        한글 오피스 프로세스를 강제로 종료하고 실패로 기록한다. 작업자가 중간 문서를 만들다 남긴 잠금도 푼다.
+        작업자는 max_documents건을 처리했거나 실패한 뒤에는 새 프로세스로 교체한다.
+
+        :param workers: 작업자 프로세스 수 (기본값: CPU 수)
+        :param session_kind: 작업자가 만들 세션 종류 (batch.SESSIONS의 키)
+        :param backend_name: hwp/staged 세션의 문서 엔진 백엔드 이름 (hwp_backend.BACKENDS의 키)
+        :param max_documents: 작업자 하나로 처리할 최대 문서 수 (None이면 실패할 때까지 계속 사용)
+        :param timeout: 문서 한 건을 기다릴 최대 시간(초)
+        :param session_kwargs: 세션 생성자에 넘길 추가 인수 (예: {"use_fields": False})
+        :param profile_path: hwp/staged 세션의 문서별 HWP 호출 보고서(JSON Lines)를 저장할 파일
+                             (작업자는 보고서를 결과와 함께 보내고 이 프로세스에서만 파일에 씀)
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.session_kind = session_kind
+        self.backend_name = backend_name
+        self.max_documents = max_documents
+        self.timeout = timeout
+        self.session_kwargs = dict(session_kwargs or {})
+        self.profile_path = profile_path
+        if profile_path and session_kind != "hwpx":
+            # 작업자 세션은 보고서를 만들기만 하고 파일에는 쓰지 않음 (여러 프로세스가 한 파일에 쓰지 않도록)
+            self.session_kwargs["profile_path"] = os.devnull
+        self.reports = []  # 작업자에게서 받은 호출 보고서
+        self.context = multiprocessing.get_context("spawn")  # COM은 fork한 프로세스에서 쓸 수 없음
+        self.pool = []  # 살아 있는 _Worker
+        self.succeeded = 0
+        self.failed = 0
+        self.timeouts = 0  # 시간 초과로 강제 종료한 문서 수
+        self.started = 0  # 시작한 작업자 프로세스 수
+        self.recycled = 0  # 문서 수나 실패 때문에 교체한 작업자 수
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return f"WorkerFarm(workers={self.workers}, session_kind={self.session_kind}, alive={len(self.pool)})"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def to_dict(self):
+        """실행 요약을 딕셔너리 형태로 변환"""
+        return {
+            "workers": self.workers,
+            "documents": self.succeeded + self.failed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "started": self.started,
+            "recycled": self.recycled,
+            "seconds": self.seconds
+        }
+
+    def cache_options(self):
+        """출력 캐시 키에 넣을 세션 설정 (작업자가 만드는 세션과 같은 세션을 직접 쓴 경우와 같은 값)"""
+        if self.session_kind == "hwpx":
+            return {"session": self.session_kind}
+        return {"session": self.session_kind, "backend": self.backend_name,
+                "use_fields": self.session_kwargs.get("use_fields", True)}
+
+    def close(self):
+        """모든 작업자에게 종료를 요청 (응답이 없으면 강제로 종료)"""
+        for worker in list(self.pool):
+            self._retire(worker, kill=worker.job is not None)
+
+    def _spawn(self):
+        parent_connection, child_connection = self.context.Pipe()
+        hwp_pid = self.context.Value("q", 0, lock=False)
+        process = self.context.Process(target=_worker_main, daemon=True,
+                                       args=(child_connection, hwp_pid, self.session_kind, self.backend_name,
+                                             self.session_kwargs))
+        process.start()
+        child_connection.close()
+        worker = _Worker(process, parent_connection, hwp_pid)
+        self.pool.append(worker)
+        self.started += 1
+        return worker
+
+    def _retire(self, worker, kill=False):
+        """작업자를 종료하고 목록에서 뺌"""
+        self.pool.remove(worker)
+        if not kill:
+            try:
+                worker.connection.send(None)
+            except (OSError, ValueError):
+                kill = True
+            else:
+                worker.process.join(SHUTDOWN_TIMEOUT)
+        if kill or worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join()
+            # 작업자를 강제로 종료하면 세션을 닫지 못하므로 한글 오피스와 잠금을 여기서 정리
+            if worker.hwp_pid.value:
+                kill_process(worker.hwp_pid.value)
+            if worker.job is not None:
+                release_locks(worker.job[3], worker.process.pid)
+        worker.connection.close()
+
+    def _record(self, report):
+        """작업자가 보낸 호출 보고서를 모으고 profile_path에 한 줄로 추가"""
+        self.reports.append(report)
+        with open(self.profile_path, mode='a', encoding='utf-8') as file:
+            file.write(json.dumps(report, ensure_ascii=False) + "\n")
+
+    def _finish(self, worker, results, index, name, ok, elapsed):
+        results[index] = (name, ok, elapsed)
+        worker.documents += 1
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        if not ok or (self.max_documents and worker.documents >= self.max_documents):
+            if worker in self.pool:  # 시간 초과로 이미 강제 종료한 작업자는 제외 (timeouts로 셈)
+                self._retire(worker)  # 실패했으면 한글 오피스 상태를 믿을 수 없으므로 새 프로세스로 교체
+                self.recycled += 1
+        worker.job = None
+
+    def run(self, documents):
+        """
+        문서를 작업자들에게 나누어 생성하고 결과를 documents 순서대로 내보내는 제너레이터
+
+        :param documents: (MetaData, EroomManagerSchedule) 목록
+        :return: (매니저 이름, 성공 여부, 소요 시간(초))를 차례로 생성
+        """
+        documents = list(documents)
+        results = [None] * len(documents)
+        pending = deque(range(len(documents)))
+        next_index = 0
+        started = time.perf_counter()
+        try:
+            while next_index < len(documents):
+                # 쉬고 있는 작업자에게 다음 문서를 보냄 (모자라면 새로 시작)
+                while pending:
+                    idle = [worker for worker in self.pool if worker.job is None]
+                    if not idle and len(self.pool) >= self.workers:
+                        break
+                    worker = idle[0] if idle else self._spawn()
+                    index = pending.popleft()
+                    meta_data, sc = documents[index]
+                    stage_dir = self.session_kwargs.get("stage_dir") or os.path.join(meta_data.default_file_path,
+                                                                                     STAGE_DIR)
+                    worker.job = (index, sc.name, time.perf_counter(), stage_dir)
+                    worker.connection.send((index, meta_data, sc))
+
+                busy = [worker for worker in self.pool if worker.job is not None]
+                if busy:
+                    deadline = min(worker.job[2] for worker in busy) + self.timeout
+                    ready = wait([worker.connection for worker in busy], max(deadline - time.perf_counter(), 0))
+                    for worker in busy:
+                        if worker.connection not in ready:
+                            continue
+                        index, name, job_started, _ = worker.job
+                        try:
+                            _, ok, elapsed, report = worker.connection.recv()
+                        except (EOFError, OSError):  # 작업자 프로세스가 비정상 종료됨
+                            print(f"작업자 프로세스가 종료되었습니다: {name}")
+                            ok, elapsed, report = False, time.perf_counter() - job_started, None
+                        if report is not None and self.profile_path:
+                            self._record(report)
+                        self._finish(worker, results, index, name, ok, elapsed)
+
+                    now = time.perf_counter()
+                    for worker in [worker for worker in self.pool if worker.job is not None]:
+                        index, name, job_started, _ = worker.job
+                        if now - job_started > self.timeout:
+                            print(f"시간 초과로 작업자를 종료합니다: {name} ({self.timeout:.0f}초)")
+                            self.timeouts += 1
+                            self._retire(worker, kill=True)
+                            self._finish(worker, results, index, name, False, now - job_started)
+
+                while next_index < len(documents) and results[next_index] is not None:
+                    yield results[next_index]
+                    next_index += 1
+        finally:
+            # 중간에 반복을 멈췄으면 처리 중인 작업자는 결과를 기다리지 않고 종료
+            for worker in [worker for worker in self.pool if worker.job is not None]:
+                self._retire(worker, kill=True)
+            self.seconds += time.perf_counter() - started
+
+
+def iter_roster_parallel(schedules, year, month, farm: WorkerFarm, default_file_path=None, input_file=TEMPLATE_FILE,
+                         holiday_calendar=None, output_cache=None):
+    """
+    batch.iter_roster와 같지만 문서를 farm의 작업자 프로세스들로 나누어 생성
+
+    출력 캐시에 있는 문서는 작업자에게 보내지 않으며, 결과는 명단 순서대로 내보낸다.
+
+    :return: (매니저 이름, 성공 여부, 소요 시간(초))를 차례로 생성
+    """
+    public_holidays = holiday_calendar.month_holidays(year, month) if holiday_calendar else None
+    entries = []  # (매니저 이름, MetaData, 캐시 키, 캐시 재사용 여부)
+    for ems in schedules:
+        meta_data = build_meta_data(year, month, ems.name, default_file_path, input_file, public_holidays)
+        _check_overrides(meta_data, ems)
+        key = _cache_key(output_cache, meta_data, ems, farm)
+        entries.append((ems, meta_data, key, bool(key and output_cache.lookup(meta_data, key))))
+    results = farm.run((meta_data, ems) for ems, meta_data, _, reused in entries if not reused)
+    try:
+        for ems, meta_data, key, reused in entries:
+            if reused:
+                yield ems.name, True, 0.0
+                continue
+            name, ok, elapsed = next(results)
+            if ok and key:
+                output_cache.store(meta_data, key)
+            yield name, ok, elapsed
+    finally:
+        results.close()
+        if output_cache is not None:
+            output_cache.save()
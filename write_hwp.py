@@ -1,31 +1,155 @@
-import win32com.client
 from eroom import MetaData, generate_replace_dict, EroomManagerSchedule
+from hwp_backend import ComHwpBackend, kill_process
+from hwp_layout import DAY_LABELS, DAY_SPAN, file_hash, load_layout
+from hwp_profile import HwpProfiler, InstrumentedHwp
+from output_cache import CACHE_VERSION
+from contextlib import nullcontext
+import hashlib
 import os
+import threading
+import time
+
+MONTH_PLACEHOLDERS = ("%Year", "%Month", "%Endday")  # 같은 달이면 모든 매니저가 같은 값
+STAGE_DIR = ".eroom_stages"  # 단계별 중간 문서를 저장할 디렉토리 (default_file_path 안)
+FIELD_SEPARATOR = "\x02"  # GetFieldList/PutFieldText가 필드 이름과 값을 잇는 구분 문자
+MAX_FIELD_OCCURRENCES = 100  # 자리 표시자 하나를 필드로 바꿀 최대 횟수 (삭제가 안 될 때 무한 반복 방지)
+STAGE_LOCK_TIMEOUT = 60  # 중간 문서를 만드는 프로세스가 이 시간(초)보다 오래 잠금을 잡고 있으면 멈춘 것으로 봄
+                         # (worker_farm.DEFAULT_TIMEOUT보다 짧아야 기다리던 작업자가 시간 초과로 종료되지 않음)
+LOCK_SUFFIX = ".lock"
+
+def manager_values(replace_dict):
+    """치환 딕셔너리에서 매니저마다 다른 값(%Name 등)만 남김"""
+    return {key: value for key, value in replace_dict.items() if key not in MONTH_PLACEHOLDERS and key not in DAY_LABELS}
+
+
+def _temporary_path(path, pid=None):
+    """path를 만드는 동안 쓸 임시 파일 경로 (확장자는 유지, 만드는 프로세스 ID를 넣음)"""
+    base, extension = os.path.splitext(path)
+    return f"{base}.{pid or os.getpid()}.tmp{extension}"
+
+
+def build_once(path, build, lock_timeout=STAGE_LOCK_TIMEOUT):
+    """
+    path가 없으면 build(임시 경로)로 만든 뒤 path로 옮김
+
+    여러 프로세스가 같은 중간 문서를 동시에 만들지 않도록 path.lock 파일을 잡은 프로세스만 만들고,
+    나머지는 파일이 생길 때까지 기다린다. 다 만든 파일만 os.replace로 path에 옮기므로,
+    path가 있으면 언제나 완성된 문서이다.
+    잠금이 lock_timeout보다 오래되면 멈춘 프로세스의 것으로 보고 지운다.
+    잠금 파일에는 만드는 프로세스 ID를 적어 두어, 그 프로세스를 강제로 종료한 쪽이 release_locks로 풀 수 있다.
+
+    :return: 이 호출에서 만들었으면 True
+    """
+    lock_path = path + LOCK_SUFFIX
+    while not os.path.exists(path):
+        try:
+            descriptor = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > lock_timeout:
+                    os.remove(lock_path)
+            except OSError:
+                pass  # 그 사이 다른 프로세스가 잠금을 풀었음
+            time.sleep(0.05)
+            continue
+        try:
+            os.write(descriptor, str(os.getpid()).encode("ascii"))
+        finally:
+            os.close(descriptor)
+        temporary_path = _temporary_path(path)
+        try:
+            if os.path.exists(path):
+                return False
+            build(temporary_path)
+            os.replace(temporary_path, path)
+            return True
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass  # 오래된 잠금으로 보고 다른 프로세스가 지웠음
+    return False
+
+
+def release_locks(directory, pid):
+    """
+    강제로 종료한 프로세스(pid)가 directory에 남긴 잠금 파일과 만들다 만 임시 파일을 지움
+
+    :return: 지운 파일 수
+    """
+    removed = 0
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    temporary_marker = f".{pid}.tmp"
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if name.endswith(LOCK_SUFFIX):
+                with open(path, mode='r', encoding='ascii') as file:
+                    if file.read().strip() != str(pid):
+                        continue
+            elif temporary_marker not in name:
+                continue
+            os.remove(path)
+            removed += 1
+        except (OSError, ValueError):
+            pass  # 그 사이 다른 프로세스가 지웠거나 아직 쓰는 중인 잠금
+    return removed
+
+
+def field_name(placeholder):
+    """자리 표시자(%Name)에 대응하는 문서 필드 이름(Name)"""
+    return placeholder.lstrip("%")
+
+
+def _base_field_name(indexed_name):
+    """GetFieldList가 돌려준 "Name{{0}}"에서 번호를 뗀 필드 이름"""
+    return indexed_name.split("{{", 1)[0]
+
 
 class HwpProcessor:
 
-    def __init__(self, meta_data):
+    def __init__(self, meta_data, backend=None, hwp=None, layout=None, profiler=None):
         """
         HWP 문서 자동 처리를 담당하는 클래스
 
         :param meta_data: MetaData 객체
+        :param backend: 문서 엔진 백엔드 (기본값: 한글 오피스 COM 백엔드)
+        :param hwp: 이미 실행 중인 한글 오피스 객체 (주어지면 새로 생성하지 않음)
+        :param layout: 템플릿의 날짜 셀 색인 (TemplateLayout, 없으면 render에서 불러옴)
+        :param profiler: HWP 호출을 단계별로 기록할 HwpProfiler (None이면 기록하지 않음)
         """
         self.meta_data : MetaData = meta_data
-        self.hwp = self._initialize_hwp()
+        self.backend = backend or ComHwpBackend()
+        self.hwp = hwp if hwp is not None else self._initialize_hwp()
+        self.profiler = profiler
+        if profiler is not None:
+            self.hwp = InstrumentedHwp(self.hwp, profiler)
+        self.layout = layout
+        self.cells_read = 0  # 이 문서에서 읽은 날짜 셀 수 (색인을 캐시에서 불러오면 0)
 
     def _initialize_hwp(self):
-        """한글 오피스 객체를 초기화하고 보안 모듈을 등록"""
+        """백엔드로부터 한글 오피스 객체를 생성"""
         try:
-            hwp = win32com.client.gencache.EnsureDispatch("HWPFrame.HwpObject")
-            hwp.RegisterModule("FilePathCheckDLL", "SecurityModule")  # 보안 경고 방지
-            return hwp
+            return self.backend.create()
         except Exception as e:
             raise Exception(f"HWP 초기화 실패: {e}")
 
-    def open_file(self):
-        """HWP 파일 열기"""
+    def _phase(self, name):
+        """profiler가 있으면 name 단계로 기록하는 컨텍스트"""
+        return self.profiler.phase(name) if self.profiler is not None else nullcontext()
+
+    def template_path(self):
+        return os.path.join(self.meta_data.default_file_path, self.meta_data.input_file)
+
+    def open_file(self, file_path=None):
+        """HWP 파일 열기 (기본값: 템플릿)"""
         try:
-            file_path = os.path.join(self.meta_data.default_file_path, self.meta_data.input_file)
+            file_path = file_path or self.template_path()
             self.hwp.Open(file_path)
         except Exception as e:
             raise Exception(f"파일을 열 수 없습니다: {e}")
@@ -51,6 +175,63 @@ class HwpProcessor:
             self.hwp.HAction.Execute("AllReplace", self.hwp.HParameterSet.HFindReplace.HSet)
             # 메시지 창 자동 확인 처리 추가
 
+    def field_list(self):
+        """
+        열린 문서의 필드 목록 (같은 이름의 필드는 "Name{{0}}", "Name{{1}}"처럼 번호를 붙임)
+
+        :return: 필드 이름 목록, 필드를 지원하지 않는 엔진이면 빈 목록
+        """
+        try:
+            names = self.hwp.GetFieldList(1, 0)  # 1: 필드 번호 붙임, 0: 모든 필드
+        except Exception:
+            return []
+        return [name for name in (names or "").split(FIELD_SEPARATOR) if name]
+
+    def fill(self, replace_dict, skip=()):
+        """
+        치환 데이터를 문서에 채움
+
+        문서에 필드로 만들어 둔 항목은 PutFieldText 한 번으로 모두 채우므로 항목이 늘어도 문서를 다시 훑지 않는다.
+        필드가 없는 항목(또는 필드 채우기에 실패한 경우 전체)은 find_and_replace로 처리한다.
+
+        :param replace_dict: 키-값 형식의 치환 데이터 (예: {"%Name": "홍길동"})
+        :param skip: 이미 채운 필드 (합친 문서에서 앞쪽 쪽의 필드)
+        :return: 이번에 채운 필드 이름 집합
+        """
+        values = {field_name(key): value for key, value in replace_dict.items()}
+        targets = [name for name in self.field_list() if name not in skip and _base_field_name(name) in values]
+        if targets:
+            try:
+                self.hwp.PutFieldText(FIELD_SEPARATOR.join(targets),
+                                      FIELD_SEPARATOR.join(values[_base_field_name(name)] for name in targets))
+            except Exception as e:
+                print(f"필드 채우기 실패, 찾아 바꾸기로 처리합니다: {e}")
+                targets = []
+        filled = {_base_field_name(name) for name in targets}
+        remaining = {key: value for key, value in replace_dict.items() if field_name(key) not in filled}
+        if remaining:
+            self.find_and_replace(remaining)
+        return set(targets)
+
+    def create_fields(self, placeholders):
+        """
+        문서의 자리 표시자 텍스트를 같은 이름의 필드(누름틀)로 바꿈
+
+        필드의 안내문은 자리 표시자 그대로 두어 값을 채우기 전에도 문서에서 알아볼 수 있게 한다.
+
+        :param placeholders: 필드로 바꿀 자리 표시자 목록 (예: ["%Name", "%Year"])
+        :return: 만든 필드 수
+        """
+        created = 0
+        for placeholder in placeholders:
+            for _ in range(MAX_FIELD_OCCURRENCES):
+                if not self.find_text(placeholder):  # 찾은 텍스트는 블록으로 지정됨
+                    break
+                self.hwp.HAction.Run("Delete")
+                self.hwp.CreateField(placeholder, "", field_name(placeholder))
+                created += 1
+        return created
+
     def find_text(self, search_text):
         """특정 문자열을 문서에서 찾음"""
         self.hwp.HAction.Run("MoveTop")
@@ -89,78 +270,473 @@ class HwpProcessor:
         """현재 지정된 셀에 대각선을 긋는 함수"""
         self.hwp.HAction.Run("TableCellBorderDiagonalUp")
 
+    def apply_diagonal_to_range(self, rows=1):
+        """
+        현재 날짜 셀 오른쪽의 칸들을 rows행만큼 셀 블록으로 한 번에 지정하여 대각선 적용
+
+        적용 후에는 마지막 행의 날짜 셀이 지정된 상태로 돌아온다.
+        """
+        span = self.layout.span if self.layout is not None else DAY_SPAN
+        self.hwp.HAction.Run("TableRightCell")
+        self.hwp.HAction.Run("TableCellBlock")
+        self.hwp.HAction.Run("TableCellBlockExtend")  # 이후 이동은 블록을 넓힘
+        for _ in range(span - 1):
+            self.hwp.HAction.Run("TableRightCell")
+        for _ in range(rows - 1):
+            self.hwp.HAction.Run("TableLowerCell")
+        self.diagonal_cell()
+        self.hwp.HAction.Run("Cancel")  # 블록 연장 해제
+        self.move_cell("left", span)
+
     def apply_diagonal_to_weekend(self):
-        """현재 셀에서 5칸 오른쪽으로 이동하며 대각선 적용"""
-        for _ in range(5):
-            self.move_cell("right", 1)
-            self.diagonal_cell()
-        self.move_cell("left", 5)
+        """현재 셀 오른쪽 5칸에 대각선 적용"""
+        self.apply_diagonal_to_range(1)
 
-    def mark_day_off(self, weekends: set):
-        """주말을 찾아 해당 셀에 대각선 표시"""
+    def read_cell_day(self):
+        """현재 셀의 날짜를 읽어 정수로 반환 (날짜 셀이 아니면 None)"""
+        self.select_cell()
+        self.hwp.HAction.Run("TableCellInput")
+        self.hwp.InitScan(0,2)
+        text = self.hwp.GetText()
+        try:
+            return int(text[1])
+        except ValueError:
+            return None
 
-        for day_label in ["%일1", "%일2"]:
-            self.find_and_select_cell(day_label)
-            for _ in range(16):
-                self.move_cell("down", 1)
-                self.select_cell()
-                self.hwp.HAction.Run("TableCellInput")
-                self.hwp.InitScan(0,2)
-                text = self.hwp.GetText()
-                try:
-                    cell_date = int(text[1])
-                except ValueError:
+    def delete_cell(self):
+        """현재 지정된 셀을 지움"""
+        self.hwp.HAction.Run("TableDeleteCell")
+
+    def ensure_layout(self):
+        """
+        날짜 셀 색인을 준비 (캐시에 없으면 문서의 날짜 셀을 한 번씩만 읽어서 만듦)
+
+        :return: TemplateLayout, 날짜 셀을 찾지 못하면 None
+        """
+        if self.layout is None:
+            self.layout = load_layout(self.template_path(), self)
+            if self.layout is not None:
+                self.cells_read = self.layout.cells_read
+        return self.layout
+
+    def plan_day_actions(self, weekends: set, invalid_days: set):
+        """
+        날짜 셀마다 적용할 동작을 표 순서대로 정리
+
+        :return: (머리글, 행, 동작) 목록, 동작은 "diagonal" 또는 "delete"
+        """
+        layout = self.ensure_layout()
+        if layout is None:
+            return []
+        actions = []
+        for day_label, row, day in layout.ordered_cells():
+            if day in weekends:
+                actions.append((day_label, row, "diagonal"))
+            if day in invalid_days:
+                actions.append((day_label, row, "delete"))
+        return actions
+
+    def apply_day_actions(self, actions):
+        """
+        정리된 동작을 머리글별로 위에서 아래로 한 번만 이동하며 적용
+
+        연속된 행의 대각선은 하나의 셀 블록으로 묶어 한 번에 적용한다.
+        """
+        for day_label in DAY_LABELS:
+            label_actions = [(row, action) for label, row, action in actions if label == day_label]
+            if not label_actions or not self.find_and_select_cell(day_label):
+                continue
+            current_row = 0
+            index = 0
+            while index < len(label_actions):
+                row, action = label_actions[index]
+                if row != current_row:
+                    self.move_cell("down", row - current_row)
+                    current_row = row
+                if action == "delete":
+                    with self._phase("remove_invalid_days"):
+                        self.delete_cell()
+                    index += 1
                     continue
-                if cell_date in weekends:
-                    self.apply_diagonal_to_weekend()
+                # 바로 아래 행들도 대각선만 그으면 되는 경우 한 블록으로 묶음
+                run = 1
+                while index + run < len(label_actions) and label_actions[index + run] == (row + run, "diagonal"):
+                    run += 1
+                self.apply_diagonal_to_range(run)
+                current_row = row + run - 1
+                index += run
+
+    def process_day_cells(self, weekends: set):
+        """휴무일 대각선 표시와 존재하지 않는 날짜 제거를 한 번의 이동으로 처리"""
+        self.apply_day_actions(self.plan_day_actions(weekends, self.meta_data.get_invalid_days()))
+
+    def mark_day_off(self, weekends: set):
+        """주말을 찾아 해당 셀에 대각선 표시"""
+        self.apply_day_actions(self.plan_day_actions(weekends, set()))
 
-                self.hwp.HAction.Run("MoveTop")
     def remove_invalid_days(self):
         """달의 말일을 기준으로 존재하지 않는 날짜를 제거"""
-        invalid_days = self.meta_data.get_invalid_days()
-        
-        for day_label in ["%일2"]:
-            self.find_and_select_cell(day_label)
-            for _ in range(16):
-                self.move_cell("down", 1)
-                self.select_cell()
-                self.hwp.HAction.Run("TableCellInput")
-                self.hwp.InitScan(0,2)
-                text = self.hwp.GetText()
-                try:
-                    cell_date = int(text[1])
-                except ValueError:
-                    continue
-                if cell_date in invalid_days:
-                    self.hwp.HAction.Run("TableDeleteCell")
-            # self.hwp.HAction.Run("MoveTop")
-    def save_file(self):
-        """파일 저장"""
+        self.apply_day_actions(self.plan_day_actions(set(), self.meta_data.get_invalid_days()))
+
+    def save_file(self, output_path=None):
+        """파일 저장 (기본값: meta_data의 출력 파일)"""
         try:
-            output_path = os.path.join(self.meta_data.default_file_path, self.meta_data.output_file_name)
+            output_path = output_path or os.path.join(self.meta_data.default_file_path,
+                                                      self.meta_data.output_file_name)
             self.hwp.SaveAs(output_path)
         except Exception as e:
             raise Exception(f"파일 저장 실패: {e}")
 
+    def render(self, sc: EroomManagerSchedule, source_path=None):
+        """
+        템플릿을 열어 매니저의 출근부를 완성한 후 저장
+
+        :param source_path: 템플릿 대신 열 문서 (자리 표시자를 필드로 바꾼 템플릿 등)
+        """
+        with self._phase("open"):
+            self.open_file(source_path)
+        with self._phase("mark_day_off"):
+            self.process_day_cells(sc.get_day_off(self.meta_data))
+        with self._phase("find_and_replace"):
+            self.fill(generate_replace_dict(self.meta_data, sc))
+        with self._phase("save"):
+            self.save_file()
+
+    def render_field_template(self, placeholders, field_template_path):
+        """템플릿의 자리 표시자를 필드로 바꾸어 저장 (날짜 열 머리글은 셀을 찾는 데 쓰므로 제외)"""
+        with self._phase("open"):
+            self.open_file()
+        with self._phase("find_and_replace"):
+            self.create_fields([placeholder for placeholder in placeholders if placeholder not in DAY_LABELS])
+        with self._phase("save"):
+            self.save_file(field_template_path)
+
+    def render_month_master(self, replace_dict, master_path, source_path=None):
+        """
+        1단계: 템플릿에서 달마다 같은 부분(존재하지 않는 날짜 제거, 연/월/말일 치환)만 처리하여 저장
+
+        날짜 열 머리글(%일1, %일2)은 다음 단계에서 날짜 셀을 찾아야 하므로 남겨 둔다.
+
+        :param source_path: 템플릿 대신 열 문서 (자리 표시자를 필드로 바꾼 템플릿 등)
+        """
+        with self._phase("open"):
+            self.open_file(source_path)
+        with self._phase("mark_day_off"):
+            self.remove_invalid_days()
+        with self._phase("find_and_replace"):
+            self.fill({key: value for key, value in replace_dict.items() if key in MONTH_PLACEHOLDERS})
+        with self._phase("save"):
+            self.save_file(master_path)
+
+    def render_day_off_pattern(self, master_path, weekends: set, replace_dict, pattern_path):
+        """2단계: 월 문서에 휴무일 대각선을 긋고 날짜 열 머리글을 치환하여 저장"""
+        with self._phase("open"):
+            self.open_file(master_path)
+        with self._phase("mark_day_off"):
+            self.mark_day_off(weekends)
+        with self._phase("find_and_replace"):
+            self.find_and_replace({key: value for key, value in replace_dict.items() if key in DAY_LABELS})
+        with self._phase("save"):
+            self.save_file(pattern_path)
+
+    def render_from_pattern(self, pattern_path, replace_dict):
+        """3단계: 휴무일 문서를 열어 매니저별 값(%Name 등)만 치환하여 출력 파일로 저장"""
+        with self._phase("open"):
+            self.open_file(pattern_path)
+        with self._phase("find_and_replace"):
+            self.fill(manager_values(replace_dict))
+        with self._phase("save"):
+            self.save_file()
+
+    def insert_file(self, file_path):
+        """현재 문서의 커서 위치에 다른 HWP 파일을 새 구역(새 쪽)으로 끼워 넣음"""
+        self.hwp.HAction.Run("MoveDocEnd")
+        self.hwp.HAction.GetDefault("InsertFile", self.hwp.HParameterSet.HInsertFile.HSet)
+        self.hwp.HParameterSet.HInsertFile.FileName = file_path
+        self.hwp.HParameterSet.HInsertFile.KeepSection = 1  # 구역을 유지하여 새 쪽에서 시작
+        self.hwp.HParameterSet.HInsertFile.KeepCharshape = 1
+        self.hwp.HParameterSet.HInsertFile.KeepParashape = 1
+        self.hwp.HParameterSet.HInsertFile.KeepStyle = 1
+        if not self.hwp.HAction.Execute("InsertFile", self.hwp.HParameterSet.HInsertFile.HSet):
+            raise Exception(f"파일을 끼워 넣을 수 없습니다: {file_path}")
+
     def close(self):
         """HWP 종료"""
         self.hwp.Quit()
 
 
-def modify_hwp_file(meta_data: MetaData, sc:EroomManagerSchedule):
-    """HWP 파일을 열고 지정된 단어를 변경한 후 저장"""
+class HwpSession:
+    kind = "hwp"  # batch.SESSIONS의 키
+
+    def __init__(self, backend=None, max_documents=None, profile_path=None, use_fields=True, stage_dir=None,
+                 document_timeout=None):
+        """
+        하나의 한글 오피스 인스턴스로 여러 문서를 연속 처리하는 세션
+
+        문서 처리 중 오류가 나면 인스턴스 응답 여부를 확인하고, 응답이 없으면 새 인스턴스로 교체한 뒤
+        해당 문서를 한 번 더 처리한다.
+        대화 상자 등에 멈춘 인스턴스는 COM 호출이 돌아오지 않아 오류가 나지 않으므로, document_timeout이
+        주어지면 감시 스레드가 시간 안에 끝나지 않은 문서의 한글 오피스 프로세스를 종료하여 호출이 오류로
+        끝나게 한다. 백엔드가 프로세스 ID를 알려 주지 않으면 감시할 수 없으며, 이때 멈춘 문서는
+        worker_farm.WorkerFarm의 시간 초과로 처리한다.
+        use_fields가 True이면 템플릿의 자리 표시자를 필드로 바꾼 문서를 한 번 만들어 두고,
+        문서마다 모든 값을 PutFieldText 한 번으로 채운다.
+
+        :param backend: 문서 엔진 백엔드 (기본값: 한글 오피스 COM 백엔드)
+        :param max_documents: 인스턴스 하나로 처리할 최대 문서 수 (None이면 제한 없음)
+        :param profile_path: 문서별 HWP 호출 보고서를 JSON Lines로 추가할 파일 (None이면 기록하지 않음)
+        :param use_fields: False이면 필드를 만들지 않고 자리 표시자마다 찾아 바꾸기로 처리
+        :param stage_dir: 필드 템플릿 등 중간 문서를 저장할 디렉토리 (기본값: 템플릿 디렉토리의 STAGE_DIR)
+        :param document_timeout: 문서 한 건을 기다릴 최대 시간(초), 넘으면 인스턴스를 종료 (None이면 감시하지 않음)
+        """
+        self.backend = backend or ComHwpBackend()
+        self.max_documents = max_documents
+        self.use_fields = use_fields
+        self.fields_option = use_fields  # 필드 템플릿을 만들지 못해 use_fields가 꺼져도 요청한 설정은 그대로 둠
+        self.stage_dir = stage_dir
+        self.template_hashes = {}  # {템플릿 경로: 해시}
+        self.hwp = None
+        self.process_id = None  # 현재 인스턴스의 프로세스 ID (백엔드가 알려 주지 않으면 None)
+        self.document_timeout = document_timeout
+        self.timeouts = 0  # 시간 안에 끝나지 않아 인스턴스를 종료한 문서 수
+        self.layout = None  # 템플릿의 날짜 셀 색인 (첫 문서에서 불러와 계속 사용)
+        self.documents = 0  # 현재 인스턴스로 처리한 문서 수
+        self.restarts = 0  # 응답 없는 인스턴스를 교체한 횟수
+        self.profile_path = profile_path
+        self.reports = []  # 성공한 문서의 호출 보고서 (HwpProfiler.to_dict 결과)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def cache_options(self):
+        """출력 캐시 키에 넣을 세션 설정 (설정이 다른 세션으로 만든 문서는 다시 만듦)"""
+        return {"session": self.kind, "backend": self.backend.name, "use_fields": self.fields_option}
+
+    def start(self):
+        """새 한글 오피스 인스턴스 실행"""
+        self.hwp = self.backend.create()
+        self.process_id = self.backend.process_id(self.hwp)
+        self.documents = 0
+
+    def close(self):
+        """한글 오피스 인스턴스 종료 (응답이 없는 경우에도 예외를 내지 않음)"""
+        if self.hwp is None:
+            return
+        try:
+            self.hwp.Quit()
+        except Exception as e:
+            print(f"HWP 종료 실패: {e}")
+        finally:
+            self.hwp = None
+            self.process_id = None
+
+    def restart(self):
+        """현재 인스턴스를 버리고 새 인스턴스로 교체"""
+        self.close()
+        self.start()
+        self.restarts += 1
+
+    def _start_watchdog(self, meta_data):
+        """document_timeout 뒤에 현재 인스턴스를 종료할 타이머 (감시할 수 없으면 None)"""
+        if not self.document_timeout or not self.process_id:
+            return None
+        process_id = self.process_id
+
+        def kill():
+            print(f"{self.document_timeout:.0f}초 안에 끝나지 않아 HWP를 종료합니다: {meta_data.output_file_name}")
+            self.timeouts += 1
+            kill_process(process_id)
+
+        watchdog = threading.Timer(self.document_timeout, kill)
+        watchdog.daemon = True
+        watchdog.start()
+        return watchdog
+
+    def is_alive(self):
+        """인스턴스가 호출에 응답하는지 확인 (멈춘 인스턴스는 감시 스레드가 종료해야 오류로 확인됨)"""
+        if self.hwp is None:
+            return False
+        try:
+            self.hwp.Clear(1)  # 열린 문서를 저장하지 않고 닫음
+            return True
+        except Exception:
+            return False
+
+    def template_hash(self, processor):
+        template_path = processor.template_path()
+        if template_path not in self.template_hashes:
+            self.template_hashes[template_path] = file_hash(template_path)
+        return self.template_hashes[template_path]
+
+    def stage_directory(self, meta_data):
+        stage_dir = self.stage_dir or os.path.join(meta_data.default_file_path, STAGE_DIR)
+        os.makedirs(stage_dir, exist_ok=True)
+        return stage_dir
+
+    def field_template(self, processor, meta_data, replace_dict):
+        """
+        자리 표시자를 필드로 바꾼 템플릿 경로 (없으면 만듦)
+
+        템플릿 해시와 자리 표시자 목록으로 이름을 정하므로 다음 실행에서도 재사용된다.
+
+        :return: 경로, use_fields가 False이거나 만들지 못하면 None (템플릿을 그대로 사용)
+        """
+        if not self.use_fields:
+            return None
+        placeholders = sorted(replace_dict)
+        key = hashlib.sha256(f"{self.template_hash(processor)}:{placeholders}".encode("utf-8")).hexdigest()[:16]
+        extension = os.path.splitext(meta_data.input_file)[1]
+        path = os.path.join(self.stage_directory(meta_data), f"fields_{key}{extension}")
+        if not os.path.exists(path):
+            try:
+                build_once(path, lambda output_path: processor.render_field_template(placeholders, output_path))
+            except Exception as e:
+                print(f"필드 템플릿 생성 실패, 찾아 바꾸기로 처리합니다: {e}")
+                self.use_fields = False
+                return None
+        return path
+
+    def _render(self, processor, meta_data, sc):
+        processor.render(sc, self.field_template(processor, meta_data, generate_replace_dict(meta_data, sc)))
+
+    def process(self, meta_data: MetaData, sc: EroomManagerSchedule):
+        """
+        세션의 인스턴스로 매니저 한 명의 출근부를 생성
+
+        :return: 저장에 성공하면 True
+        """
+        for attempt in range(2):
+            if self.hwp is None:
+                self.start()
+            profiler = HwpProfiler(meta_data.output_file_name) if self.profile_path else None
+            processor = HwpProcessor(meta_data, self.backend, self.hwp, self.layout, profiler)
+            watchdog = self._start_watchdog(meta_data)
+            try:
+                try:
+                    self._render(processor, meta_data, sc)
+                finally:
+                    if watchdog is not None:
+                        watchdog.cancel()
+                self.layout = processor.layout
+            except Exception as e:
+                print(f"오류 발생: {e}")
+                if self.is_alive() or attempt:
+                    return False
+                print("HWP가 응답하지 않아 새 인스턴스로 교체합니다.")
+                self.restart()
+                continue
+            print(f"파일이 성공적으로 저장되었습니다: {meta_data.output_file_name}")
+            if profiler is not None:
+                profiler.write(self.profile_path)
+                self.reports.append(profiler.to_dict())
+            self.documents += 1
+            if (self.max_documents and self.documents >= self.max_documents) or not self.is_alive():
+                self.close()
+            return True
+        return False
+
+
+class StagedHwpSession(HwpSession):
+    kind = "staged"
+    combined_extension = ".hwp"
+
+    def __init__(self, backend=None, max_documents=None, profile_path=None, stage_dir=None, use_fields=True,
+                 document_timeout=None):
+        """
+        문서를 단계별 중간 문서로 나누어 만드는 HwpSession
+
+        1단계 월 문서(존재하지 않는 날짜 제거, 연/월/말일 치환)는 달마다 한 번,
+        2단계 휴무일 문서(대각선, 날짜 열 머리글 치환)는 서로 다른 휴무일 집합마다 한 번 만들고,
+        매니저마다는 휴무일 문서를 열어 이름만 치환하여 저장한다.
+        중간 문서는 템플릿 해시와 휴무일 집합으로 이름을 정하므로 다음 실행에서도 재사용된다.
+        use_fields가 True이면 월 문서를 필드 템플릿에서 만들어 매니저별 값을 PutFieldText로 채운다.
+
+        :param stage_dir: 중간 문서를 저장할 디렉토리 (기본값: 템플릿 디렉토리의 STAGE_DIR)
+        """
+        super().__init__(backend, max_documents, profile_path, use_fields, stage_dir, document_timeout)
+        self.stages_built = {"month": 0, "pattern": 0}  # 이 세션에서 새로 만든 중간 문서 수
+
+    def stage_paths(self, processor, meta_data, weekends):
+        """(월 문서 경로, 휴무일 문서 경로)"""
+        stage_dir = self.stage_directory(meta_data)
+        extension = os.path.splitext(meta_data.input_file)[1]
+        # 생성 방식이 바뀌어 CACHE_VERSION을 올리면 이전 방식으로 만든 중간 문서도 쓰지 않음
+        month_key = f"v{CACHE_VERSION}_{self.template_hash(processor)[:16]}_{meta_data.target_date}"
+        if self.use_fields:
+            month_key += "_fields"  # 필드 템플릿에서 만든 월 문서는 따로 둠
+        pattern_key = hashlib.sha256(f"{month_key}:{sorted(weekends)}".encode("utf-8")).hexdigest()[:16]
+        return (os.path.join(stage_dir, f"month_{month_key}{extension}"),
+                os.path.join(stage_dir, f"pattern_{pattern_key}{extension}"))
+
+    def pattern_for(self, processor, meta_data, sc):
+        """매니저의 휴무일 문서 경로 (없으면 월 문서와 함께 만듦)"""
+        weekends = sc.get_day_off(meta_data)
+        replace_dict = generate_replace_dict(meta_data, sc)
+        master_path, pattern_path = self.stage_paths(processor, meta_data, weekends)
+        if not os.path.exists(pattern_path):
+            # 여러 작업자 프로세스가 같은 중간 문서를 만들려 하면 한 곳에서만 만듦
+            if not os.path.exists(master_path):
+                field_template = self.field_template(processor, meta_data, replace_dict)
+                if build_once(master_path, lambda path: processor.render_month_master(replace_dict, path, field_template)):
+                    self.stages_built["month"] += 1
+            if build_once(pattern_path,
+                          lambda path: processor.render_day_off_pattern(master_path, weekends, replace_dict, path)):
+                self.stages_built["pattern"] += 1
+        return pattern_path
+
+    def _render(self, processor, meta_data, sc):
+        pattern_path = self.pattern_for(processor, meta_data, sc)
+        processor.render_from_pattern(pattern_path, generate_replace_dict(meta_data, sc))
+
+    def combine(self, documents, output_path):
+        """
+        여러 매니저의 출근부를 쪽으로 이어 붙인 문서 하나로 저장
+
+        빈 문서에 매니저마다 휴무일 문서를 끼워 넣고 새로 들어온 쪽의 이름만 채운 뒤, 마지막에 한 번만 저장한다.
+
+        :param documents: (MetaData, EroomManagerSchedule) 목록
+        :param output_path: 합친 문서를 저장할 경로
+        :return: {"output": 경로, "documents": 문서 수, "pages": 쪽 수, "bytes": 파일 크기}
+        """
+        if self.hwp is None:
+            self.start()
+        entries = []
+        for meta_data, sc in documents:
+            processor = HwpProcessor(meta_data, self.backend, self.hwp, self.layout)
+            entries.append((processor, self.pattern_for(processor, meta_data, sc), generate_replace_dict(meta_data, sc)))
+            self.layout = processor.layout
+        self.hwp.Clear(1)  # 빈 문서에서 시작
+        filled = set()  # 앞쪽에서 이미 채운 필드
+        for processor, pattern_path, replace_dict in entries:
+            processor.insert_file(pattern_path)
+            # 앞쪽은 이미 채웠으므로 새로 들어온 쪽의 필드(또는 자리 표시자)에만 적용됨
+            filled |= processor.fill(manager_values(replace_dict), filled)
+        self.hwp.SaveAs(output_path)
+        pages = self.hwp.PageCount
+        self.hwp.Clear(1)
+        return {"output": output_path, "documents": len(entries), "pages": pages,
+                "bytes": os.path.getsize(output_path)}
+
+
+def modify_hwp_file(meta_data: MetaData, sc:EroomManagerSchedule, backend=None, profiler=None):
+    """
+    HWP 파일을 열고 지정된 단어를 변경한 후 저장
+
+    :param profiler: HWP 호출을 단계별로 기록할 HwpProfiler (None이면 기록하지 않음)
+    :return: 저장에 성공하면 True
+    """
     processor = None
-    replace_dict = generate_replace_dict(meta_data, sc)
     try:
-        processor = HwpProcessor(meta_data)
-        processor.open_file()
-        processor.mark_day_off(sc.get_day_off(meta_data))
-        processor.remove_invalid_days()
-        processor.find_and_replace(replace_dict)
-        processor.save_file()
+        processor = HwpProcessor(meta_data, backend, profiler=profiler)
+        processor.render(sc)
         print(f"파일이 성공적으로 저장되었습니다: {meta_data.output_file_name}")
+        return True
     except Exception as e:
         print(f"오류 발생: {e}")
+        return False
     finally:
         if processor:
             processor.close()